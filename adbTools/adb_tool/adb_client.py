@@ -0,0 +1,485 @@
+import os
+import select
+import socket
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037"))
+
+
+class AdbError(Exception):
+    """Raised when the adb server answers a request with FAIL."""
+
+
+class AdbConnectionError(AdbError):
+    """Raised when the adb server cannot be reached."""
+
+
+class AdbConnectionPool:
+    """
+    Hands out connected sockets to the adb server.
+
+    The adb server tears down a smart socket once the requested service
+    finishes, so connections cannot be reused between requests. The pool
+    therefore bounds the number of concurrent connections and keeps a
+    small number of pre-connected sockets ready so a request does not pay
+    the connect cost on the hot path. They are replaced on a background
+    thread after a request, unless it failed because the server is gone.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_connections=16,
+                 spare_connections=2, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.spare_connections = spare_connections
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._spare = []
+        self._refilling = False
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError as e:
+            raise AdbConnectionError(f"adb server not reachable at {self.host}:{self.port}: {e}")
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    @staticmethod
+    def _is_alive(sock):
+        # A spare socket the server has since closed reads as EOF.
+        try:
+            sock.setblocking(False)
+            try:
+                return sock.recv(1, socket.MSG_PEEK) != b""
+            finally:
+                sock.setblocking(True)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+    def _take_spare(self):
+        while True:
+            with self._lock:
+                if not self._spare:
+                    return None
+                sock = self._spare.pop()
+            if self._is_alive(sock):
+                return sock
+            sock.close()
+
+    def _start_refill(self):
+        with self._lock:
+            if self._refilling or len(self._spare) >= self.spare_connections:
+                return
+            self._refilling = True
+        threading.Thread(target=self._refill, name="AdbPoolRefill", daemon=True).start()
+
+    def _refill(self):
+        # Only one refill thread runs at a time; the cap is checked under the lock
+        try:
+            while True:
+                with self._lock:
+                    if len(self._spare) >= self.spare_connections:
+                        return
+                try:
+                    sock = self._connect()
+                except AdbConnectionError:
+                    return
+                with self._lock:
+                    if len(self._spare) < self.spare_connections:
+                        self._spare.append(sock)
+                        continue
+                sock.close()
+                return
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    @contextmanager
+    def connection(self):
+        """Yields a connected socket and closes it when the block exits."""
+        self._slots.acquire()
+        sock = None
+        server_gone = False
+        try:
+            sock = self._take_spare() or self._connect()
+            sock.settimeout(self.timeout)
+            yield sock
+        except (AdbConnectionError, ConnectionError):
+            server_gone = True
+            raise
+        finally:
+            if sock is not None:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+            self._slots.release()
+            if self.spare_connections and not server_gone:
+                self._start_refill()
+
+    def close(self):
+        with self._lock:
+            spare, self._spare = self._spare, []
+        for sock in spare:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+class SyncConnection:
+    """
+    An open sync: session on one device.
+
+    Sync requests are a 4 byte id plus a little-endian 32 bit length. A file
+    is sent as SEND '<path>,<mode>', any number of DATA chunks and DONE
+    carrying the mtime; the device answers each file with OKAY or FAIL, so
+    several files can be streamed back-to-back before reading the replies.
+    """
+
+    MAX_CHUNK = 64 * 1024
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    def _send_header(self, request_id, length):
+        self.sock.sendall(struct.pack("<4sI", request_id, length))
+
+    def send_file(self, local_path, remote_path, on_chunk=None, chunk_size=MAX_CHUNK):
+        """
+        Streams one local file to remote_path without waiting for the reply.
+        on_chunk(byte_count) is called after every DATA chunk.
+        """
+        st = os.stat(local_path)
+        header = f"{remote_path},{0o100000 | (st.st_mode & 0o777)}".encode("utf-8")
+        self._send_header(b"SEND", len(header))
+        self.sock.sendall(header)
+        with open(local_path, "rb") as f:
+            while True:
+                data = f.read(min(chunk_size, self.MAX_CHUNK))
+                if not data:
+                    break
+                self.sock.sendall(struct.pack("<4sI", b"DATA", len(data)) + data)
+                if on_chunk:
+                    on_chunk(len(data))
+        self._send_header(b"DONE", int(st.st_mtime))
+
+    def reply_pending(self):
+        """Returns True if a reply can be read without blocking."""
+        readable, _, _ = select.select([self.sock], [], [], 0)
+        return bool(readable)
+
+    def read_status(self):
+        """Reads the reply to one sent file; raises AdbError on FAIL."""
+        request_id, length = struct.unpack("<4sI", AdbClient._recv_exact(self.sock, 8))
+        if request_id == b"OKAY":
+            return
+        if request_id == b"FAIL":
+            message = AdbClient._recv_exact(self.sock, length).decode("utf-8", errors="replace")
+            raise AdbError(message)
+        raise AdbError(f"Unexpected sync response: {request_id!r}")
+
+    def list_dir(self, remote_path):
+        """
+        Lists a directory with LIST. Returns (name, mode, size, mtime) tuples,
+        without '.' and '..'. The device answers an unreadable or missing
+        directory with an empty listing.
+        """
+        path = remote_path.encode("utf-8")
+        self._send_header(b"LIST", len(path))
+        self.sock.sendall(path)
+        entries = []
+        while True:
+            request_id, mode = struct.unpack("<4sI", AdbClient._recv_exact(self.sock, 8))
+            if request_id == b"FAIL":
+                # FAIL carries a message length instead of a directory entry
+                message = AdbClient._recv_exact(self.sock, mode).decode("utf-8", errors="replace")
+                raise AdbError(message)
+            if request_id not in (b"DENT", b"DONE"):
+                raise AdbError(f"Unexpected sync response: {request_id!r}")
+            size, mtime, name_length = struct.unpack("<III", AdbClient._recv_exact(self.sock, 12))
+            if request_id == b"DONE":
+                return entries
+            name = AdbClient._recv_exact(self.sock, name_length).decode("utf-8", errors="replace")
+            if name not in (".", ".."):
+                entries.append((name, mode, size, mtime))
+
+    def quit(self):
+        self._send_header(b"QUIT", 0)
+
+
+class AdbClient:
+    """
+    Minimal client for the adb host smart-socket protocol.
+
+    Requests are sent as a 4 digit hex length followed by the payload and
+    answered with OKAY or FAIL. Device services (shell:, exec:) are reached
+    by first switching the connection to a device with host:transport.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0, max_connections=16,
+                 read_timeout=None):
+        self.pool = AdbConnectionPool(host, port, max_connections=max_connections, timeout=timeout)
+        # Device services may stay silent for a long time (e.g. a slow dumpsys),
+        # so reads after the handshake block like the adb client does by default.
+        self.read_timeout = read_timeout
+        self._available = None
+        self._checked_at = 0.0
+        self.retry_interval = 2.0
+
+    # --- Low level protocol helpers ---
+
+    @staticmethod
+    def _recv_exact(sock, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise AdbConnectionError("Connection closed by adb server")
+            data.extend(chunk)
+        return bytes(data)
+
+    @staticmethod
+    def _recv_all(sock):
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _read_length_prefixed(self, sock):
+        length = int(self._recv_exact(sock, 4), 16)
+        return self._recv_exact(sock, length)
+
+    def _send_request(self, sock, request):
+        payload = request.encode("utf-8")
+        sock.sendall(b"%04x" % len(payload) + payload)
+        status = self._recv_exact(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            message = self._read_length_prefixed(sock).decode("utf-8", errors="replace")
+            raise AdbError(message)
+        raise AdbError(f"Unexpected adb response: {status!r}")
+
+    def _open_service(self, sock, serial, service):
+        self._send_request(sock, f"host:transport:{serial}")
+        self._send_request(sock, service)
+        sock.settimeout(self.read_timeout)
+
+    # --- Availability ---
+
+    def is_available(self, refresh=False):
+        """
+        Returns True if the adb server answers on its port.
+        The result is cached briefly so a missing server is not probed on every
+        call; refresh=True probes again right away.
+        """
+        now = time.monotonic()
+        if not refresh and self._available is not None and now - self._checked_at < self.retry_interval:
+            return self._available
+        try:
+            self.host_query("host:version")
+            self._available = True
+        except AdbError:
+            self._available = False
+        self._checked_at = now
+        return self._available
+
+    def mark_unavailable(self):
+        self._available = False
+        self._checked_at = time.monotonic()
+
+    # --- Host services ---
+
+    def host_query(self, request):
+        """Sends a host request and returns its length-prefixed reply as a string."""
+        with self.pool.connection() as sock:
+            self._send_request(sock, request)
+            try:
+                reply = self._read_length_prefixed(sock)
+            except AdbConnectionError:
+                reply = b""
+            return reply.decode("utf-8", errors="replace")
+
+    def devices(self):
+        """Returns a list of (serial, state) tuples, like 'adb devices'."""
+        return self.parse_device_states(self.host_query("host:devices"))
+
+    @staticmethod
+    def parse_device_states(output):
+        """Parses 'serial<TAB>state' lines (host:devices, 'adb devices') into (serial, state) tuples."""
+        devices = []
+        for line in output.splitlines():
+            if "\t" in line:
+                serial, state = line.split("\t", 1)
+                devices.append((serial, state.strip()))
+        return devices
+
+    def track_devices(self, stop_event=None):
+        """
+        Consumes the host:track-devices-l stream and yields the full device list
+        each time the server reports a change. Each item is a list of dicts with
+        'serial', 'state', 'transport' and 'model'. Returns when stop_event is set
+        or the server closes the connection.
+
+        The stream stays open for the life of the caller, so it uses a
+        connection of its own instead of holding one of the pool's slots.
+        """
+        sock = self.pool._connect()
+        try:
+            self._send_request(sock, "host:track-devices-l")
+            # Short timeout so stop_event is noticed while the stream is idle
+            sock.settimeout(1.0)
+            buffer = b""
+            while stop_event is None or not stop_event.is_set():
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    raise AdbConnectionError("Device tracking stream closed by adb server")
+                buffer += chunk
+                while len(buffer) >= 4:
+                    length = int(buffer[:4], 16)
+                    if len(buffer) < 4 + length:
+                        break
+                    payload, buffer = buffer[4:4 + length], buffer[4 + length:]
+                    yield self.parse_device_list(payload.decode("utf-8", errors="replace"))
+        finally:
+            sock.close()
+
+    @staticmethod
+    def parse_device_list(output):
+        """Parses 'adb devices -l' style lines into a list of device dicts."""
+        devices = []
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            fields = dict(part.split(":", 1) for part in parts[2:] if ":" in part)
+            if "usb" in fields:
+                transport = f"usb:{fields['usb']}"
+            elif ":" in parts[0]:
+                transport = "tcp"
+            else:
+                transport = f"transport_id:{fields.get('transport_id', '?')}"
+            devices.append({
+                "serial": parts[0],
+                "state": parts[1],
+                "transport": transport,
+                "model": fields.get("model"),
+            })
+        return devices
+
+    # --- Device services ---
+
+    def exec_out(self, serial, command):
+        """Runs a command through exec: and returns its raw stdout as bytes."""
+        with self.pool.connection() as sock:
+            self._open_service(sock, serial, f"exec:{command}")
+            return self._recv_all(sock)
+
+    def exec_with_input(self, serial, command, local_path, on_chunk=None, chunk_size=65536):
+        """
+        Runs a command through exec:, streams the local file to its stdin and
+        returns its output as text (used for 'cmd package install -S').
+        on_chunk(byte_count) is called after every chunk sent.
+        """
+        with self.pool.connection() as sock:
+            self._open_service(sock, serial, f"exec:{command}")
+            with open(local_path, "rb") as f:
+                while True:
+                    data = f.read(chunk_size)
+                    if not data:
+                        break
+                    sock.sendall(data)
+                    if on_chunk:
+                        on_chunk(len(data))
+            output = self._recv_all(sock)
+        return output.decode("utf-8", errors="replace").strip()
+
+    def open_service(self, serial, service):
+        """
+        Opens a device service on a connection of its own, not counted by the
+        pool, for long-lived sessions. The caller owns and closes the socket.
+        """
+        sock = self.pool._connect()
+        try:
+            self._open_service(sock, serial, service)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    @contextmanager
+    def sync(self, serial):
+        """Opens a sync: session on the device and yields a SyncConnection."""
+        with self.pool.connection() as sock:
+            self._open_service(sock, serial, "sync:")
+            connection = SyncConnection(sock)
+            yield connection
+            try:
+                connection.quit()
+            except OSError:
+                pass
+
+    def exec_stream(self, serial, command, stop_event=None, chunk_size=65536):
+        """
+        Runs a command through exec: and yields raw stdout chunks as they arrive,
+        until the command exits or stop_event is set. Streams such as a logcat
+        capture can run for days, so this uses open_service (a connection
+        outside the pool) rather than holding a pool slot.
+        """
+        sock = self.open_service(serial, f"exec:{command}")
+        try:
+            # Short timeout so stop_event is noticed while the device is quiet
+            sock.settimeout(1.0)
+            while stop_event is None or not stop_event.is_set():
+                try:
+                    chunk = sock.recv(chunk_size)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            sock.close()
+
+    def shell_stream(self, serial, command):
+        """
+        Runs a shell command and yields its output line by line as it arrives.
+        Closing the generator early closes the connection.
+        """
+        with self.pool.connection() as sock:
+            self._open_service(sock, serial, f"shell:{command}")
+            pending = b""
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+            if pending:
+                yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+
+    def shell(self, serial, command):
+        """Runs a shell command and returns its output decoded and stripped."""
+        with self.pool.connection() as sock:
+            self._open_service(sock, serial, f"shell:{command}")
+            output = self._recv_all(sock)
+        return output.decode("utf-8", errors="replace").strip()
+
+    def close(self):
+        self.pool.close()
@@ -1,20 +1,161 @@
 import os
+import posixpath
+import re
+import shlex
+import stat
 import sys
 import subprocess
-from .utils import open_terminal, run_command_get_output
+import threading
+import time
+import concurrent.futures
+from .adb_client import AdbClient, AdbError, AdbConnectionError
+from .package_cache import PackageCache
+from .dir_cache import DirectoryCache
+from .device_profile import DeviceProfiles
+from .push_engine import PushEngine
+from .shell_session import ShellSessionPool
+from .single_flight import SingleFlight
+from .dir_sync import plan_sync
+from .bulk_install import BulkInstaller
+from .logcat_capture import LogcatCaptureManager
+from .screenshot import capture_png, capture_burst
+from .tracing import tracer, command_name
+from .utils import open_terminal, run_command_get_output, run_args_get_output, stream_args_output
+
+PACKAGE_NAME_RE = re.compile(r"^[A-Za-z0-9_.]+$")
+PACKAGE_HEADER_RE = re.compile(r"^\s*Package \[([^\]]+)\]")
+# Printed before the exit code of a command run on a one-shot shell
+EXIT_MARKER = "__ADBTOOL_EXIT_"
+
+
+def fan_out_row(device_id, result=None, error=None, latency=0.0):
+    """
+    One per-device result of a fleet run (see AdbManager.fan_out). ok is
+    False when the call raised (error) or returned a dict with ok=False.
+    """
+    ok = error is None and not (isinstance(result, dict) and result.get("ok") is False)
+    return {"device_id": device_id, "ok": ok, "result": result, "error": error, "latency": latency}
+
+
+def timeout_error(timeout):
+    """Error text of a fleet run row for a device that did not finish in time."""
+    return f"시간 초과 ({timeout:g}초)"
+
+
+class LabelCollector:
+    """
+    Batching, parsing and callbacks of get_app_labels, shared by AdbManager
+    and AsyncAdbManager, which only differ in how a script is run:
+
+        collector = LabelCollector(manager, packages, callback)
+        for batch, script in collector.batches():
+            collector.read(batch, <output lines of script>)
+        collector.labels  # {package: label or None}
+
+    callback(package, label) is called once per package, as soon as its
+    block has been read. answered holds the packages whose block was read
+    up to the next marker: only for those does a None label mean the
+    package has none (and may be cached as such) rather than that the
+    shell failed.
+    """
+
+    def __init__(self, manager, packages, callback=None):
+        self.manager = manager
+        self.callback = callback
+        self.packages = [pkg for pkg in packages if PACKAGE_NAME_RE.match(pkg)]
+        self.labels = dict.fromkeys(self.packages)
+        self.answered = set()
+        self._reported = set()
+
+    def batches(self):
+        """(batch, script) for every batch of packages."""
+        for batch in self.manager._batch_packages(self.packages):
+            yield batch, self.manager._label_script(batch)
+
+    def read(self, batch, lines):
+        """
+        Fills labels from the output of a batch's script (lines may be a
+        stream: a failing one loses the rest of the batch, not the call).
+        """
+        marker = self.manager.PACKAGE_MARKER
+        current = None
+        try:
+            for line in lines:
+                if line.startswith(marker):
+                    self._finish(current, answered=True)
+                    current = line[len(marker):].strip()
+                    if current not in self.labels:
+                        current = None
+                elif current is not None and self.labels[current] is None and "applicationLabel=" in line:
+                    self.labels[current] = line.split("applicationLabel=", 1)[1].strip() or None
+        except Exception:
+            pass
+        for pkg in batch:
+            self._finish(pkg)
+
+    def _finish(self, pkg, answered=False):
+        if pkg is not None and answered:
+            self.answered.add(pkg)
+        if pkg is not None and pkg not in self._reported:
+            self._reported.add(pkg)
+            if self.callback:
+                self.callback(pkg, self.labels[pkg])
+
 
 class AdbManager:
-    DEVICE_MAP = {
-        "5200b937431d4639": "(T583/prod/무한9671)",
-        "5200e504ba849645": "(T583/stg/무한6027)",
-        "R9TR90HQ6GL": "(T500/stg/무한8721)",
-        "WJD06AR03662": "(MPAD1/stg)",
-        "WJD09ANF00170": "(MPAD2/stg)"
+    # Marker echoed before each package block in batched shell scripts
+    PACKAGE_MARKER = "__ADBTOOL_PKG__ "
+    # Keep batched scripts below the smallest shell payload older adbd accepts
+    MAX_SCRIPT_LENGTH = 3000
+    # Child directories listed in the background after a listing with prefetch=True
+    PREFETCH_LIMIT = 16
+
+    # Actions that are a single shell command: id -> (command, kind, title or message).
+    # 'info' actions show the command output, 'action' ones are fire-and-forget.
+    SHELL_ACTIONS = {
+        # Launcher Version
+        0: ("dumpsys package com.wjthinkbig.mlauncher2 | grep -E 'versionName|versionCode'",
+            "info", "런쳐 버전 정보"),
+        # Back Button
+        2: ("input keyevent KEYCODE_BACK", "action", "뒤로가기 실행됨"),
+        # Home Button
+        3: ("input keyevent KEYCODE_HOME", "action", "홈 버튼 실행됨"),
+        # Screen Off
+        4: ("input keyevent KEYCODE_SLEEP", "action", "화면 끄기 실행됨"),
+        # Battery Info
+        6: ("dumpsys battery", "info", "배터리 정보"),
+        # Delete App
+        10: ("am broadcast -n com.wjthinkbig.minstaller2m/com.wjthinkbig.minstaller2.receiver.InstallIfReceiver "
+             "-a com.wjthinkbig.minstaller2.ACT_APP_DELETE --es APP_PACKAGE_ID {package}",
+             "action", "앱 삭제 완료: {package}"),
+        # Screen Capture Permission
+        12: ("am broadcast -n com.wjthinkbig.mlauncher2/com.wjthinkbig.mlauncher2.broadcast.TopActivityRecevier "
+             "-a android.intent.action.ACTION_APPLICATION_FOCUS_CHANGE "
+             "--es application_focus_component_name \"com.rsupport.rs.activity.rsupport.sec\" "
+             "--es application_focus_status \"gained\"",
+             "action", "화면 캡쳐 권한 부여됨"),
+        # Installed App Version
+        13: ("dumpsys package {package} | grep -E 'versionName|versionCode'", "info", "앱 버전 정보"),
+        # Top App Info
+        15: ("dumpsys window windows | grep -E 'mCurrentFocus|mFocusedApp'", "info", "최상위 앱 정보"),
     }
 
     def __init__(self):
         self.adb_path = self._get_tool_path("adb")
         self.scrcpy_path = self._get_tool_path("scrcpy")
+        self.client = AdbClient()
+        self.shell_sessions = ShellSessionPool(self)
+        # Identical read-only queries running at the same time share one adb call
+        self.single_flight = SingleFlight()
+        self.package_cache = PackageCache()
+        # device_id -> {package: stamp} from the last get_package_stamps call
+        self._package_stamps = {}
+        self.log_captures = LogcatCaptureManager(self)
+        self.directory_cache = DirectoryCache()
+        self.device_profiles = DeviceProfiles(self)
+        self._prefetcher = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="DirPrefetch")
+        self._prefetching = set()
+        self._prefetch_lock = threading.Lock()
 
     def _get_tool_path(self, tool_name):
         """
@@ -39,26 +180,231 @@ class AdbManager:
             
         return tool_name # Fallback to system PATH
 
+    def _run_shell(self, device_id, command):
+        """
+        Runs a shell command on the device and returns its output.
+        Uses a pooled shell session (see ShellSessionPool) or a one-shot
+        shell over the adb server socket, and falls back to spawning the adb
+        client when the server is not reachable.
+        """
+        with tracer.span(command_name("shell", command), "shell", device=device_id, command=command) as span:
+            if self.client.is_available():
+                result = self._session_shell(device_id, command, span)
+                if result is not None:
+                    span.update(transport="session", bytes=len(result[0]))
+                    return result[0]
+                try:
+                    output = self.client.shell(device_id, command)
+                    span.update(transport="socket", bytes=len(output))
+                    return output
+                except AdbConnectionError:
+                    self.client.mark_unavailable()
+                except AdbError as e:
+                    # Same result the adb client gives for an unknown/offline device
+                    span["error"] = str(e)
+                    return ""
+            output = run_args_get_output([self.adb_path.strip('"'), "-s", device_id, "shell", command])
+            span.update(transport="adb", bytes=len(output))
+            return output
+
+    def _run_shell_status(self, device_id, command):
+        """
+        Runs a shell command like _run_shell and returns (output, exit_code).
+        exit_code is None when the command could not be run. A pooled
+        session reports the code itself; a one-shot shell does not, so the
+        command is run in a child sh followed by an echo of its status.
+        """
+        with tracer.span(command_name("shell", command), "shell", device=device_id, command=command) as span:
+            if self.client.is_available():
+                result = self._session_shell(device_id, command, span)
+                if result is not None:
+                    span.update(transport="session", bytes=len(result[0]), exit_code=result[1])
+                    return result
+            span["transport"] = "one-shot"
+        output = self._run_shell(device_id, f"sh -c {shlex.quote(command)}; echo; echo {EXIT_MARKER}$?")
+        output, found, code = output.rpartition(EXIT_MARKER)
+        if not found:
+            return code, None
+        code = code.strip()
+        return output.rstrip(), int(code) if code.lstrip("-").isdigit() else None
+
+    def _session_shell(self, device_id, command, span):
+        """
+        Runs a command on a pooled shell session and returns (output,
+        exit_code), or None when no session could run it and a one-shot
+        shell should. Only a session that fails before the command was sent
+        falls back: once sent the command may have run on the device (an
+        install, an rm), so the failure is recorded on the span and ("",
+        None) returned instead of running it twice.
+        """
+        sent = False
+        try:
+            with self.shell_sessions.session(device_id) as session:
+                if session is not None:
+                    try:
+                        return session.run(command)
+                    finally:
+                        sent = session.written > 0
+        except (AdbError, OSError) as e:
+            self.shell_sessions.stats["failed"] += 1
+            if sent:
+                span["error"] = str(e)
+                return "", None
+        return None
+
+    def _session_lines(self, device_id, command, span):
+        """
+        Generator for _stream_shell: yields the output lines of a command run
+        on a pooled shell session and returns True, or returns False without
+        output when a one-shot shell has to run it instead (only if the
+        session failed before the command was sent, see _session_shell).
+        """
+        session = None
+        try:
+            with self.shell_sessions.session(device_id) as session:
+                if session is None:
+                    return False
+                yield from session.lines(command)
+        except (AdbError, OSError) as e:
+            self.shell_sessions.stats["failed"] += 1
+            if session is None or not session.written:
+                return False
+            span["error"] = str(e)
+        span["transport"] = "session"
+        return True
+
+    def _exec_out(self, device_id, command):
+        """
+        Runs a command on the device and returns its raw stdout as bytes
+        (no pty, so binary output such as PNG data is not mangled).
+        """
+        with tracer.span(command_name("exec", command), "shell", device=device_id, command=command) as span:
+            if self.client.is_available():
+                try:
+                    output = self.client.exec_out(device_id, command)
+                    span.update(transport="socket", bytes=len(output))
+                    return output
+                except AdbConnectionError:
+                    self.client.mark_unavailable()
+                except AdbError as e:
+                    span["error"] = str(e)
+                    return b""
+            span["transport"] = "adb"
+            try:
+                output = subprocess.check_output([self.adb_path.strip('"'), "-s", device_id, "exec-out", command],
+                                                 stderr=subprocess.DEVNULL)
+            except (subprocess.CalledProcessError, OSError) as e:
+                span["error"] = str(e)
+                return b""
+            span["bytes"] = len(output)
+            return output
+
+    def _stream_shell(self, device_id, command):
+        """
+        Runs a shell command on the device and yields its output line by line
+        as it arrives, so callers can parse large outputs incrementally.
+        """
+        with tracer.span(command_name("shell", command), "shell", device=device_id, command=command,
+                         stream=True) as span:
+            if self.client.is_available():
+                if (yield from self._session_lines(device_id, command, span)):
+                    return
+                stream = self.client.shell_stream(device_id, command)
+                try:
+                    first = next(stream)
+                except StopIteration:
+                    span["transport"] = "socket"
+                    return
+                except AdbConnectionError:
+                    self.client.mark_unavailable()
+                    stream = None
+                except AdbError as e:
+                    span["error"] = str(e)
+                    return
+                if stream is not None:
+                    span["transport"] = "socket"
+                    try:
+                        yield first
+                        yield from stream
+                    finally:
+                        stream.close()
+                    return
+            span["transport"] = "adb"
+            yield from stream_args_output([self.adb_path.strip('"'), "-s", device_id, "shell", command])
+
+    def _run_shell_detached(self, device_id, command):
+        """Runs a shell command without waiting for it to finish."""
+        threading.Thread(target=self._run_shell, args=(device_id, command), daemon=True).start()
+
+    def _dispatch_shell(self, device_id, command, blocking=False):
+        """Runs a shell command, waiting for it only when blocking is set."""
+        if blocking:
+            self._run_shell(device_id, command)
+        else:
+            self._run_shell_detached(device_id, command)
+
+    def start_server(self):
+        """
+        Starts the adb server if it does not answer yet (the first start can
+        take seconds) and returns whether it is reachable afterwards.
+        """
+        if self.client.is_available():
+            return True
+        with tracer.span("adb start-server", "startup"):
+            run_args_get_output([self.adb_path.strip('"'), "start-server"])
+        return self.client.is_available(refresh=True)
+
+    def _list_device_states(self):
+        """Returns a list of (device_id, state) tuples for every attached device."""
+        return list(self.single_flight.do("devices", None, self._query_device_states))
+
+    def _query_device_states(self):
+        if self.client.is_available():
+            try:
+                return self.client.devices()
+            except AdbConnectionError:
+                self.client.mark_unavailable()
+            except AdbError:
+                return []
+        # The 'List of devices attached' header has no tab and is skipped
+        return AdbClient.parse_device_states(run_command_get_output(f"{self.adb_path} devices"))
+
     def get_devices(self):
         """
         Returns a list of tuples (device_id, description).
         """
-        output = run_command_get_output(f"{self.adb_path} devices")
         devices = []
-        lines = output.splitlines()
-        for line in lines[1:]:  # Skip header
-            if "\tdevice" in line:
-                device_id = line.split("\t")[0]
-                description = self.DEVICE_MAP.get(device_id, "(unknown)")
-                devices.append((device_id, f"{device_id} {description}"))
+        for device_id, state in self._list_device_states():
+            if state == "device":
+                devices.append((device_id, self.describe_device(device_id)))
         return devices
 
+    def describe_device(self, device_id):
+        """
+        Returns the display text used for a device in the device list, from
+        cached profiles only (see load_device_profiles).
+        """
+        return f"{device_id} {self.device_profiles.label(device_id)}"
+
+    def load_device_profiles(self, device_ids=None):
+        """
+        Reads the profile (one getprop call) of every device not read yet in
+        this session. See fan_out for the result format.
+        """
+        return self.fan_out(self.device_profiles.load, device_ids)
+
     def get_installed_packages(self, device_id):
         """
         Returns a list of tuples (package_name, app_name) for installed packages.
         """
-        cmd = f"{self.adb_path} -s {device_id} shell pm list packages"
-        output = run_command_get_output(cmd)
+        return list(self.single_flight.do("pm list packages", device_id, self._query_installed_packages, device_id))
+
+    def _query_installed_packages(self, device_id):
+        return self.parse_package_list(self._run_shell(device_id, "pm list packages"))
+
+    @staticmethod
+    def parse_package_list(output):
+        """Parses 'pm list packages' output into sorted (package_name, app_name) tuples."""
         packages = []
         
         for line in output.splitlines():
@@ -82,8 +428,7 @@ class AdbManager:
         Returns the label or None if not found.
         """
         try:
-            label_cmd = f"{self.adb_path} -s {device_id} shell pm dump {package_name}"
-            label_output = run_command_get_output(label_cmd)
+            label_output = self._run_shell(device_id, f"pm dump {package_name}")
             
             # Look for application label in the output
             for line in label_output.splitlines():
@@ -96,12 +441,266 @@ class AdbManager:
             pass
         
         return None
-    
+
+    def _batch_packages(self, packages):
+        """Splits packages into batches whose generated script stays under MAX_SCRIPT_LENGTH."""
+        batch, length = [], 0
+        for pkg in packages:
+            cost = len(pkg) + 1
+            if batch and length + cost > self.MAX_SCRIPT_LENGTH:
+                yield batch
+                batch, length = [], 0
+            batch.append(pkg)
+            length += cost
+        if batch:
+            yield batch
+
+    def get_app_labels(self, device_id, packages, callback=None):
+        """
+        Gets application labels for many packages in one shell invocation.
+        Every package block is introduced by PACKAGE_MARKER and the device side
+        stops dumping a package as soon as its label line is printed.
+        Returns a dict {package_name: label or None}; callback(package, label)
+        is called for each package as soon as its block has been parsed.
+        """
+        return self._collect_labels(device_id, packages, callback).labels
+
+    def _collect_labels(self, device_id, packages, callback=None):
+        collector = LabelCollector(self, packages, callback)
+        for batch, script in collector.batches():
+            collector.read(batch, self._stream_shell(device_id, script))
+        return collector
+
+    def _label_script(self, batch):
+        # The final marker ('-' is no package name) closes the last package's block
+        return (f"for p in {' '.join(batch)}; do echo \"{self.PACKAGE_MARKER}$p\"; "
+                f"pm dump $p | grep -m 1 applicationLabel=; done; echo \"{self.PACKAGE_MARKER}-\"")
+
+    def get_package_stamps(self, device_id, package_name=None):
+        """
+        Returns {package_name: stamp} where stamp combines versionCode and
+        lastUpdateTime, for every package (one dumpsys pass) or a single one.
+        Stamps identify a package build for PackageCache lookups.
+        """
+        return self.single_flight.do("package stamps", (device_id, package_name),
+                                     self._query_package_stamps, device_id, package_name)
+
+    def _query_package_stamps(self, device_id, package_name):
+        stamps = self.parse_package_stamps(self._stream_shell(device_id, self._stamps_command(package_name)))
+        self._remember_stamps(device_id, package_name, stamps)
+        return stamps
+
+    @staticmethod
+    def _stamps_command(package_name=None):
+        target = package_name if package_name else "packages"
+        return f"dumpsys package {target} | grep -E '^  Package \\[|versionCode=|lastUpdateTime='"
+
+    @staticmethod
+    def parse_package_stamps(lines):
+        """Builds {package_name: 'versionCode|lastUpdateTime'} from filtered dumpsys lines."""
+        stamps = {}
+        current = None
+        version_code = None
+        for line in lines:
+            header = PACKAGE_HEADER_RE.match(line)
+            if header:
+                # Hidden system packages repeat later in the dump; keep the first block
+                current = header.group(1) if header.group(1) not in stamps else None
+                version_code = None
+            elif current is None:
+                continue
+            elif "versionCode=" in line and version_code is None:
+                version_code = line.split("versionCode=", 1)[1].split()[0]
+            elif "lastUpdateTime=" in line:
+                update_time = line.split("lastUpdateTime=", 1)[1].strip()
+                stamps[current] = f"{version_code}|{update_time}"
+                current = None
+        return stamps
+
+    # Keys of a package block in 'dumpsys package packages' -> app details field
+    INVENTORY_KEYS = {
+        "applicationLabel": "name",
+        "versionName": "version_name",
+        "versionCode": "version_code",
+        "firstInstallTime": "install_date",
+        "lastUpdateTime": "update_date",
+        "dataDir": "data_dir",
+        "codePath": "apk_path",
+    }
+
+    def get_package_inventory(self, device_id):
+        """
+        Returns {package_name: details} for every installed package from one
+        'dumpsys package packages' pass, with the same details dicts as
+        get_app_details. The dump has no labels on most Android versions, so
+        names come from the package cache (None if not cached yet; see
+        get_app_labels_cached). The stamps are refreshed and the details
+        cached, so get_app_details needs no adb call for a labelled package.
+        Concurrent calls for a device share one dump; each gets its own copy
+        of the details, so callers may modify them.
+        """
+        inventory = self.single_flight.do("package inventory", device_id, self._query_package_inventory, device_id)
+        return {package: dict(details) for package, details in inventory.items()}
+
+    def _query_package_inventory(self, device_id):
+        inventory = self.parse_package_inventory(self._stream_shell(device_id, "dumpsys package packages"))
+        return self._complete_inventory(device_id, inventory)
+
+    @classmethod
+    def parse_package_inventory(cls, lines):
+        """
+        Single-pass parser for 'dumpsys package packages' output (an
+        iterable of lines). Tracks the current section and package block;
+        every 'key=value' line in a block is looked up in INVENTORY_KEYS,
+        the first value of a key wins. Blocks outside the 'Packages:'
+        section (e.g. hidden system packages) are skipped.
+        """
+        inventory = {}
+        in_packages = True  # a dump without section headers is all packages
+        current = None
+        for line in lines:
+            if not line.startswith(" "):
+                if line.strip():
+                    # Section header: 'Packages:', 'Hidden system packages:', ...
+                    in_packages = line.startswith("Packages:")
+                    current = None
+                continue
+            header = PACKAGE_HEADER_RE.match(line)
+            if header:
+                package = header.group(1)
+                current = None
+                if in_packages and package not in inventory:
+                    current = inventory[package] = dict.fromkeys(
+                        ("package", "name", "version_name", "version_code", "install_date", "update_date",
+                         "data_dir", "apk_path"))
+                    current["package"] = package
+                continue
+            if current is None:
+                continue
+            key, sep, value = line.strip().partition("=")
+            field = cls.INVENTORY_KEYS.get(key) if sep else None
+            if field is None or current[field] is not None:
+                continue
+            if field == "version_code":
+                value = value.split()[0] if value.split() else ""
+            current[field] = value.strip() or None
+        return inventory
+
+    @staticmethod
+    def inventory_stamps(inventory):
+        """{package_name: stamp} for an inventory, as get_package_stamps would return."""
+        return {package: f"{details['version_code']}|{details['update_date']}"
+                for package, details in inventory.items() if details["update_date"] is not None}
+
+    def _complete_inventory(self, device_id, inventory):
+        """
+        Remembers the stamps and fills in the names cached for the same
+        stamp; those packages' details are cached for get_app_details.
+        """
+        stamps = self.inventory_stamps(inventory)
+        self._remember_stamps(device_id, None, stamps)
+        entries = []
+        # Not counted: these are not packages anyone asked a label for
+        for package, label in self.package_cache.lookup_labels(device_id, stamps, count=False).items():
+            details = inventory[package]
+            if details["name"] is None:
+                details["name"] = label
+            entries.append((package, stamps[package], details["name"], details))
+        self.package_cache.store_many(device_id, entries)
+        return inventory
+
+    def _remember_stamps(self, device_id, package_name, stamps):
+        known = self._package_stamps.setdefault(device_id, {})
+        if package_name is None:
+            known.clear()
+        known.update(stamps)
+
+    def _get_package_stamp(self, device_id, package_name):
+        stamp = self._package_stamps.get(device_id, {}).get(package_name)
+        if stamp is None:
+            stamp = self.get_package_stamps(device_id, package_name).get(package_name)
+        return stamp
+
+    def get_app_labels_cached(self, device_id, packages, callback=None, inventory=None):
+        """
+        Like get_app_labels, but serves packages whose stamp is unchanged from
+        the package cache and only dumps the ones that are new or updated.
+        Given an inventory from get_package_inventory, its stamps are used
+        (no extra dumpsys) and fetched labels are cached with its details.
+        """
+        stamps = self.inventory_stamps(inventory) if inventory is not None else self.get_package_stamps(device_id)
+        labels, missing = self._cached_labels(device_id, packages, stamps, callback)
+
+        if missing:
+            labels.update(self._store_labels(device_id, self._collect_labels(device_id, missing, callback),
+                                             stamps, inventory))
+        return labels
+
+    def _cached_labels(self, device_id, packages, stamps, callback=None):
+        """
+        Splits packages into ({package: label} served from the package cache,
+        [packages to fetch]); one cache query and commit for all of them.
+        """
+        labels = self.package_cache.lookup_labels(device_id, {pkg: stamps[pkg] for pkg in packages
+                                                              if stamps.get(pkg)})
+        if callback:
+            for pkg, label in labels.items():
+                callback(pkg, label)
+        return labels, [pkg for pkg in packages if pkg not in labels]
+
+    def _store_labels(self, device_id, collector, stamps, inventory=None):
+        """
+        Caches the labels a LabelCollector fetched and returns them. A None
+        label is only cached for a package the device answered for, so a
+        failed shell is retried next time.
+        """
+        self.package_cache.store_many(device_id, [
+            (pkg, stamps[pkg], label, self._labelled_details(inventory, pkg, label))
+            for pkg, label in collector.labels.items()
+            if pkg in stamps and (label is not None or pkg in collector.answered)
+        ])
+        return collector.labels
+
+    @staticmethod
+    def _labelled_details(inventory, package_name, label):
+        """Copy of a package's inventory details with its fetched label, or None without an inventory."""
+        details = inventory.get(package_name) if inventory else None
+        if details is None:
+            return None
+        return dict(details, name=label)
+
     def get_app_details(self, device_id, package_name):
         """
         Gets detailed information about an app.
         Returns a dictionary with app details.
         """
+        stamp = self._get_package_stamp(device_id, package_name)
+        if stamp:
+            cached = self.package_cache.lookup(device_id, package_name, stamp)
+            if cached and cached["details"]:
+                return cached["details"]
+
+        try:
+            # Get package dump
+            dump_output = self.single_flight.do("pm dump", (device_id, package_name),
+                                                self._run_shell, device_id, f"pm dump {package_name}")
+        except Exception:
+            dump_output = ""
+        return self._complete_app_details(device_id, package_name, stamp, self.parse_app_dump(package_name, dump_output))
+
+    def _complete_app_details(self, device_id, package_name, stamp, details):
+        """Caches freshly parsed details and fills in a fallback name."""
+        if stamp and details["version_code"]:
+            self.package_cache.store(device_id, package_name, stamp, label=details["name"], details=details)
+
+        # If no name found, use package name
+        if not details["name"]:
+            details["name"] = package_name.split('.')[-1]
+        return details
+
+    @staticmethod
+    def parse_app_dump(package_name, dump_output):
+        """Parses 'pm dump <package>' output into the app details dict."""
         details = {
             "package": package_name,
             "name": None,
@@ -113,82 +712,91 @@ class AdbManager:
             "apk_path": None
         }
         
-        try:
-            # Get package dump
-            dump_cmd = f"{self.adb_path} -s {device_id} shell pm dump {package_name}"
-            dump_output = run_command_get_output(dump_cmd)
-            
-            for line in dump_output.splitlines():
-                line = line.strip()
-                
-                if "applicationLabel=" in line:
-                    details["name"] = line.split("applicationLabel=", 1)[1].strip()
-                elif "versionName=" in line and not details["version_name"]:
-                    details["version_name"] = line.split("versionName=", 1)[1].strip()
-                elif "versionCode=" in line and not details["version_code"]:
-                    parts = line.split("versionCode=", 1)[1].strip()
-                    # Extract just the number
-                    details["version_code"] = parts.split()[0] if parts else None
-                elif "firstInstallTime=" in line:
-                    details["install_date"] = line.split("firstInstallTime=", 1)[1].strip()
-                elif "lastUpdateTime=" in line:
-                    details["update_date"] = line.split("lastUpdateTime=", 1)[1].strip()
-                elif "dataDir=" in line:
-                    details["data_dir"] = line.split("dataDir=", 1)[1].strip()
-                elif "codePath=" in line and not details["apk_path"]:
-                    details["apk_path"] = line.split("codePath=", 1)[1].strip()
+        for line in dump_output.splitlines():
+            line = line.strip()
             
-            # If no name found, use package name
-            if not details["name"]:
-                details["name"] = package_name.split('.')[-1]
-                
-        except Exception as e:
-            details["name"] = package_name.split('.')[-1]
+            if "applicationLabel=" in line:
+                details["name"] = line.split("applicationLabel=", 1)[1].strip()
+            elif "versionName=" in line and not details["version_name"]:
+                details["version_name"] = line.split("versionName=", 1)[1].strip()
+            elif "versionCode=" in line and not details["version_code"]:
+                parts = line.split("versionCode=", 1)[1].strip()
+                # Extract just the number
+                details["version_code"] = parts.split()[0] if parts else None
+            elif "firstInstallTime=" in line:
+                details["install_date"] = line.split("firstInstallTime=", 1)[1].strip()
+            elif "lastUpdateTime=" in line:
+                details["update_date"] = line.split("lastUpdateTime=", 1)[1].strip()
+            elif "dataDir=" in line:
+                details["data_dir"] = line.split("dataDir=", 1)[1].strip()
+            elif "codePath=" in line and not details["apk_path"]:
+                details["apk_path"] = line.split("codePath=", 1)[1].strip()
         
         return details
 
-    def get_device_title(self, device_id):
-        """Returns the title for the device window based on ID."""
-        if device_id == "5200b937431d4639": return "(T583/prod)"
-        if device_id == "5200e504ba849645": return "(T583/stg)"
-        if device_id == "R9TR90HQ6GL": return "(T500/stg)"
-        if device_id == "WJD06AR03662": return "(MPAD1/stg)"
-        if device_id == "WJD09ANF00170": return "(MPAD2/stg)"
-        return "(unknown)"
-
     def execute_action(self, action_id, device_id, **kwargs):
         """
         Executes the specified action on the given device.
         Returns a dict with 'type': 'info'/'action' and 'data': ... if applicable.
+        With blocking=True, fire-and-forget commands are waited for and
+        terminal-based install/broadcast return their output instead.
+        Every call is recorded as an 'action <id>' span.
         """
+        with tracer.span(f"action {action_id}", "action", action=action_id, device=device_id,
+                         package=kwargs.get("package") or None) as span:
+            result = self._execute_action(action_id, device_id, **kwargs)
+            if isinstance(result, dict):
+                span["result"] = result.get("type")
+                if result.get("ok") is False:
+                    span["error"] = "failed"
+            return result
+
+    @staticmethod
+    def install_result(output):
+        """Builds the execute_action result for an install (action 11) from its output."""
+        return {"type": "info", "data": output, "title": "앱 설치 결과", "ok": "Success" in output}
+
+    @staticmethod
+    def _broadcast_command(action):
+        return f"am broadcast -a {action}"
+
+    @staticmethod
+    def broadcast_result(output):
+        """Builds the execute_action result for Send Broadcast (action 14) from its output."""
+        return {"type": "info", "data": output, "title": "브로드캐스트 결과"}
+
+    @staticmethod
+    def _mkdir_command(path):
+        return f"mkdir -p \"{path}\""
+
+    def shell_action_result(self, action_id, package, output):
+        """Builds the execute_action result for a SHELL_ACTIONS entry."""
+        _, kind, text = self.SHELL_ACTIONS[action_id]
+        text = text.format(package=package)
+        if kind == "info":
+            return {"type": "info", "data": output, "title": text}
+        return {"type": "action", "msg": text}
+
+    def _execute_action(self, action_id, device_id, **kwargs):
         package = kwargs.get("package", "")
+        blocking = kwargs.get("blocking", False)
         
-        if action_id == 0: # Launcher Version
-            cmd = f"{self.adb_path} -s {device_id} shell dumpsys package com.wjthinkbig.mlauncher2 | findstr \"versionName versionCode\""
-            output = run_command_get_output(cmd)
-            return {"type": "info", "data": output, "title": "런쳐 버전 정보"}
-            
+        if action_id in self.SHELL_ACTIONS:
+            command, kind, _ = self.SHELL_ACTIONS[action_id]
+            command = command.format(package=package)
+            output = None
+            if kind == "info":
+                output = self._run_shell(device_id, command)
+            else:
+                self._dispatch_shell(device_id, command, blocking)
+            return self.shell_action_result(action_id, package, output)
+
         elif action_id == 1: # Scrcpy
-            title = self.get_device_title(device_id)
-            cmd = f"{self.scrcpy_path} -s {device_id} -S --window-title {title} --disable-screensaver --max-size 1024 --always-on-top -t --rotation 0"
+            title = self.device_profiles.label(device_id)
+            cmd = f"{self.scrcpy_path} -s {device_id} -S --window-title \"{title}\" --disable-screensaver --max-size 1024 --always-on-top -t --rotation 0"
             open_terminal(cmd, title="Scrcpy")
             return {"type": "action", "msg": "Scrcpy 실행됨"}
 
-        elif action_id == 2: # Back Button
-            cmd = f"{self.adb_path} -s {device_id} shell input keyevent KEYCODE_BACK"
-            subprocess.Popen(cmd, shell=True)
-            return {"type": "action", "msg": "뒤로가기 실행됨"}
-
-        elif action_id == 3: # Home Button
-            cmd = f"{self.adb_path} -s {device_id} shell input keyevent KEYCODE_HOME"
-            subprocess.Popen(cmd, shell=True)
-            return {"type": "action", "msg": "홈 버튼 실행됨"}
-
-        elif action_id == 4: # Screen Off
-            cmd = f"{self.adb_path} -s {device_id} shell input keyevent KEYCODE_SLEEP"
-            subprocess.Popen(cmd, shell=True)
-            return {"type": "action", "msg": "화면 끄기 실행됨"}
-
         elif action_id == 5: # Logcat
             if package:
                 cmd = f"{self.adb_path} -s {device_id} logcat {package}:* *:s"
@@ -202,15 +810,22 @@ class AdbManager:
             if not save_path:
                 return {"type": "action", "msg": "저장 경로가 지정되지 않았습니다."}
             
-            # Use subprocess.run for shell redirection
-            cmd = f"{self.adb_path} -s {device_id} logcat -d > \"{save_path}\""
-            subprocess.run(cmd, shell=True)
+            log_data = self._exec_out(device_id, "logcat -d")
+            with open(save_path, "wb") as f:
+                f.write(log_data)
             return {"type": "action", "msg": f"로그 저장 완료: {save_path}"}
 
-        elif action_id == 6: # Battery Info
-            cmd = f"{self.adb_path} -s {device_id} shell dumpsys battery"
-            output = run_command_get_output(cmd)
-            return {"type": "info", "data": output, "title": "배터리 정보"}
+        elif action_id == 56: # Log Capture (start/stop)
+            if self.log_captures.is_capturing(device_id):
+                stats = self.log_captures.stop(device_id).stats()
+                return {"type": "action", "msg": f"로그 캡처 중지: {stats['entries_written']}줄, 파일 {len(stats['segments'])}개"}
+
+            save_dir = kwargs.get("save_dir")
+            if not save_dir:
+                return {"type": "action", "msg": "저장 폴더가 지정되지 않았습니다."}
+            # Same meaning as the Logcat action: the parameter is a tag filter
+            self.log_captures.start(device_id, save_dir, tags=[package] if package else None)
+            return {"type": "action", "msg": f"로그 캡처 시작: {save_dir}"}
 
         elif action_id == 7: # Adb Shell
             cmd = f"{self.adb_path} -s {device_id} shell"
@@ -218,49 +833,31 @@ class AdbManager:
             return {"type": "action", "msg": "ADB Shell 실행됨"}
 
         elif action_id == 8: # All Devices Scrcpy
-            devices = self.get_devices()
-            for dev_id, _ in devices:
-                cmd = f"{self.scrcpy_path} -s {dev_id} -S --disable-screensaver --max-size 1024 --always-on-top -t"
+            def open_scrcpy(dev_id):
+                title = self.device_profiles.label(dev_id)
+                cmd = f"{self.scrcpy_path} -s {dev_id} -S --window-title \"{title}\" --disable-screensaver --max-size 1024 --always-on-top -t"
                 open_terminal(cmd, title=f"Scrcpy {dev_id}")
-            return {"type": "action", "msg": "모든 디바이스 Scrcpy 실행됨"}
+            results = self.fan_out(open_scrcpy)
+            return {"type": "action", "msg": f"모든 디바이스 Scrcpy 실행됨 ({self._summarize(results)})", "results": results}
 
         elif action_id == 9: # All Devices Sleep
-            devices = self.get_devices()
-            for dev_id, _ in devices:
-                cmd = f"{self.adb_path} -s {dev_id} shell input keyevent KEYCODE_SLEEP"
-                subprocess.Popen(cmd, shell=True)
-            return {"type": "action", "msg": "모든 디바이스 화면 끄기 실행됨"}
-
-        elif action_id == 10: # Delete App
-            cmd = f"{self.adb_path} -s {device_id} shell am broadcast -n com.wjthinkbig.minstaller2m/com.wjthinkbig.minstaller2.receiver.InstallIfReceiver -a com.wjthinkbig.minstaller2.ACT_APP_DELETE --es APP_PACKAGE_ID {package}"
-            subprocess.Popen(cmd, shell=True)
-            return {"type": "action", "msg": f"앱 삭제 완료: {package}"}
+            results = self.run_on_devices(4, blocking=True)
+            return {"type": "action", "msg": f"모든 디바이스 화면 끄기 실행됨 ({self._summarize(results)})", "results": results}
 
         elif action_id == 11: # Install App
+            if blocking:
+                return self.install_result(self.install_package_files(device_id, [package]))
             cmd = f"{self.adb_path} -s {device_id} install {package}"
             open_terminal(cmd, title="Install App")
             return {"type": "action", "msg": "앱 설치 명령 실행됨"}
 
-        elif action_id == 12: # Screen Capture Permission
-            cmd = f"{self.adb_path} -s {device_id} shell am broadcast -n com.wjthinkbig.mlauncher2/com.wjthinkbig.mlauncher2.broadcast.TopActivityRecevier -a android.intent.action.ACTION_APPLICATION_FOCUS_CHANGE --es application_focus_component_name \"com.rsupport.rs.activity.rsupport.sec\" --es application_focus_status \"gained\""
-            subprocess.Popen(cmd, shell=True)
-            return {"type": "action", "msg": "화면 캡쳐 권한 부여됨"}
-
-        elif action_id == 13: # Installed App Version
-            cmd = f"{self.adb_path} -s {device_id} shell dumpsys package {package} | findstr \"versionName versionCode\""
-            output = run_command_get_output(cmd)
-            return {"type": "info", "data": output, "title": "앱 버전 정보"}
-
         elif action_id == 14: # Send Broadcast
-            cmd = f"{self.adb_path} -s {device_id} shell am broadcast -a {package}"
+            if blocking:
+                return self.broadcast_result(self._run_shell(device_id, self._broadcast_command(package)))
+            cmd = f"{self.adb_path} -s {device_id} shell {self._broadcast_command(package)}"
             open_terminal(cmd, title="Send Broadcast")
             return {"type": "action", "msg": "브로드캐스트 전송됨"}
 
-        elif action_id == 15: # Top App Info
-            cmd = f"{self.adb_path} -s {device_id} shell \"dumpsys window windows | grep -E 'mCurrentFocus|mFocusedApp'\""
-            output = run_command_get_output(cmd)
-            return {"type": "info", "data": output, "title": "최상위 앱 정보"}
-
         elif action_id == 100: # Clear Debug App
             cmd = f"{self.adb_path} -s {device_id} shell \"am clear-debug-app\""
             open_terminal(cmd, title="Clear Debug App")
@@ -270,53 +867,206 @@ class AdbManager:
             import datetime
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"screenshot_{device_id}_{timestamp}.png"
-            
-            # 1. Capture to device
-            run_command_get_output(f"{self.adb_path} -s {device_id} shell screencap -p /sdcard/temp_screen.png")
-            # 2. Pull to local
-            run_command_get_output(f"{self.adb_path} -s {device_id} pull /sdcard/temp_screen.png \"{filename}\"")
-            # 3. Delete from device
-            run_command_get_output(f"{self.adb_path} -s {device_id} shell rm /sdcard/temp_screen.png")
-            
+
+            # Stream the PNG straight from the device (no temp file on /sdcard)
+            try:
+                data = capture_png(self, device_id)
+            except RuntimeError as e:
+                return {"type": "info", "data": str(e), "title": "화면 캡쳐", "ok": False}
+            with open(filename, "wb") as f:
+                f.write(data)
+
             return {"type": "action", "msg": f"캡쳐 완료: {filename}"}
 
-    def list_directories(self, device_id, path):
+        elif action_id == 202: # Burst Screen Capture
+            import datetime
+            frames = kwargs.get("frames", 10)
+            interval = kwargs.get("interval", 0.5)
+            device_ids = kwargs.get("device_ids") or [device_id]
+            output_dir = kwargs.get("output_dir") or f"burst_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+            results = capture_burst(self, device_ids, frames, interval, output_dir,
+                                    progress=kwargs.get("progress"))
+            saved = sum(len(r["files"]) for r in results.values())
+            lines = [f"{self.describe_device(dev_id)}: {len(r['files'])}/{frames}"
+                     + (f" ({r['errors'][0]})" if r["errors"] else "")
+                     for dev_id, r in results.items()]
+            return {"type": "info", "data": f"저장 위치: {os.path.abspath(output_dir)}\n" + "\n".join(lines),
+                    "title": f"연속 캡쳐 완료 ({saved}/{frames * len(device_ids)})",
+                    "ok": saved == frames * len(device_ids)}
+
+    def fan_out(self, func, device_ids=None, max_workers=8, timeout=30.0):
+        """
+        Runs func(device_id) against many devices concurrently.
+        Uses all connected devices when device_ids is None. A device whose call
+        runs longer than timeout seconds is reported as timed out (the worker is
+        left to finish in the background).
+        Returns a list of dicts in device order:
+        {'device_id', 'ok', 'result', 'error', 'latency'} (latency in seconds).
+        """
+        if device_ids is None:
+            device_ids = [dev_id for dev_id, _ in self.get_devices()]
+        if not device_ids:
+            return []
+
+        outcomes = {}
+        started = {}
+
+        def run(dev_id):
+            started[dev_id] = time.monotonic()
+            result = func(dev_id)
+            return result, None, time.monotonic() - started[dev_id]
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(device_ids))))
+        futures = {executor.submit(run, dev_id): dev_id for dev_id in device_ids}
+        pending = set(futures)
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=0.05,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                dev_id = futures[future]
+                try:
+                    outcomes[dev_id] = fan_out_row(dev_id, *future.result())
+                except Exception as e:
+                    outcomes[dev_id] = fan_out_row(dev_id, error=str(e),
+                                                   latency=time.monotonic() - started.get(dev_id, time.monotonic()))
+
+            now = time.monotonic()
+            for future in list(pending):
+                dev_id = futures[future]
+                if dev_id in started and now - started[dev_id] > timeout:
+                    pending.discard(future)
+                    outcomes[dev_id] = fan_out_row(dev_id, error=timeout_error(timeout),
+                                                   latency=now - started[dev_id])
+        executor.shutdown(wait=False)
+
+        return [outcomes[dev_id] for dev_id in device_ids]
+
+    def run_on_devices(self, action_id, device_ids=None, max_workers=8, timeout=30.0, **kwargs):
+        """
+        Runs execute_action(action_id, ...) on many devices concurrently.
+        See fan_out for the result format.
+        """
+        return self.fan_out(lambda dev_id: self.execute_action(action_id, dev_id, **kwargs),
+                            device_ids, max_workers=max_workers, timeout=timeout)
+
+    @staticmethod
+    def _summarize(results):
+        succeeded = sum(1 for r in results if r["ok"])
+        return f"성공 {succeeded}/{len(results)}"
+
+    def list_directories(self, device_id, path, refresh=False, prefetch=False):
         """
         Lists directories and files in the given path.
-        Returns a list of dicts: {'name': str, 'type': 'dir'|'file'}
+        Returns a list of dicts: {'name', 'type': 'dir'|'link'|'file', 'size', 'mtime'},
+        directories first. Listings come from the directory cache unless
+        refresh is set; prefetch=True lists the child directories in the
+        background so navigating into them is served from the cache.
         """
-        # Ensure path ends with / for proper ls behavior if it's a directory
-        if not path.endswith('/'):
-            path += '/'
-            
-        cmd = f"{self.adb_path} -s {device_id} shell ls -F \"{path}\""
-        output = run_command_get_output(cmd)
-        
+        items = None if refresh else self.directory_cache.get(device_id, path)
+        if items is None:
+            # Copied like cache hits, since a listing may be shared with a concurrent call
+            listing = self.single_flight.do("sync list", (device_id, path), self._list_remote, device_id, [path])
+            items = [dict(item) for item in listing[path]]
+        if prefetch:
+            self.prefetch_directories(device_id, path, items)
+        return items
+
+    def _list_remote(self, device_id, paths):
+        """
+        Lists several directories over one sync session (LIST), falling back
+        to 'adb ls' when the server is not reachable. Caches and returns
+        {path: items}.
+        """
+        token = self.directory_cache.token()
+        listings = {}
+        with tracer.span("sync list", "shell", device=device_id, command=" ".join(paths)) as span:
+            if self.client.is_available():
+                try:
+                    with self.client.sync(device_id) as sync:
+                        for path in paths:
+                            # Trailing slash so symlinked directories such as /sdcard are followed
+                            listings[path] = self.parse_sync_entries(sync.list_dir(path.rstrip('/') + '/'))
+                    span["transport"] = "socket"
+                except AdbConnectionError:
+                    self.client.mark_unavailable()
+                except AdbError as e:
+                    span["error"] = str(e)
+                    listings.update((path, []) for path in paths if path not in listings)
+            for path in paths:
+                if path not in listings:
+                    span["transport"] = "adb"
+                    output = run_args_get_output([self.adb_path.strip('"'), "-s", device_id, "ls",
+                                                  path.rstrip('/') + '/'])
+                    listings[path] = self.parse_adb_ls(output)
+        for path, items in listings.items():
+            self.directory_cache.put(device_id, path, items, token)
+        return listings
+
+    def prefetch_directories(self, device_id, path, items=None):
+        """Lists the uncached child directories of path in the background, in one sync session."""
+        if items is None:
+            items = self.directory_cache.get(device_id, path) or []
+        base = path.rstrip('/')
+        with self._prefetch_lock:
+            children = []
+            for item in items:
+                child = f"{base}/{item['name']}"
+                if item['type'] != 'dir' or (device_id, child) in self._prefetching \
+                        or self.directory_cache.contains(device_id, child):
+                    continue
+                children.append(child)
+                if len(children) >= self.PREFETCH_LIMIT:
+                    break
+            self._prefetching.update((device_id, child) for child in children)
+        if not children:
+            return
+
+        def task():
+            try:
+                self._list_remote(device_id, children)
+            finally:
+                with self._prefetch_lock:
+                    self._prefetching.difference_update((device_id, child) for child in children)
+
+        self._prefetcher.submit(task)
+
+    @staticmethod
+    def parse_sync_entries(entries):
+        """Turns (name, mode, size, mtime) tuples into sorted item dicts (directories first)."""
         items = []
-        for line in output.splitlines():
-            line = line.strip()
-            if not line: continue
-            
-            # Simple parsing of 'ls -F' output
-            # terminated by / is dir
-            # terminated by @ is link
-            # others are files (or executables with *)
-            
-            if line.endswith('/'):
-                items.append({'name': line[:-1], 'type': 'dir'})
-            elif line.endswith('@'):
-                items.append({'name': line[:-1], 'type': 'link'})
-            elif line.endswith('*'):
-                items.append({'name': line[:-1], 'type': 'file'})
+        for name, mode, size, mtime in entries:
+            if stat.S_ISDIR(mode):
+                kind = 'dir'
+            elif stat.S_ISLNK(mode):
+                kind = 'link'
             else:
-                items.append({'name': line, 'type': 'file'})
-                
+                kind = 'file'
+            items.append({'name': name, 'type': kind, 'size': size, 'mtime': mtime})
         return sorted(items, key=lambda x: (x['type'] != 'dir', x['name']))
 
+    @staticmethod
+    def parse_adb_ls(output):
+        """Parses 'adb ls' output: mode, size and mtime in hex, then the name."""
+        entries = []
+        for line in output.splitlines():
+            parts = line.split(" ", 3)
+            if len(parts) != 4:
+                continue
+            try:
+                mode, size, mtime = (int(part, 16) for part in parts[:3])
+            except ValueError:
+                # Error messages such as 'adb: error: ...'
+                continue
+            name = parts[3].rstrip("\r")
+            if name not in (".", ".."):
+                entries.append((name, mode, size, mtime))
+        return AdbManager.parse_sync_entries(entries)
+
     def create_directory(self, device_id, path):
         """Creates a directory on the device."""
-        cmd = f"{self.adb_path} -s {device_id} shell mkdir -p \"{path}\""
-        run_command_get_output(cmd)
+        self._run_shell(device_id, self._mkdir_command(path))
+        self.directory_cache.invalidate(device_id, path)
         return True
 
     def push_file(self, device_id, local_path, remote_path):
@@ -324,4 +1074,117 @@ class AdbManager:
         # Quote paths to handle spaces
         cmd = f"{self.adb_path} -s {device_id} push \"{local_path}\" \"{remote_path}\""
         output = run_command_get_output(cmd)
+        self._invalidate_pushed(device_id, local_path, remote_path)
         return output
+
+    def _invalidate_pushed(self, device_id, local_path, remote_path):
+        """Drops cached listings a push may have changed (remote_path may be a file or a directory)."""
+        self.directory_cache.invalidate(device_id, remote_path)
+        self.directory_cache.invalidate(device_id, posixpath.join(remote_path, os.path.basename(local_path)))
+
+    def push_files(self, device_id, local_paths, remote_dir, sessions=2, progress=None):
+        """
+        Pushes many files into remote_dir over pipelined sync sessions.
+        progress(snapshot) receives byte/file counters and the transfer rate.
+        Returns a list of {'local', 'remote', 'ok', 'error'} dicts.
+        """
+        engine = PushEngine(self, device_id, sessions=sessions, progress=progress)
+        try:
+            return engine.push(local_paths, remote_dir)
+        finally:
+            self.directory_cache.invalidate(device_id, remote_dir)
+
+    def install_package_files(self, device_id, apk_paths):
+        """
+        Installs one APK, or a base APK plus splits, streaming the files to
+        the package manager ('cmd package install -S' / install-create,
+        install-write, install-commit). Falls back to 'adb install' /
+        'adb install-multiple' without a reachable server or on devices whose
+        package manager does not accept streamed installs. Returns the output.
+        """
+        with tracer.span("install", "action", device=device_id, apks=len(apk_paths),
+                         bytes=sum(os.path.getsize(path) for path in apk_paths)) as span:
+            output = None
+            if self.client.is_available():
+                try:
+                    output = self._stream_install(device_id, apk_paths)
+                    span["transport"] = "socket"
+                except AdbConnectionError:
+                    self.client.mark_unavailable()
+                except AdbError as e:
+                    span["error"] = str(e)
+                    return f"Failure [{e}]"
+            if output is None or not ("Success" in output or "Failure" in output):
+                span["transport"] = "adb"
+                command = "install" if len(apk_paths) == 1 else "install-multiple"
+                output = run_args_get_output([self.adb_path.strip('"'), "-s", device_id, command, "-r", *apk_paths])
+            if "Success" not in output:
+                span["error"] = output.strip().splitlines()[-1] if output.strip() else "no output"
+            # The installed build changed, so its stamp has to be read again
+            self._package_stamps.pop(device_id, None)
+            return output
+
+    def _stream_install(self, device_id, apk_paths):
+        if len(apk_paths) == 1:
+            size = os.path.getsize(apk_paths[0])
+            return self.client.exec_with_input(device_id, f"cmd package install -r -S {size}", apk_paths[0])
+
+        total = sum(os.path.getsize(path) for path in apk_paths)
+        output = self.client.exec_out(device_id, f"cmd package install-create -r -S {total}").decode(
+            "utf-8", errors="replace")
+        match = re.search(r"\[(\d+)\]", output)
+        if not match:
+            return output
+        session = match.group(1)
+        for index, path in enumerate(apk_paths):
+            written = self.client.exec_with_input(
+                device_id, f"cmd package install-write -S {os.path.getsize(path)} {session} {index}.apk -", path)
+            if "Success" not in written:
+                self.client.exec_out(device_id, f"cmd package install-abandon {session}")
+                return written if "Failure" in written else f"Failure [install-write: {written}]"
+        return self.client.exec_out(device_id, f"cmd package install-commit {session}").decode(
+            "utf-8", errors="replace")
+
+    def install_apks(self, apk_paths, device_ids=None, max_devices=8, force=False, progress=None):
+        """
+        Installs a set of APKs on many devices concurrently, skipping packages
+        a device already has in the same versionCode (see BulkInstaller).
+        Returns {'packages', 'errors', 'matrix', 'results'}.
+        """
+        installer = BulkInstaller(self, apk_paths)
+        if device_ids is None:
+            device_ids = [dev_id for dev_id, _ in self.get_devices()]
+        matrix, results = installer.run(device_ids, max_devices=max_devices, force=force, progress=progress)
+        return {"packages": installer.packages, "errors": installer.errors, "matrix": matrix, "results": results}
+
+    def sync_directory(self, device_id, local_dir, remote_dir, checksum=False, dry_run=False,
+                       sessions=2, progress=None):
+        """
+        Pushes only the files of local_dir that are missing or different in
+        remote_dir (size + mtime, or md5 with checksum=True; see dir_sync).
+        Returns {'plan': SyncPlan, 'results': push_files style results};
+        with dry_run=True nothing is pushed and results is empty.
+        """
+        plan = plan_sync(self, device_id, local_dir, remote_dir, checksum=checksum)
+        if dry_run:
+            return {"plan": plan, "results": []}
+        return {"plan": plan, "results": self.apply_sync_plan(device_id, plan, sessions=sessions, progress=progress)}
+
+    def apply_sync_plan(self, device_id, plan, sessions=2, progress=None):
+        """Pushes the new and changed files of a SyncPlan (e.g. one reviewed as a dry run)."""
+        if not plan.transfers:
+            return []
+        engine = PushEngine(self, device_id, sessions=sessions, progress=progress)
+        try:
+            results = engine.push_pairs(plan.pairs())
+        finally:
+            # New files may have created directories at any level below remote_dir
+            changed_dirs = set()
+            for rel in plan.transfers:
+                parent = posixpath.dirname(plan.remote_path(rel))
+                while parent not in changed_dirs and len(parent) >= len(plan.remote_dir):
+                    changed_dirs.add(parent)
+                    parent = posixpath.dirname(parent)
+            for path in changed_dirs:
+                self.directory_cache.invalidate(device_id, path)
+        return results
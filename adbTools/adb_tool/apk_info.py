@@ -0,0 +1,164 @@
+import json
+import os
+import struct
+import threading
+from .utils import get_data_dir
+
+# Binary XML chunk types
+RES_STRING_POOL_TYPE = 0x0001
+RES_XML_TYPE = 0x0003
+RES_XML_START_ELEMENT_TYPE = 0x0102
+RES_XML_RESOURCE_MAP_TYPE = 0x0180
+UTF8_FLAG = 0x100
+
+# android:versionCode / android:versionName resource ids, used when the
+# attribute names were stripped from the string pool
+ATTR_VERSION_CODE = 0x0101021b
+ATTR_VERSION_NAME = 0x0101021c
+
+TYPE_STRING = 0x03
+
+
+def _decode_length(data, offset, utf8):
+    """Reads a string pool length (1-2 bytes for UTF-8, 1-2 words for UTF-16)."""
+    if utf8:
+        length = data[offset]
+        if length & 0x80:
+            return ((length & 0x7F) << 8) | data[offset + 1], offset + 2
+        return length, offset + 1
+    length = struct.unpack_from("<H", data, offset)[0]
+    if length & 0x8000:
+        return ((length & 0x7FFF) << 16) | struct.unpack_from("<H", data, offset + 2)[0], offset + 4
+    return length, offset + 2
+
+
+def _read_string_pool(data, offset):
+    _, header_size, _, string_count, _, flags, strings_start, _ = struct.unpack_from("<HHIIIIII", data, offset)
+    utf8 = bool(flags & UTF8_FLAG)
+    offsets = struct.unpack_from(f"<{string_count}I", data, offset + header_size)
+    strings = []
+    for string_offset in offsets:
+        position = offset + strings_start + string_offset
+        if utf8:
+            _, position = _decode_length(data, position, True)  # length in characters
+            length, position = _decode_length(data, position, True)  # length in bytes
+            strings.append(data[position:position + length].decode("utf-8", errors="replace"))
+        else:
+            length, position = _decode_length(data, position, False)
+            strings.append(data[position:position + length * 2].decode("utf-16-le", errors="replace"))
+    return strings
+
+
+def parse_manifest(data):
+    """
+    Reads package, versionCode, versionName and split from a binary
+    AndroidManifest.xml (AXML). Only the <manifest> element is decoded.
+    """
+    chunk_type, header_size, _ = struct.unpack_from("<HHI", data, 0)
+    if chunk_type != RES_XML_TYPE:
+        raise ValueError("Not a binary XML manifest")
+    strings = []
+    resource_ids = []
+    offset = header_size
+    while offset + 8 <= len(data):
+        chunk_type, header_size, chunk_size = struct.unpack_from("<HHI", data, offset)
+        if chunk_size < 8:
+            break
+        if chunk_type == RES_STRING_POOL_TYPE:
+            strings = _read_string_pool(data, offset)
+        elif chunk_type == RES_XML_RESOURCE_MAP_TYPE:
+            count = (chunk_size - header_size) // 4
+            resource_ids = struct.unpack_from(f"<{count}I", data, offset + header_size)
+        elif chunk_type == RES_XML_START_ELEMENT_TYPE:
+            # Chunk header + line/comment, then ns, name, attributeStart, attributeSize, attributeCount
+            _, name, attribute_start, attribute_size, attribute_count = struct.unpack_from(
+                "<IIHHH", data, offset + 16)
+            if strings[name] == "manifest":
+                return _manifest_attributes(data, offset + 16 + attribute_start, attribute_size,
+                                            attribute_count, strings, resource_ids)
+        offset += chunk_size
+    raise ValueError("No <manifest> element")
+
+
+def _manifest_attributes(data, offset, attribute_size, attribute_count, strings, resource_ids):
+    info = {"package": None, "version_code": None, "version_name": None, "split": None}
+    for index in range(attribute_count):
+        _, name, raw_value, _, _, data_type, value = struct.unpack_from(
+            "<IIIHBBI", data, offset + index * attribute_size)
+        resource_id = resource_ids[name] if name < len(resource_ids) else None
+        attribute = strings[name] if name < len(strings) else ""
+        text = strings[raw_value] if raw_value != 0xFFFFFFFF and raw_value < len(strings) else None
+        if resource_id == ATTR_VERSION_CODE or attribute == "versionCode":
+            info["version_code"] = int(text) if data_type == TYPE_STRING and text else value
+        elif resource_id == ATTR_VERSION_NAME or attribute == "versionName":
+            info["version_name"] = text
+        elif attribute == "package":
+            info["package"] = text
+        elif attribute == "split":
+            info["split"] = text
+    return info
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ApkInfoCache:
+    """
+    Manifest information of local APK files, cached by file content hash in
+    a JSON file, so a release folder is only parsed once. The hash itself is
+    remembered per (path, size, mtime) for the session.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_data_dir(), "apk_info.json")
+        self._hashes = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _hash(self, apk_path):
+        st = os.stat(apk_path)
+        key = (os.path.abspath(apk_path), st.st_size, st.st_mtime)
+        digest = self._hashes.get(key)
+        if digest is None:
+            digest = self._hashes[key] = file_sha256(apk_path)
+        return digest, st.st_size
+
+    def get(self, apk_path):
+        """
+        Returns {'path', 'size', 'sha256', 'package', 'version_code',
+        'version_name', 'split'} for an APK. Raises ValueError if the file
+        is not a readable APK.
+        """
+        digest, size = self._hash(apk_path)
+        with self._lock:
+            info = self._entries.get(digest)
+        if info is None:
+            import zipfile
+            try:
+                with zipfile.ZipFile(apk_path) as apk:
+                    info = parse_manifest(apk.read("AndroidManifest.xml"))
+            except (zipfile.BadZipFile, KeyError, struct.error, IndexError) as e:
+                raise ValueError(f"{os.path.basename(apk_path)}: APK 매니페스트를 읽을 수 없습니다 ({e})")
+            if not info["package"]:
+                raise ValueError(f"{os.path.basename(apk_path)}: 패키지명이 없습니다")
+            with self._lock:
+                self._entries[digest] = info
+                self._save()
+        return dict(info, path=apk_path, size=size, sha256=digest)
+
+    def _save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+        except OSError:
+            pass
@@ -0,0 +1,559 @@
+import asyncio
+import functools
+import os
+import struct
+import threading
+import time
+from contextlib import asynccontextmanager
+from .adb_client import DEFAULT_HOST, DEFAULT_PORT, AdbClient, AdbError, AdbConnectionError
+from .adb_manager import AdbManager, LabelCollector, fan_out_row, timeout_error
+from .tracing import tracer, command_name
+
+
+class AsyncAdbClient:
+    """
+    asyncio version of AdbClient for the adb host smart-socket protocol.
+
+    Every request opens its own stream connection (the server closes smart
+    sockets when a service ends); a semaphore bounds how many are open at
+    once. Cancelling a coroutine closes its connection, which also ends the
+    service on the device side.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0, max_connections=64):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._slots = None
+        self._available = None
+        self._checked_at = 0.0
+        self.retry_interval = 2.0
+
+    @asynccontextmanager
+    async def _connection(self):
+        if self._slots is None:
+            # Created lazily so the semaphore belongs to the running loop
+            self._slots = asyncio.Semaphore(self.max_connections)
+        async with self._slots:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                                        self.timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                raise AdbConnectionError(f"adb server not reachable at {self.host}:{self.port}: {e}")
+            try:
+                yield reader, writer
+            finally:
+                writer.close()
+
+    @staticmethod
+    async def _read_exact(reader, size):
+        try:
+            return await reader.readexactly(size)
+        except asyncio.IncompleteReadError:
+            raise AdbConnectionError("Connection closed by adb server")
+
+    async def _send_request(self, reader, writer, request):
+        payload = request.encode("utf-8")
+        writer.write(b"%04x" % len(payload) + payload)
+        await writer.drain()
+        status = await self._read_exact(reader, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            length = int(await self._read_exact(reader, 4), 16)
+            raise AdbError((await self._read_exact(reader, length)).decode("utf-8", errors="replace"))
+        raise AdbError(f"Unexpected adb response: {status!r}")
+
+    @asynccontextmanager
+    async def _service(self, serial, service):
+        async with self._connection() as (reader, writer):
+            await self._send_request(reader, writer, f"host:transport:{serial}")
+            await self._send_request(reader, writer, service)
+            yield reader, writer
+
+    async def is_available(self):
+        """Returns True if the adb server answers (cached like AdbClient.is_available)."""
+        now = time.monotonic()
+        if self._available is not None and now - self._checked_at < self.retry_interval:
+            return self._available
+        try:
+            await self.host_query("host:version")
+            self._available = True
+        except AdbError:
+            self._available = False
+        self._checked_at = now
+        return self._available
+
+    def mark_unavailable(self):
+        self._available = False
+        self._checked_at = time.monotonic()
+
+    async def host_query(self, request):
+        async with self._connection() as (reader, writer):
+            await self._send_request(reader, writer, request)
+            length = int(await self._read_exact(reader, 4), 16)
+            return (await self._read_exact(reader, length)).decode("utf-8", errors="replace")
+
+    async def devices(self):
+        return AdbClient.parse_device_states(await self.host_query("host:devices"))
+
+    async def exec_out(self, serial, command):
+        async with self._service(serial, f"exec:{command}") as (reader, writer):
+            return await reader.read()
+
+    async def shell(self, serial, command):
+        async with self._service(serial, f"shell:{command}") as (reader, writer):
+            output = await reader.read()
+        return output.decode("utf-8", errors="replace").strip()
+
+    async def shell_lines(self, serial, command):
+        """Yields shell output line by line as it arrives."""
+        async with self._service(serial, f"shell:{command}") as (reader, writer):
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                yield line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    async def list_dirs(self, serial, paths):
+        """Lists several directories with LIST over one sync session: {path: [(name, mode, size, mtime)]}."""
+        listings = {}
+        async with self._service(serial, "sync:") as (reader, writer):
+            for path in paths:
+                encoded = path.encode("utf-8")
+                writer.write(struct.pack("<4sI", b"LIST", len(encoded)) + encoded)
+                await writer.drain()
+                entries = listings[path] = []
+                while True:
+                    request_id, mode = struct.unpack("<4sI", await self._read_exact(reader, 8))
+                    if request_id == b"FAIL":
+                        raise AdbError((await self._read_exact(reader, mode)).decode("utf-8", errors="replace"))
+                    if request_id not in (b"DENT", b"DONE"):
+                        raise AdbError(f"Unexpected sync response: {request_id!r}")
+                    size, mtime, name_length = struct.unpack("<III", await self._read_exact(reader, 12))
+                    if request_id == b"DONE":
+                        break
+                    name = (await self._read_exact(reader, name_length)).decode("utf-8", errors="replace")
+                    if name not in (".", ".."):
+                        entries.append((name, mode, size, mtime))
+            writer.write(struct.pack("<4sI", b"QUIT", 0))
+            await writer.drain()
+        return listings
+
+    async def push(self, serial, local_path, remote_path, chunk_size=64 * 1024):
+        """Sends one file over sync: and waits for the device's reply."""
+        st = os.stat(local_path)
+        header = f"{remote_path},{0o100000 | (st.st_mode & 0o777)}".encode("utf-8")
+        async with self._service(serial, "sync:") as (reader, writer):
+            writer.write(struct.pack("<4sI", b"SEND", len(header)) + header)
+            with open(local_path, "rb") as f:
+                while True:
+                    data = f.read(chunk_size)
+                    if not data:
+                        break
+                    writer.write(struct.pack("<4sI", b"DATA", len(data)) + data)
+                    await writer.drain()
+            writer.write(struct.pack("<4sI", b"DONE", int(st.st_mtime)))
+            await writer.drain()
+            request_id, length = struct.unpack("<4sI", await self._read_exact(reader, 8))
+            if request_id == b"FAIL":
+                raise AdbError((await self._read_exact(reader, length)).decode("utf-8", errors="replace"))
+            if request_id != b"OKAY":
+                raise AdbError(f"Unexpected sync response: {request_id!r}")
+            writer.write(struct.pack("<4sI", b"QUIT", 0))
+            await writer.drain()
+
+
+class AsyncAdbManager:
+    """
+    Coroutine counterparts of the AdbManager methods.
+
+    Device I/O runs on asyncio streams (adb server socket) or asyncio
+    subprocesses (adb client fallback), so hundreds of device operations can
+    be in flight on one event loop thread and each can be cancelled. Output
+    parsing, the package cache and configuration are shared with the wrapped
+    AdbManager. Actions whose work is local and blocking by nature (opening
+    terminals, logcat capture, burst capture) run in the loop's executor.
+    """
+
+    def __init__(self, manager=None, max_connections=64):
+        self.manager = manager or AdbManager()
+        pool = self.manager.client.pool
+        self.client = AsyncAdbClient(pool.host, pool.port, pool.timeout, max_connections=max_connections)
+
+    def _adb_args(self, device_id, *args):
+        return [self.manager.adb_path.strip('"'), "-s", device_id, *args]
+
+    async def _run_process(self, args):
+        """Runs the adb client; returns (exit_code, stdout+stderr bytes). Killed on cancellation."""
+        with tracer.span(f"adb {args[3] if len(args) > 3 else args[-1]}", "process",
+                         command=" ".join(args), device=args[2] if len(args) > 2 else None) as span:
+            try:
+                proc = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.PIPE,
+                                                            stderr=asyncio.subprocess.STDOUT)
+            except OSError as e:
+                span["error"] = str(e)
+                return None, b""
+            try:
+                output, _ = await proc.communicate()
+            except asyncio.CancelledError:
+                if proc.returncode is None:
+                    proc.kill()
+                raise
+            span.update(exit_code=proc.returncode, bytes=len(output))
+            return proc.returncode, output
+
+    async def _use_server(self):
+        return await self.client.is_available()
+
+    # --- Shell plumbing ---
+
+    async def run_shell(self, device_id, command):
+        with tracer.span(command_name("shell", command), "shell", device=device_id, command=command,
+                         transport="async") as span:
+            if await self._use_server():
+                try:
+                    output = await self.client.shell(device_id, command)
+                    span["bytes"] = len(output)
+                    return output
+                except AdbConnectionError:
+                    self.client.mark_unavailable()
+                except AdbError as e:
+                    span["error"] = str(e)
+                    return ""
+            _, output = await self._run_process(self._adb_args(device_id, "shell", command))
+            return output.decode("utf-8", errors="replace").strip()
+
+    async def exec_out(self, device_id, command):
+        with tracer.span(command_name("exec", command), "shell", device=device_id, command=command,
+                         transport="async") as span:
+            if await self._use_server():
+                try:
+                    output = await self.client.exec_out(device_id, command)
+                    span["bytes"] = len(output)
+                    return output
+                except AdbConnectionError:
+                    self.client.mark_unavailable()
+                except AdbError as e:
+                    span["error"] = str(e)
+                    return b""
+            code, output = await self._run_process(self._adb_args(device_id, "exec-out", command))
+            return output if code == 0 else b""
+
+    async def stream_shell(self, device_id, command):
+        """
+        Async generator over shell output lines. Falls back to the adb client
+        only while no line has been yielded; a connection lost after that is
+        raised, since running the command again would repeat its output (and
+        its effects).
+        """
+        if await self._use_server():
+            started = False
+            try:
+                async for line in self.client.shell_lines(device_id, command):
+                    started = True
+                    yield line
+                return
+            except AdbConnectionError:
+                self.client.mark_unavailable()
+                if started:
+                    raise
+            except AdbError:
+                return
+        proc = await asyncio.create_subprocess_exec(*self._adb_args(device_id, "shell", command),
+                                                    stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.STDOUT)
+        try:
+            async for line in proc.stdout:
+                yield line.decode("utf-8", errors="replace").rstrip("\r\n")
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+
+    async def _shell_lines(self, device_id, command):
+        return [line async for line in self.stream_shell(device_id, command)]
+
+    # --- Devices and packages ---
+
+    async def list_device_states(self):
+        if await self._use_server():
+            try:
+                return await self.client.devices()
+            except AdbConnectionError:
+                self.client.mark_unavailable()
+            except AdbError:
+                return []
+        _, output = await self._run_process([self.manager.adb_path.strip('"'), "devices"])
+        return AdbClient.parse_device_states(output.decode("utf-8", errors="replace"))
+
+    async def get_devices(self):
+        return [(device_id, self.manager.describe_device(device_id))
+                for device_id, state in await self.list_device_states() if state == "device"]
+
+    async def get_installed_packages(self, device_id):
+        return self.manager.parse_package_list(await self.run_shell(device_id, "pm list packages"))
+
+    async def get_app_label(self, device_id, package_name):
+        labels = await self.get_app_labels(device_id, [package_name])
+        return labels.get(package_name)
+
+    async def get_app_labels(self, device_id, packages, callback=None):
+        return (await self._collect_labels(device_id, packages, callback)).labels
+
+    async def _collect_labels(self, device_id, packages, callback=None):
+        collector = LabelCollector(self.manager, packages, callback)
+        for batch, script in collector.batches():
+            try:
+                lines = await self._shell_lines(device_id, script)
+            except Exception:
+                lines = []
+            collector.read(batch, lines)
+        return collector
+
+    async def get_package_stamps(self, device_id, package_name=None):
+        lines = await self._shell_lines(device_id, self.manager._stamps_command(package_name))
+        stamps = self.manager.parse_package_stamps(lines)
+        self.manager._remember_stamps(device_id, package_name, stamps)
+        return stamps
+
+    async def _get_package_stamp(self, device_id, package_name):
+        stamp = self.manager._package_stamps.get(device_id, {}).get(package_name)
+        if stamp is None:
+            stamp = (await self.get_package_stamps(device_id, package_name)).get(package_name)
+        return stamp
+
+    async def get_package_inventory(self, device_id):
+        lines = await self._shell_lines(device_id, "dumpsys package packages")
+        return self.manager._complete_inventory(device_id, self.manager.parse_package_inventory(lines))
+
+    async def get_app_labels_cached(self, device_id, packages, callback=None, inventory=None):
+        if inventory is not None:
+            stamps = self.manager.inventory_stamps(inventory)
+        else:
+            stamps = await self.get_package_stamps(device_id)
+        labels, missing = self.manager._cached_labels(device_id, packages, stamps, callback)
+        if missing:
+            collector = await self._collect_labels(device_id, missing, callback)
+            labels.update(self.manager._store_labels(device_id, collector, stamps, inventory))
+        return labels
+
+    async def get_app_details(self, device_id, package_name):
+        stamp = await self._get_package_stamp(device_id, package_name)
+        if stamp:
+            cached = self.manager.package_cache.lookup(device_id, package_name, stamp)
+            if cached and cached["details"]:
+                return cached["details"]
+        dump_output = await self.run_shell(device_id, f"pm dump {package_name}")
+        details = self.manager.parse_app_dump(package_name, dump_output)
+        return self.manager._complete_app_details(device_id, package_name, stamp, details)
+
+    # --- Files ---
+
+    async def list_directories(self, device_id, path, refresh=False, prefetch=False):
+        """Same cache and item format as AdbManager.list_directories; prefetching runs on its threads."""
+        cache = self.manager.directory_cache
+        items = None if refresh else cache.get(device_id, path)
+        if items is None:
+            token = cache.token()
+            # Trailing slash so symlinked directories such as /sdcard are followed
+            target = path.rstrip('/') + '/'
+            with tracer.span("sync list", "shell", device=device_id, command=path, transport="async") as span:
+                if await self._use_server():
+                    try:
+                        listing = await self.client.list_dirs(device_id, [target])
+                        items = self.manager.parse_sync_entries(listing[target])
+                    except AdbConnectionError:
+                        self.client.mark_unavailable()
+                    except AdbError as e:
+                        span["error"] = str(e)
+                        items = []
+                if items is None:
+                    _, output = await self._run_process(self._adb_args(device_id, "ls", target))
+                    items = self.manager.parse_adb_ls(output.decode("utf-8", errors="replace"))
+            cache.put(device_id, path, items, token)
+        if prefetch:
+            self.manager.prefetch_directories(device_id, path, items)
+        return items
+
+    async def create_directory(self, device_id, path):
+        await self.run_shell(device_id, self.manager._mkdir_command(path))
+        self.manager.directory_cache.invalidate(device_id, path)
+        return True
+
+    async def push_file(self, device_id, local_path, remote_path):
+        """Pushes one file (into remote_path if it ends with '/'); returns adb-push-like output."""
+        target = remote_path + os.path.basename(local_path) if remote_path.endswith('/') else remote_path
+        if await self._use_server():
+            try:
+                with tracer.span("sync push", "shell", device=device_id, command=target,
+                                 bytes=os.path.getsize(local_path)):
+                    await self.client.push(device_id, local_path, target)
+                self.manager._invalidate_pushed(device_id, local_path, remote_path)
+                return f"{local_path}: 1 file pushed."
+            except AdbConnectionError:
+                self.client.mark_unavailable()
+            except AdbError:
+                # e.g. remote_path is an existing directory: let the adb client resolve it
+                pass
+        _, output = await self._run_process(self._adb_args(device_id, "push", local_path, remote_path))
+        self.manager._invalidate_pushed(device_id, local_path, remote_path)
+        return output.decode("utf-8", errors="replace").strip()
+
+    async def install_apk(self, device_id, apk_path):
+        code, output = await self._run_process(self._adb_args(device_id, "install", "-r", apk_path))
+        return self.manager.install_result(output.decode("utf-8", errors="replace").strip())
+
+    # --- Actions ---
+
+    async def execute_action(self, action_id, device_id, **kwargs):
+        """
+        Coroutine version of AdbManager.execute_action. Commands are always
+        awaited (the caller decides whether to wait for the coroutine).
+        """
+        with tracer.span(f"action {action_id}", "action", action=action_id, device=device_id,
+                         transport="async") as span:
+            result = await self._execute_action(action_id, device_id, **kwargs)
+            if isinstance(result, dict) and result.get("ok") is False:
+                span["error"] = "failed"
+            return result
+
+    async def _execute_action(self, action_id, device_id, **kwargs):
+        manager = self.manager
+        package = kwargs.get("package", "")
+        loop = asyncio.get_running_loop()
+
+        if action_id in manager.SHELL_ACTIONS:
+            command = manager.SHELL_ACTIONS[action_id][0].format(package=package)
+            output = await self.run_shell(device_id, command)
+            return manager.shell_action_result(action_id, package,
+                                               output if manager.SHELL_ACTIONS[action_id][1] == "info" else None)
+
+        if action_id == 11 and kwargs.get("blocking"):
+            return await self.install_apk(device_id, package)
+
+        if action_id == 14 and kwargs.get("blocking"):
+            return manager.broadcast_result(await self.run_shell(device_id, manager._broadcast_command(package)))
+
+        if action_id == 9:
+            results = await self.run_on_devices(4)
+            return {"type": "action", "msg": f"모든 디바이스 화면 끄기 실행됨 ({manager._summarize(results)})",
+                    "results": results}
+
+        if action_id in (55, 200):
+            import datetime
+            if action_id == 55:
+                path = kwargs.get("save_path")
+                if not path:
+                    return {"type": "action", "msg": "저장 경로가 지정되지 않았습니다."}
+                data = await self.exec_out(device_id, "logcat -d")
+                message = f"로그 저장 완료: {path}"
+            else:
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                path = f"screenshot_{device_id}_{timestamp}.png"
+                data = await self.exec_out(device_id, "screencap -p")
+                if not data.startswith(b"\x89PNG"):
+                    return {"type": "info", "data": f"화면 캡쳐 실패: {device_id}", "title": "화면 캡쳐", "ok": False}
+                message = f"캡쳐 완료: {path}"
+            await loop.run_in_executor(None, _write_file, path, data)
+            return {"type": "action", "msg": message}
+
+        # Terminals, logcat/burst capture: local blocking work
+        return await loop.run_in_executor(
+            None, functools.partial(manager._execute_action, action_id, device_id, **kwargs))
+
+    async def fan_out(self, func, device_ids=None, limit=64, timeout=30.0):
+        """
+        Awaits func(device_id) for many devices concurrently (at most `limit`
+        at a time). A device that does not finish within timeout seconds is
+        cancelled. Returns the same result dicts as AdbManager.fan_out.
+        """
+        if device_ids is None:
+            device_ids = [dev_id for dev_id, _ in await self.get_devices()]
+        slots = asyncio.Semaphore(max(1, limit))
+
+        async def run(dev_id):
+            async with slots:
+                started = time.monotonic()
+                try:
+                    result = await asyncio.wait_for(func(dev_id), timeout)
+                except asyncio.TimeoutError:
+                    return fan_out_row(dev_id, error=timeout_error(timeout), latency=time.monotonic() - started)
+                except Exception as e:
+                    return fan_out_row(dev_id, error=str(e), latency=time.monotonic() - started)
+                return fan_out_row(dev_id, result, latency=time.monotonic() - started)
+
+        return list(await asyncio.gather(*(run(dev_id) for dev_id in device_ids)))
+
+    async def run_on_devices(self, action_id, device_ids=None, limit=64, timeout=30.0, **kwargs):
+        return await self.fan_out(lambda dev_id: self.execute_action(action_id, dev_id, **kwargs),
+                                  device_ids, limit=limit, timeout=timeout)
+
+
+def _write_file(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class TkAsyncBridge:
+    """
+    Runs an asyncio event loop in a background thread for a Tk application.
+
+    submit() schedules a coroutine on the loop and delivers its result (or
+    exception) back on the Tk thread via root.after. Passing owner= ties
+    the coroutine to a widget: it is cancelled when the widget is destroyed.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.loop = asyncio.new_event_loop()
+        self._futures = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="AsyncLoop", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro, on_done=None, on_error=None, owner=None):
+        """Returns a concurrent.futures.Future for the coroutine."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        with self._lock:
+            self._futures.add(future)
+
+        def deliver(f):
+            with self._lock:
+                self._futures.discard(f)
+            if f.cancelled():
+                return
+            error = f.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        self.root.after(0, lambda: on_error(error))
+                elif on_done:
+                    self.root.after(0, lambda: on_done(f.result()))
+            except RuntimeError:
+                # Tk already destroyed
+                pass
+
+        future.add_done_callback(deliver)
+        if owner is not None:
+            owner.bind("<Destroy>", lambda e: future.cancel() if e.widget is owner else None, add="+")
+        return future
+
+    def pending(self):
+        with self._lock:
+            return len(self._futures)
+
+    def cancel_all(self):
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+    def stop(self):
+        self.cancel_all()
+        self.loop.call_soon_threadsafe(self.loop.stop)
@@ -0,0 +1,236 @@
+"""
+Batch scripts: a list of steps run on many devices.
+
+One step per line; blank lines and lines starting with '#' are ignored and
+'{serial}' is replaced by the device serial in every step:
+
+    shell getprop ro.build.version.release
+    battery                         # named action, same as 'action 6'
+    app-version com.wjthinkbig.mlauncher2
+    install release/*.apk [--force]
+    push notice.txt data/*.json /sdcard/Download/
+    sync ./content /sdcard/content [--checksum] [--dry-run]
+    screenshot shots/{serial}.png
+    sleep 1.5
+
+Each device runs the steps in order (stopping at the first failed step
+unless keep_going is set) while devices run concurrently.
+"""
+import glob
+import os
+import shlex
+import threading
+import time
+
+# Named actions usable as steps: name -> (action id, parameter name or None)
+ACTIONS = {
+    "launcher-version": (0, None),
+    "back": (2, None),
+    "home": (3, None),
+    "sleep-screen": (4, None),
+    "battery": (6, None),
+    "delete": (10, "package"),
+    "capture-permission": (12, None),
+    "app-version": (13, "package"),
+    "broadcast": (14, "action"),
+    "top-app": (15, None),
+    "clear-debug-app": (100, None),
+    "save-log": (55, "path"),
+}
+
+COMMANDS = {"shell", "action", "install", "push", "sync", "screenshot", "sleep", "packages"}
+
+
+class BatchError(ValueError):
+    """Raised for a script that cannot be parsed."""
+
+
+def parse_step(text, line_number=None):
+    """
+    Parses one step line into {'line', 'text', 'command', 'args'}. Arguments
+    are split like a shell would, except for 'shell' whose whole remainder
+    is kept as one argument.
+    """
+    where = f"{line_number}행: " if line_number is not None else ""
+    text = text.strip()
+    command, _, raw = text.partition(" ")
+    raw = raw.strip()
+    if command == "shell":
+        # Passed to the device shell as written (quotes, pipes and '#' included)
+        args = [raw]
+    else:
+        try:
+            args = shlex.split(raw, comments=True)
+        except ValueError as e:
+            raise BatchError(f"{where}{e}")
+    if command not in COMMANDS and command not in ACTIONS:
+        raise BatchError(f"{where}알 수 없는 명령 '{command}'")
+
+    if command == "shell" and not raw:
+        raise BatchError(f"{where}shell 명령이 비어 있습니다")
+    elif command == "action" and not args:
+        raise BatchError(f"{where}action 번호가 필요합니다")
+    elif command == "action" and not (args[0].isdigit() or args[0] in ACTIONS):
+        raise BatchError(f"{where}알 수 없는 action '{args[0]}'")
+    elif command in ACTIONS and ACTIONS[command][1] and not args:
+        raise BatchError(f"{where}{command}: {ACTIONS[command][1]} 값이 필요합니다")
+    elif command == "install" and not [arg for arg in args if not arg.startswith("--")]:
+        raise BatchError(f"{where}install: APK 파일이 필요합니다")
+    elif command == "push" and len(args) < 2:
+        raise BatchError(f"{where}push: 로컬 파일과 대상 폴더가 필요합니다")
+    elif command == "sync" and len([arg for arg in args if not arg.startswith("--")]) != 2:
+        raise BatchError(f"{where}sync: 로컬 폴더와 대상 폴더가 필요합니다")
+    elif command == "sleep":
+        try:
+            float(args[0])
+        except (IndexError, ValueError):
+            raise BatchError(f"{where}sleep: 초 단위 숫자가 필요합니다")
+    return {"line": line_number, "text": text, "command": command, "args": args}
+
+
+def parse_script(text):
+    """Parses a whole script; raises BatchError naming the offending line."""
+    steps = []
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#"):
+            steps.append(parse_step(stripped, number))
+    if not steps:
+        raise BatchError("실행할 단계가 없습니다")
+    return steps
+
+
+def _expand_paths(patterns):
+    """Expands wildcards in local paths (for shells that do not, e.g. cmd.exe)."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else []
+        paths.extend(matches or [pattern])
+    return paths
+
+
+class BatchRunner:
+    """Runs parsed steps on devices through an AdbManager."""
+
+    def __init__(self, manager, steps, keep_going=False):
+        self.manager = manager
+        self.steps = steps
+        self.keep_going = keep_going
+        self._installers = {}
+        self._lock = threading.Lock()
+
+    def run(self, device_ids, jobs=8, timeout=3600.0):
+        """
+        Runs the steps on every device (up to `jobs` devices at a time) and
+        returns a JSON-serializable report.
+        """
+        started = time.monotonic()
+        results = self.manager.fan_out(self.run_device, device_ids, max_workers=jobs, timeout=timeout)
+        devices = []
+        for r in results:
+            report = r["result"] or {"steps": []}
+            devices.append({
+                "device_id": r["device_id"],
+                "ok": r["ok"],
+                "error": r["error"],
+                "seconds": round(r["latency"], 3),
+                "steps": report["steps"],
+            })
+        steps = [step for device in devices for step in device["steps"]]
+        return {
+            "ok": all(device["ok"] for device in devices),
+            "devices": devices,
+            "summary": {
+                "devices": len(devices),
+                "failed_devices": sum(1 for device in devices if not device["ok"]),
+                "steps": len(steps),
+                "failed_steps": sum(1 for step in steps if not step["ok"]),
+                "seconds": round(time.monotonic() - started, 3),
+            },
+        }
+
+    def run_device(self, device_id):
+        """Runs all steps on one device; the result dict has ok=False if a step failed."""
+        reports = []
+        for step in self.steps:
+            started = time.monotonic()
+            try:
+                ok, output = self._run_step(device_id, step)
+            except Exception as e:
+                ok, output = False, f"{type(e).__name__}: {e}"
+            reports.append({"line": step["line"], "step": step["text"], "ok": ok, "output": output,
+                            "seconds": round(time.monotonic() - started, 3)})
+            if not ok and not self.keep_going:
+                break
+        return {"ok": all(report["ok"] for report in reports), "steps": reports}
+
+    def _run_step(self, device_id, step):
+        args = [arg.replace("{serial}", device_id) for arg in step["args"]]
+        command = step["command"]
+        manager = self.manager
+
+        if command == "shell":
+            output, exit_code = manager._run_shell_status(device_id, args[0])
+            return exit_code == 0, {"exit_code": exit_code, "output": output}
+
+        if command == "action" or command in ACTIONS:
+            if command == "action":
+                name, args = args[0], args[1:]
+                action_id = int(name) if name.isdigit() else ACTIONS[name][0]
+            else:
+                action_id = ACTIONS[command][0]
+            param = args[0] if args else ""
+            result = manager.execute_action(action_id, device_id, package=param, save_path=param,
+                                            blocking=True) or {}
+            output = result.get("data") if result.get("type") == "info" else result.get("msg")
+            return result.get("ok") is not False, output
+
+        if command == "install":
+            force = "--force" in args
+            installer = self._installer(tuple(_expand_paths([arg for arg in args if not arg.startswith("--")])))
+            if installer.errors:
+                return False, {"errors": installer.errors}
+            row = installer.install_on_device(device_id, force=force)
+            return all(cell["status"] != "failed" for cell in row.values()), row
+
+        if command == "push":
+            results = manager.push_files(device_id, _expand_paths(args[:-1]), args[-1])
+            return all(r["ok"] for r in results), results
+
+        if command == "sync":
+            local_dir, remote_dir = [arg for arg in args if not arg.startswith("--")]
+            outcome = manager.sync_directory(device_id, local_dir, remote_dir,
+                                             checksum="--checksum" in args, dry_run="--dry-run" in args)
+            plan = outcome["plan"]
+            return all(r["ok"] for r in outcome["results"]), {
+                "new": plan.new, "changed": plan.changed, "unchanged": len(plan.unchanged),
+                "extra": plan.extra, "bytes": plan.transfer_bytes, "results": outcome["results"]}
+
+        if command == "screenshot":
+            from .screenshot import capture_png
+            path = (args[0] if args else "screenshot_{serial}_{time}.png").replace(
+                "{serial}", device_id).replace("{time}", time.strftime("%Y%m%d_%H%M%S"))
+            data = capture_png(manager, device_id)
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+            return True, path
+
+        if command == "sleep":
+            time.sleep(float(args[0]))
+            return True, None
+
+        if command == "packages":
+            return True, [package for package, _ in manager.get_installed_packages(device_id)]
+
+        raise BatchError(f"알 수 없는 명령 '{command}'")
+
+    def _installer(self, apk_paths):
+        """One BulkInstaller per APK set, shared by all devices (APKs are parsed once)."""
+        from .bulk_install import BulkInstaller
+        with self._lock:
+            installer = self._installers.get(apk_paths)
+            if installer is None:
+                installer = self._installers[apk_paths] = BulkInstaller(self.manager, list(apk_paths))
+            return installer
@@ -0,0 +1,113 @@
+import os
+import time
+from .apk_info import ApkInfoCache
+
+
+class BulkInstaller:
+    """
+    Installs a set of APKs on many devices.
+
+    APKs are grouped by package: a base APK and its splits are installed
+    together with install-multiple, single APKs with install, both streamed
+    from the PC. Every device works through its own queue of packages in
+    order while devices run concurrently (AdbManager.fan_out). A package is
+    skipped on a device that already has the same versionCode.
+    """
+
+    def __init__(self, manager, apk_paths, info_cache=None):
+        self.manager = manager
+        self.info_cache = info_cache or ApkInfoCache()
+        self.packages = []
+        self.errors = []
+        self._load(apk_paths)
+
+    def _load(self, apk_paths):
+        groups = {}
+        for path in apk_paths:
+            try:
+                info = self.info_cache.get(path)
+            except OSError as e:
+                self.errors.append(f"{os.path.basename(path)}: {e.strerror or e}")
+                continue
+            except ValueError as e:
+                self.errors.append(str(e))
+                continue
+            group = groups.get(info["package"])
+            if group is None:
+                group = groups[info["package"]] = {"package": info["package"], "version_code": None,
+                                                   "version_name": None, "apks": []}
+                self.packages.append(group)
+            group["apks"].append(info)
+            if not info["split"]:
+                group["version_code"] = info["version_code"]
+                group["version_name"] = info["version_name"]
+        for group in self.packages:
+            # Base APK first, as install-multiple expects
+            group["apks"].sort(key=lambda info: info["split"] is not None)
+            if group["version_code"] is None:
+                group["version_code"] = group["apks"][0]["version_code"]
+
+    def installed_version(self, device_id, package):
+        stamp = self.manager.get_package_stamps(device_id, package).get(package)
+        return stamp.split("|", 1)[0] if stamp else None
+
+    def install_on_device(self, device_id, force=False, progress=None):
+        """
+        Installs every package on one device, in order. Returns
+        {package: {'status': 'installed'|'skipped'|'failed', 'detail', 'seconds'}}.
+        progress(device_id, package, cell) is called when a package starts
+        ('installing') and when it is done.
+        """
+        row = {}
+        for group in self.packages:
+            package = group["package"]
+            started = time.monotonic()
+            installed = self.installed_version(device_id, package)
+            if not force and installed is not None and installed == str(group["version_code"]):
+                cell = {"status": "skipped", "detail": f"이미 설치됨 (versionCode {installed})", "seconds": 0.0}
+            else:
+                if progress:
+                    progress(device_id, package, {"status": "installing", "detail": "", "seconds": 0.0})
+                output = self.manager.install_package_files(device_id, [apk["path"] for apk in group["apks"]])
+                ok = "Success" in output
+                lines = output.strip().splitlines()
+                cell = {"status": "installed" if ok else "failed",
+                        "detail": lines[-1] if lines else "응답 없음",
+                        "seconds": time.monotonic() - started}
+            row[package] = cell
+            if progress:
+                progress(device_id, package, cell)
+        return row
+
+    def run(self, device_ids, max_devices=8, force=False, progress=None, timeout_per_package=600.0):
+        """
+        Installs on all devices concurrently. Returns (matrix, results):
+        matrix is {device_id: {package: cell}} (see install_on_device) and
+        results the fan_out result list (errors and timeouts per device).
+        """
+        results = self.manager.fan_out(
+            lambda device_id: self.install_on_device(device_id, force=force, progress=progress),
+            device_ids, max_workers=max_devices,
+            timeout=timeout_per_package * max(1, len(self.packages)))
+        matrix = {}
+        for r in results:
+            if r["ok"]:
+                matrix[r["device_id"]] = r["result"]
+            else:
+                matrix[r["device_id"]] = {group["package"]: {"status": "failed", "detail": r["error"], "seconds": 0.0}
+                                          for group in self.packages}
+        return matrix, results
+
+    @staticmethod
+    def summarize(matrix):
+        counts = {"installed": 0, "skipped": 0, "failed": 0}
+        for row in matrix.values():
+            for cell in row.values():
+                counts[cell["status"]] = counts.get(cell["status"], 0) + 1
+        return counts
+
+    def describe(self):
+        """One line per package for the installer window: name, version and APK files."""
+        return [f"{group['package']} {group['version_name'] or ''} ({group['version_code']})"
+                f" - {', '.join(os.path.basename(apk['path']) for apk in group['apks'])}"
+                for group in self.packages]
@@ -0,0 +1,96 @@
+import math
+import time
+import tkinter as tk
+
+# Line colors, assigned to series in order
+PALETTE = ["#2a9fd6", "#77b300", "#ff8800", "#cc0000", "#9933cc", "#00bcd4", "#e91e63", "#cddc39",
+           "#795548", "#ffffff"]
+
+
+class TimeSeriesChart(tk.Canvas):
+    """
+    Line chart of several series over the last `window` seconds.
+
+    Each series is drawn as one polyline, thinned to about one point per
+    pixel column; NaN values (missed samples) break the line. The y range
+    is fixed when y_range is given, otherwise it follows the data.
+    """
+
+    MARGIN_LEFT = 44
+    MARGIN_TOP = 20
+    MARGIN_BOTTOM = 16
+
+    def __init__(self, master, title, unit="", y_range=None, window=600, height=130, **kwargs):
+        super().__init__(master, height=height, background="#222222", highlightthickness=0, **kwargs)
+        self.title = title
+        self.unit = unit
+        self.y_range = y_range
+        self.window = window
+        self._series = {}
+        self._colors = {}
+        self.bind("<Configure>", lambda e: self.redraw())
+
+    def set_series(self, series, colors):
+        """series is {name: (times, values)}, colors {name: color}."""
+        self._series = series
+        self._colors = colors
+        self.redraw()
+
+    def _y_bounds(self, now):
+        if self.y_range:
+            return self.y_range
+        values = [v for times, values in self._series.values()
+                  for t, v in zip(times, values) if t >= now - self.window and not math.isnan(v)]
+        if not values:
+            return 0.0, 1.0
+        low, high = min(values), max(values)
+        pad = max((high - low) * 0.1, 0.5)
+        return low - pad, high + pad
+
+    def redraw(self):
+        self.delete("all")
+        width, height = self.winfo_width(), self.winfo_height()
+        left, top = self.MARGIN_LEFT, self.MARGIN_TOP
+        plot_width = width - left - 8
+        plot_height = height - top - self.MARGIN_BOTTOM
+        if plot_width < 10 or plot_height < 10:
+            return
+        now = time.time()
+        low, high = self._y_bounds(now)
+        span = (high - low) or 1.0
+
+        self.create_text(left, 3, anchor="nw", text=self.title, fill="#dddddd", font=("Helvetica", 9, "bold"))
+        for step in range(5):
+            value = low + span * step / 4
+            y = top + plot_height - plot_height * step / 4
+            self.create_line(left, y, left + plot_width, y, fill="#3a3a3a")
+            self.create_text(left - 4, y, anchor="e", text=f"{value:.0f}{self.unit}", fill="#999999",
+                             font=("Helvetica", 8))
+        self.create_text(left, height - 2, anchor="sw", text=f"-{self.window // 60}분", fill="#777777",
+                         font=("Helvetica", 8))
+        self.create_text(left + plot_width, height - 2, anchor="se", text="현재", fill="#777777",
+                         font=("Helvetica", 8))
+
+        start = now - self.window
+        for name, (times, values) in self._series.items():
+            color = self._colors.get(name, PALETTE[0])
+            # Thin to about one point per pixel column
+            stride = max(1, len(times) // plot_width)
+            segment = []
+            for index in range(0, len(times), stride):
+                t, v = times[index], values[index]
+                if t < start or math.isnan(v):
+                    self._draw_segment(segment, color)
+                    segment = []
+                    continue
+                x = left + plot_width * (t - start) / self.window
+                y = top + plot_height - plot_height * (min(max(v, low), high) - low) / span
+                segment.extend((x, y))
+            self._draw_segment(segment, color)
+
+    def _draw_segment(self, points, color):
+        if len(points) >= 4:
+            self.create_line(*points, fill=color, width=2)
+        elif len(points) == 2:
+            x, y = points
+            self.create_oval(x - 2, y - 2, x + 2, y + 2, fill=color, outline=color)
@@ -0,0 +1,163 @@
+"""
+Headless command line interface (no Tk import), for CI and scripted runs.
+
+    adb-tool devices
+    adb-tool actions
+    adb-tool run [-s SERIAL]... "battery" "app-version com.example.app"
+    adb-tool script deploy.txt [-s SERIAL]... [--jobs N] [--keep-going]
+    adb-tool inventory [-s SERIAL]... [--reference SERIAL | --previous] [--csv FILE]
+
+Results are written as JSON to stdout. Exit code 0 means every step
+succeeded on every device, 1 that something failed, 2 a usage or script
+error and 3 that no device was found.
+"""
+import argparse
+import json
+import sys
+
+COMMANDS = ("devices", "actions", "run", "script", "inventory")
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NO_DEVICES = 3
+
+
+def _add_run_options(parser):
+    parser.add_argument("-s", "--serial", action="append", dest="serials", metavar="SERIAL",
+                        help="대상 기기 (여러 번 지정 가능, 생략하면 연결된 모든 기기)")
+    parser.add_argument("-j", "--jobs", type=int, default=8, help="동시에 실행할 기기 수 (기본 8)")
+    parser.add_argument("--timeout", type=float, default=3600.0, help="기기당 제한 시간(초, 기본 3600)")
+    parser.add_argument("--keep-going", action="store_true", help="실패한 단계 뒤에도 다음 단계를 계속 실행")
+    parser.add_argument("-o", "--output", help="결과 JSON을 파일로 저장")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="adb-tool", description="ADB Tool 명령줄 모드 (인자 없이 실행하면 GUI)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("devices", help="연결된 기기 목록")
+    subparsers.add_parser("actions", help="스크립트에서 쓸 수 있는 명령 목록")
+
+    run_parser = subparsers.add_parser("run", help="명령줄에 적은 단계 실행 (인자 하나가 한 단계)")
+    run_parser.add_argument("steps", nargs="+", metavar="STEP")
+    _add_run_options(run_parser)
+
+    script_parser = subparsers.add_parser("script", help="스크립트 파일 실행 ('-'이면 표준 입력)")
+    script_parser.add_argument("file")
+    _add_run_options(script_parser)
+
+    inventory_parser = subparsers.add_parser("inventory", help="모든 기기의 패키지/버전 현황 수집 (스냅샷으로 저장)")
+    inventory_parser.add_argument("-s", "--serial", action="append", dest="serials", metavar="SERIAL",
+                                  help="대상 기기 (여러 번 지정 가능, 생략하면 연결된 모든 기기)")
+    inventory_parser.add_argument("-j", "--jobs", type=int, default=16, help="동시에 조회할 기기 수 (기본 16)")
+    compare_group = inventory_parser.add_mutually_exclusive_group()
+    compare_group.add_argument("--reference", metavar="SERIAL", help="이 기기와 다른 패키지/버전만 표시")
+    compare_group.add_argument("--previous", action="store_true", help="직전 스냅샷과 달라진 것만 표시")
+    inventory_parser.add_argument("--csv", help="패키지 × 기기 표를 CSV로 저장")
+    inventory_parser.add_argument("-o", "--output", help="결과 JSON을 파일로 저장")
+    return parser
+
+
+def _write(data, path=None):
+    text = json.dumps(data, ensure_ascii=False, indent=2, default=str)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def _actions():
+    from .batch import ACTIONS, COMMANDS as STEP_COMMANDS
+    return {
+        "commands": sorted(STEP_COMMANDS),
+        "actions": {name: {"id": action_id, "parameter": param} for name, (action_id, param) in ACTIONS.items()},
+    }
+
+
+def _inventory(manager, device_ids, args):
+    from . import fleet_inventory
+    store = fleet_inventory.SnapshotStore()
+    previous = store.latest() if args.previous else None
+    snapshot = fleet_inventory.collect(manager, device_ids, jobs=max(1, args.jobs))
+    store.save(snapshot)
+
+    states = None
+    if args.reference:
+        states = fleet_inventory.diff_against_device(snapshot, args.reference)
+    elif args.previous and previous:
+        states = fleet_inventory.diff_snapshots(previous, snapshot)
+    packages = fleet_inventory.packages_of(snapshot)
+    if states is not None:
+        differing = fleet_inventory.differing_packages(states)
+        packages = [package for package in packages if package in differing]
+    if args.csv:
+        fleet_inventory.export_csv(args.csv, snapshot, packages=packages, states=states)
+
+    serials = sorted(snapshot["devices"])
+    report = {
+        "snapshot": snapshot["id"],
+        "devices": {serial: snapshot["labels"][serial] for serial in serials},
+        "errors": snapshot["errors"],
+        "packages": {package: {serial: fleet_inventory.format_version(snapshot["devices"][serial].get(package))
+                               for serial in serials} for package in packages},
+    }
+    if states is not None:
+        report["differences"] = [{"serial": serial, "package": package, "state": state}
+                                 for (serial, package), state in sorted(states.items())
+                                 if state != fleet_inventory.SAME]
+    _write(report, args.output)
+    return EXIT_FAILED if snapshot["errors"] else EXIT_OK
+
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return e.code if e.code == 0 else EXIT_USAGE
+
+    if args.command == "actions":
+        _write(_actions())
+        return EXIT_OK
+
+    from .batch import BatchError, BatchRunner, parse_script, parse_step
+    if args.command in ("run", "script"):
+        try:
+            if args.command == "run":
+                steps = [parse_step(text, number) for number, text in enumerate(args.steps, 1)]
+            elif args.file == "-":
+                steps = parse_script(sys.stdin.read())
+            else:
+                with open(args.file, encoding="utf-8") as f:
+                    steps = parse_script(f.read())
+        except (BatchError, OSError) as e:
+            sys.stderr.write(f"adb-tool: {e}\n")
+            return EXIT_USAGE
+
+    from .adb_manager import AdbManager
+    manager = AdbManager()
+    if args.command == "devices":
+        serials = [serial for serial, _ in manager.get_devices()]
+        manager.load_device_profiles(serials)
+        _write([dict(manager.device_profiles.get(serial) or {}, serial=serial,
+                     label=manager.device_profiles.label(serial)) for serial in serials])
+        return EXIT_OK
+
+    device_ids = args.serials or [serial for serial, _ in manager.get_devices()]
+    if not device_ids:
+        sys.stderr.write("adb-tool: 연결된 기기가 없습니다\n")
+        return EXIT_NO_DEVICES
+
+    if args.command == "inventory":
+        return _inventory(manager, device_ids, args)
+
+    report = BatchRunner(manager, steps, keep_going=args.keep_going).run(
+        device_ids, jobs=max(1, args.jobs), timeout=args.timeout)
+    _write(report, args.output)
+    return EXIT_OK if report["ok"] else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import json
+import os
+import re
+import threading
+from .utils import get_data_dir
+
+# Profile fields read from the getprop dump
+PROPERTIES = {
+    "model": "ro.product.model",
+    "manufacturer": "ro.product.manufacturer",
+    "android": "ro.build.version.release",
+    "sdk": "ro.build.version.sdk",
+    "build": "ro.build.display.id",
+    "fingerprint": "ro.build.fingerprint",
+}
+
+# Names of the pads on the team desk, written to the names file on first run
+DEFAULT_NAMES = {
+    "5200b937431d4639": {"model": "T583", "env": "prod", "name": "무한9671"},
+    "5200e504ba849645": {"model": "T583", "env": "stg", "name": "무한6027"},
+    "R9TR90HQ6GL": {"model": "T500", "env": "stg", "name": "무한8721"},
+    "WJD06AR03662": {"model": "MPAD1", "env": "stg"},
+    "WJD09ANF00170": {"model": "MPAD2", "env": "stg"},
+}
+
+GETPROP_LINE_RE = re.compile(r"^\[([^\]]+)\]: \[(.*)\]$")
+
+
+def parse_getprop(output):
+    """Parses the '[key]: [value]' lines of a getprop dump into a dict."""
+    props = {}
+    for line in output.splitlines():
+        match = GETPROP_LINE_RE.match(line.strip())
+        if match:
+            props[match.group(1)] = match.group(2)
+    return props
+
+
+class DeviceProfiles:
+    """
+    Per-device properties and display names.
+
+    A profile (model, build, Android version, ...) is read with a single
+    'getprop' call the first time a device is seen in a session and kept in
+    memory and in a JSON file, so labels are known right away on the next
+    start and rendering a label never talks to the device.
+
+    Names come from device_names.json in the data directory:
+        {"env_property": "",
+         "devices": {"SERIAL": {"name": "무한9671", "env": "prod", "model": "T583"}}}
+    Every field is optional. The env tag is taken from the names file or,
+    if env_property names a system property, from the device.
+    """
+
+    def __init__(self, manager, path=None, names_path=None):
+        self.manager = manager
+        self.path = path or os.path.join(get_data_dir(), "device_profiles.json")
+        self.names_path = names_path or os.path.join(get_data_dir(), "device_names.json")
+        self._lock = threading.Lock()
+        self._loaded = set()  # serials read from the device in this session
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._profiles = json.load(f)
+        except (OSError, ValueError):
+            self._profiles = {}
+        self.reload_names()
+
+    def reload_names(self):
+        """Re-reads the names file, creating it with DEFAULT_NAMES if it does not exist."""
+        if not os.path.exists(self.names_path):
+            config = {"env_property": "", "devices": DEFAULT_NAMES}
+            try:
+                with open(self.names_path, "w", encoding="utf-8") as f:
+                    json.dump(config, f, ensure_ascii=False, indent=2)
+            except OSError:
+                pass
+        else:
+            try:
+                with open(self.names_path, encoding="utf-8") as f:
+                    config = json.load(f)
+            except (OSError, ValueError):
+                config = {}
+        self.env_property = config.get("env_property") or None
+        self.names = {serial: entry if isinstance(entry, dict) else {"name": str(entry)}
+                      for serial, entry in (config.get("devices") or {}).items()}
+
+    def get(self, serial):
+        """Returns the cached profile dict for a device, or None. Never calls adb."""
+        with self._lock:
+            profile = self._profiles.get(serial)
+            return dict(profile) if profile else None
+
+    def load(self, serial, refresh=False):
+        """
+        Returns the profile of a device, reading it from the device (one
+        getprop call) unless it was already read in this session.
+        """
+        with self._lock:
+            if serial in self._loaded and not refresh:
+                return dict(self._profiles[serial])
+        props = parse_getprop(self.manager.single_flight.do("getprop", serial, self.manager._run_shell,
+                                                            serial, "getprop"))
+        if not props:
+            # Device not answering: keep whatever was cached
+            return self.get(serial)
+        profile = {field: props.get(key, "") for field, key in PROPERTIES.items()}
+        profile["env"] = props.get(self.env_property, "") if self.env_property else ""
+        with self._lock:
+            changed = self._profiles.get(serial) != profile
+            self._profiles[serial] = profile
+            self._loaded.add(serial)
+            if changed:
+                self._save()
+        return dict(profile)
+
+    def _save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._profiles, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+    def label(self, serial):
+        """
+        Short description such as '(T583/prod/무한9671)' from the names file
+        and the cached profile, or '(unknown)' when nothing is known.
+        """
+        names = self.names.get(serial, {})
+        profile = self.get(serial) or {}
+        model = names.get("model") or profile.get("model", "")
+        if model.startswith("SM-"):
+            model = model[3:]  # Samsung tablets: SM-T583 -> T583
+        parts = [part for part in (model, names.get("env") or profile.get("env", ""), names.get("name")) if part]
+        return f"({'/'.join(parts)})" if parts else "(unknown)"
@@ -0,0 +1,91 @@
+import threading
+from .adb_client import AdbError, AdbConnectionError
+
+
+class DeviceTracker:
+    """
+    Background watcher that keeps an in-memory registry of attached devices.
+
+    Consumes the adb server's track-devices stream and reports incremental
+    changes through on_event(kind, entry), where kind is 'added', 'removed'
+    or 'changed' and entry is a dict with 'serial', 'state' and 'transport'.
+    After every full update on_event('synced', None) is sent. When the
+    server is not reachable the tracker polls the device list instead.
+
+    on_event is called from the tracker thread; GUI callers must hand it
+    over to their event loop (e.g. with root.after).
+    """
+
+    def __init__(self, manager, on_event=None, poll_interval=2.0):
+        self.manager = manager
+        self.on_event = on_event
+        self.poll_interval = poll_interval
+        self.registry = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="DeviceTracker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self):
+        """Returns a copy of the registry as a list of device dicts."""
+        with self._lock:
+            return [dict(entry) for entry in self.registry.values()]
+
+    def ready_devices(self):
+        """Returns the serials of devices in the 'device' state, in attach order."""
+        with self._lock:
+            return [serial for serial, entry in self.registry.items() if entry["state"] == "device"]
+
+    def _run(self):
+        client = self.manager.client
+        # Start the server up front so the first list comes from the track-devices stream
+        self.manager.start_server()
+        while not self._stop.is_set():
+            if client.is_available():
+                try:
+                    for devices in client.track_devices(self._stop):
+                        self._apply(devices)
+                    continue
+                except AdbConnectionError:
+                    client.mark_unavailable()
+                except AdbError:
+                    pass
+            # No server to stream from: poll (this also starts the server via the adb client)
+            states = self.manager._list_device_states()
+            self._apply([{"serial": serial, "state": state, "transport": None} for serial, state in states])
+            self._stop.wait(self.poll_interval)
+
+    def _apply(self, devices):
+        """Diffs a full device list against the registry and emits events."""
+        events = []
+        with self._lock:
+            seen = set()
+            for device in devices:
+                serial = device["serial"]
+                seen.add(serial)
+                entry = {"serial": serial, "state": device["state"], "transport": device.get("transport")}
+                old = self.registry.get(serial)
+                if old is None:
+                    self.registry[serial] = entry
+                    events.append(("added", dict(entry)))
+                elif old["state"] != entry["state"]:
+                    old["state"] = entry["state"]
+                    if entry["transport"]:
+                        old["transport"] = entry["transport"]
+                    events.append(("changed", dict(old)))
+            for serial in [s for s in self.registry if s not in seen]:
+                events.append(("removed", self.registry.pop(serial)))
+
+        if self.on_event:
+            for kind, entry in events:
+                self.on_event(kind, entry)
+            self.on_event("synced", None)
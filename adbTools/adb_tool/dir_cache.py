@@ -0,0 +1,90 @@
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_remote_path(path):
+    """Canonical form of a device path for cache keys: '/sdcard/Download/' -> '/sdcard/Download'."""
+    path = posixpath.normpath("/" + path.strip().lstrip("/"))
+    return "/" if path in ("/", "//") else path
+
+
+class DirectoryCache:
+    """
+    In-memory cache of remote directory listings, keyed by device serial +
+    normalized path.
+
+    Entries expire after ttl seconds so changes made outside the tool show
+    up again; changes made through AdbManager invalidate the affected
+    directories right away. The least recently used listings are dropped
+    once max_entries is exceeded.
+    """
+
+    def __init__(self, ttl=30.0, max_entries=500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Bumped on every invalidation, see token()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, serial, path):
+        """Returns a copy of the cached listing, or None if missing or expired."""
+        key = (serial, normalize_remote_path(path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(item) for item in entry[1]]
+
+    def contains(self, serial, path):
+        """True if a fresh listing is cached (does not touch the counters)."""
+        with self._lock:
+            entry = self._entries.get((serial, normalize_remote_path(path)))
+            return entry is not None and time.monotonic() - entry[0] <= self.ttl
+
+    def token(self):
+        """
+        Returns a token to pass to put() for a listing fetched from now on.
+        The put is ignored if anything was invalidated in between, so a slow
+        listing cannot bring back a directory that changed meanwhile.
+        """
+        with self._lock:
+            return self._generation
+
+    def put(self, serial, path, items, token=None):
+        key = (serial, normalize_remote_path(path))
+        with self._lock:
+            if token is not None and token != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), [dict(item) for item in items])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, serial, path):
+        """Drops the listing of path and of its parent directory (whose entry for path changed)."""
+        path = normalize_remote_path(path)
+        with self._lock:
+            self._generation += 1
+            self._entries.pop((serial, path), None)
+            self._entries.pop((serial, posixpath.dirname(path)), None)
+
+    def clear(self, serial=None):
+        with self._lock:
+            self._generation += 1
+            if serial is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == serial]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
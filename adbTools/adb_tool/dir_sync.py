@@ -0,0 +1,185 @@
+import os
+import posixpath
+from .utils import format_size
+
+
+def scan_local_tree(local_dir):
+    """Returns {relative posix path: (size, mtime)} for every file below local_dir."""
+    files = {}
+    for root, dirs, names in os.walk(local_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rel = os.path.relpath(path, local_dir).replace(os.sep, "/")
+            files[rel] = (st.st_size, int(st.st_mtime))
+    return files
+
+
+def scan_remote_tree(manager, device_id, remote_dir):
+    """
+    Returns ({relative path: (size, mtime)}, {relative paths of directories})
+    for remote_dir on the device. Each directory level is listed in one sync
+    session; a missing remote_dir gives an empty tree.
+    """
+    remote_dir = remote_dir.rstrip('/') or '/'
+    files = {}
+    dirs = set()
+    level = {remote_dir: ""}
+    while level:
+        listings = manager._list_remote(device_id, list(level))
+        next_level = {}
+        for path, rel_dir in level.items():
+            for item in listings.get(path, []):
+                rel = f"{rel_dir}/{item['name']}" if rel_dir else item['name']
+                if item['type'] == 'dir':
+                    dirs.add(rel)
+                    next_level[posixpath.join(path, item['name'])] = rel
+                else:
+                    files[rel] = (item['size'], item['mtime'])
+        level = next_level
+    return files, dirs
+
+
+def md5_file(path, chunk_size=1024 * 1024):
+    import hashlib
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _shell_quote(text):
+    return "'" + text.replace("'", "'\\''") + "'"
+
+
+def remote_md5sums(manager, device_id, remote_dir, rel_paths):
+    """
+    Computes md5 sums on the device for files below remote_dir with one
+    md5sum invocation per script-length batch. Returns {rel path: md5}.
+    """
+    sums = {}
+    batch, length = [], 0
+    batches = []
+    for rel in rel_paths:
+        quoted = _shell_quote(rel)
+        if batch and length + len(quoted) + 1 > manager.MAX_SCRIPT_LENGTH:
+            batches.append(batch)
+            batch, length = [], 0
+        batch.append(quoted)
+        length += len(quoted) + 1
+    if batch:
+        batches.append(batch)
+    for batch in batches:
+        output = manager._run_shell(device_id, f"cd {_shell_quote(remote_dir)} && md5sum {' '.join(batch)} 2>/dev/null")
+        for line in output.splitlines():
+            digest, _, rel = line.strip().partition("  ")
+            if len(digest) == 32 and rel:
+                sums[rel] = digest
+    return sums
+
+
+class SyncPlan:
+    """
+    Difference between a local folder and a device folder.
+
+    new/changed are the files to push, unchanged the ones skipped and
+    extra the device files that do not exist locally (left alone). All
+    paths are relative, with '/' separators.
+    """
+
+    def __init__(self, local_dir, remote_dir, checksum):
+        self.local_dir = local_dir
+        self.remote_dir = remote_dir.rstrip('/') or '/'
+        self.checksum = checksum
+        self.new = []
+        self.changed = []
+        self.unchanged = []
+        self.conflicts = []
+        self.extra = []
+        self.sizes = {}
+
+    @property
+    def transfers(self):
+        return sorted(self.new + self.changed)
+
+    @property
+    def transfer_bytes(self):
+        return sum(self.sizes[rel] for rel in self.new + self.changed)
+
+    def local_path(self, rel):
+        return os.path.join(self.local_dir, *rel.split("/"))
+
+    def remote_path(self, rel):
+        return posixpath.join(self.remote_dir, rel)
+
+    def pairs(self):
+        """(local path, remote path) for every file to push."""
+        return [(self.local_path(rel), self.remote_path(rel)) for rel in self.transfers]
+
+    def summary(self):
+        return (f"새 파일 {len(self.new)}개, 변경 {len(self.changed)}개, 동일 {len(self.unchanged)}개"
+                f" / 전송량 {format_size(self.transfer_bytes)}")
+
+    def report(self, limit=50):
+        """Dry-run report: what would be pushed and what is skipped."""
+        lines = [f"{self.local_dir} -> {self.remote_dir}",
+                 f"비교 방식: {'크기 + MD5' if self.checksum else '크기 + 수정 시간'}",
+                 self.summary()]
+        sections = [("새 파일", self.new), ("변경됨", self.changed),
+                    ("건너뜀 (기기에 폴더가 있음)", self.conflicts), ("기기에만 있음", self.extra)]
+        for title, paths in sections:
+            if not paths:
+                continue
+            lines.append("")
+            lines.append(f"[{title}] {len(paths)}개")
+            for rel in paths[:limit]:
+                size = f" ({format_size(self.sizes[rel])})" if rel in self.sizes else ""
+                lines.append(f"  {rel}{size}")
+            if len(paths) > limit:
+                lines.append(f"  ... 외 {len(paths) - limit}개")
+        return "\n".join(lines)
+
+
+def plan_sync(manager, device_id, local_dir, remote_dir, checksum=False):
+    """
+    Compares local_dir with remote_dir and returns a SyncPlan. Files differ
+    when their size or mtime (whole seconds; pushes keep the local mtime)
+    differs. With checksum=True, same-size files are compared by md5 instead
+    of mtime, computed on the device in batched md5sum calls.
+    """
+    local = scan_local_tree(local_dir)
+    remote, remote_dirs = scan_remote_tree(manager, device_id, remote_dir)
+    plan = SyncPlan(local_dir, remote_dir, checksum)
+    to_hash = []
+    for rel, (size, mtime) in sorted(local.items()):
+        plan.sizes[rel] = size
+        if rel in remote_dirs:
+            plan.conflicts.append(rel)
+        elif rel not in remote:
+            plan.new.append(rel)
+        elif remote[rel][0] != size:
+            plan.changed.append(rel)
+        elif checksum:
+            to_hash.append(rel)
+        elif remote[rel][1] != mtime:
+            plan.changed.append(rel)
+        else:
+            plan.unchanged.append(rel)
+
+    if to_hash:
+        remote_sums = remote_md5sums(manager, device_id, plan.remote_dir, to_hash)
+        for rel in to_hash:
+            if remote_sums.get(rel) == md5_file(plan.local_path(rel)):
+                plan.unchanged.append(rel)
+            else:
+                plan.changed.append(rel)
+        plan.unchanged.sort()
+        plan.changed.sort()
+
+    plan.extra = sorted(rel for rel in remote if rel not in local)
+    return plan
@@ -0,0 +1,182 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from .utils import get_data_dir
+
+# Cell states of a matrix compared against a reference device or an older snapshot
+SAME = "same"
+CHANGED = "changed"      # installed with another version
+MISSING = "missing"      # installed on the reference / in the old snapshot only
+EXTRA = "extra"          # installed here only
+UNKNOWN = "unknown"      # device not in the older snapshot
+
+
+def collect(manager, device_ids, jobs=16):
+    """
+    Reads the package list of every device concurrently (one dumpsys pass
+    per device, see AdbManager.get_package_inventory) and returns a
+    snapshot dict:
+        {"created": time, "devices": {serial: {package: [version_name, version_code]}},
+         "labels": {serial: describe_device label}, "errors": {serial: error}}
+    """
+    results = manager.fan_out(manager.get_package_inventory, device_ids, max_workers=jobs, timeout=120.0)
+    snapshot = {"created": time.time(), "devices": {}, "labels": {}, "errors": {}}
+    for r in results:
+        serial = r["device_id"]
+        snapshot["labels"][serial] = manager.describe_device(serial)
+        if r["ok"] and r["result"]:
+            snapshot["devices"][serial] = {
+                package: [details["version_name"] or "", details["version_code"] or ""]
+                for package, details in r["result"].items()}
+        else:
+            snapshot["errors"][serial] = r["error"] or "패키지 목록이 비어 있습니다"
+    return snapshot
+
+
+def packages_of(snapshot, contains=""):
+    """Sorted package names installed on any device of the snapshot, optionally filtered."""
+    packages = set()
+    for installed in snapshot["devices"].values():
+        packages.update(installed)
+    contains = contains.lower()
+    return sorted(package for package in packages if contains in package.lower())
+
+
+def format_version(version):
+    """'1.2.3 (123)' for a [version_name, version_code] cell, '' when not installed."""
+    if not version:
+        return ""
+    name, code = version
+    return f"{name} ({code})" if name and code else name or code
+
+
+def _compare(version, reference):
+    if version is None and reference is None:
+        return SAME
+    if reference is None:
+        return EXTRA
+    if version is None:
+        return MISSING
+    return SAME if list(version) == list(reference) else CHANGED
+
+
+def diff_against_device(snapshot, reference_serial):
+    """
+    {(serial, package): state} of every device against the packages and
+    versions of the reference device in the same snapshot.
+    """
+    reference = snapshot["devices"].get(reference_serial, {})
+    states = {}
+    packages = packages_of(snapshot)
+    for serial, installed in snapshot["devices"].items():
+        for package in packages:
+            states[(serial, package)] = _compare(installed.get(package), reference.get(package))
+    return states
+
+
+def diff_snapshots(old, new):
+    """
+    {(serial, package): state} of the new snapshot against an older one.
+    Devices missing from the old snapshot are UNKNOWN.
+    """
+    states = {}
+    packages = sorted(set(packages_of(old)) | set(packages_of(new)))
+    for serial, installed in new["devices"].items():
+        previous = old["devices"].get(serial)
+        for package in packages:
+            if previous is None:
+                states[(serial, package)] = UNKNOWN
+            else:
+                states[(serial, package)] = _compare(installed.get(package), previous.get(package))
+    return states
+
+
+def differing_packages(states):
+    """Packages with at least one cell that is not SAME."""
+    return {package for (_, package), state in states.items() if state != SAME}
+
+
+def export_csv(path, snapshot, serials=None, packages=None, states=None):
+    """
+    Writes the package x device matrix to a CSV file (UTF-8 with BOM so
+    Excel shows the Korean labels). With states, every cell also gets its
+    comparison state, e.g. '1.0.2 (102) [changed]'.
+    """
+    serials = serials if serials is not None else sorted(snapshot["devices"])
+    packages = packages if packages is not None else packages_of(snapshot)
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["package"] + [snapshot["labels"].get(serial, serial) for serial in serials])
+        for package in packages:
+            row = [package]
+            for serial in serials:
+                cell = format_version(snapshot["devices"].get(serial, {}).get(package))
+                state = states.get((serial, package)) if states else None
+                if state and state != SAME:
+                    cell = f"{cell} [{state}]".strip()
+                row.append(cell)
+            writer.writerow(row)
+
+
+class SnapshotStore:
+    """
+    Inventory snapshots kept in a SQLite file in the data directory, one
+    JSON document per snapshot. Only the newest max_snapshots are kept.
+    """
+
+    def __init__(self, path=None, max_snapshots=100):
+        self.path = path or os.path.join(get_data_dir(), "fleet_inventory.db")
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+        except sqlite3.Error:
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " created REAL NOT NULL,"
+            " devices INTEGER NOT NULL,"
+            " data TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def save(self, snapshot):
+        """Stores a snapshot and returns its id (also set as snapshot['id'])."""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO snapshots (created, devices, data) VALUES (?, ?, ?)",
+                (snapshot["created"], len(snapshot["devices"]), json.dumps(snapshot, ensure_ascii=False)))
+            snapshot["id"] = cursor.lastrowid
+            self._db.execute(
+                "DELETE FROM snapshots WHERE id NOT IN (SELECT id FROM snapshots ORDER BY id DESC LIMIT ?)",
+                (self.max_snapshots,))
+            self._db.commit()
+        return snapshot["id"]
+
+    def list(self):
+        """[{'id', 'created', 'devices'}] of the stored snapshots, newest first."""
+        with self._lock:
+            rows = self._db.execute("SELECT id, created, devices FROM snapshots ORDER BY id DESC").fetchall()
+        return [{"id": row[0], "created": row[1], "devices": row[2]} for row in rows]
+
+    def load(self, snapshot_id):
+        with self._lock:
+            row = self._db.execute("SELECT data FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            return None
+        snapshot = json.loads(row[0])
+        snapshot["id"] = snapshot_id
+        return snapshot
+
+    def latest(self):
+        snapshots = self.list()
+        return self.load(snapshots[0]["id"]) if snapshots else None
+
+    def delete(self, snapshot_id):
+        with self._lock:
+            self._db.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+            self._db.commit()
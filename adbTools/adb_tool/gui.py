@@ -2,12 +2,29 @@ import tkinter as tk
 from tkinter import messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from .adb_manager import AdbManager
+from .adb_manager import AdbManager, fan_out_row, timeout_error
+from .device_tracker import DeviceTracker
+from .task_scheduler import TaskScheduler
+from .tracing import tracer
+from .utils import format_size
 import threading
+import time
 import os
 
 class AdbGui:
-    def __init__(self, root):
+    # Actions that can be run on every connected device in fleet mode
+    FLEET_ACTIONS = [0, 1, 2, 3, 4, 6, 12, 13, 14, 15, 100, 200, 202]
+
+    def __init__(self, root, started=None):
+        """
+        started is the time.perf_counter() value at process start, used for
+        the startup timing report (see _on_first_paint).
+        """
+        init_started = time.perf_counter()
+        self.started = started if started is not None else init_started
+        # startup phase -> seconds since process start
+        self.startup_timings = {}
+        tracer.record("startup imports", "startup", self.started, init_started)
         self.root = root
         self.root.title("WJ Pad Controller - 웅진북클럽 패드 관리 도구")
         self.root.geometry("600x900")
@@ -16,14 +33,60 @@ class AdbGui:
         self.style = ttk.Style(theme="cyborg")
 
         self.manager = AdbManager()
+        # Background work: bounded pool, one task at a time per device (see TaskScheduler)
+        self.scheduler = TaskScheduler(max_workers=8, dispatch=lambda fn: self.root.after(0, fn),
+                                       on_change=self._schedule_task_status)
+        self._task_status_pending = False
+        # Fleet telemetry sampler, created by the monitoring window
+        self.telemetry = None
         self.selected_device_id = None
+        self.current_devices = []
+        self._devices_synced = False
 
         # Store button references for showing/hiding
         self.device_buttons = []
         self.action_frames = []
 
         self.create_widgets()
-        self.refresh_devices()
+        self.update_button_visibility(False)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.status_var.set("디바이스 검색 중...")
+        tracer.record("startup widgets", "startup", init_started, time.perf_counter())
+
+        # Device list is kept current by a background track-devices watcher
+        self.device_tracker = DeviceTracker(
+            self.manager,
+            on_event=lambda kind, entry: self.root.after(0, lambda: self.on_device_event(kind, entry)))
+
+        # Everything else starts once the window has been drawn
+        self.root.after_idle(self._on_first_paint)
+
+    def _on_first_paint(self):
+        """
+        Runs after the first idle pass (the window is mapped and drawn):
+        starts the device watcher, which also starts the adb server if
+        needed.
+        """
+        self._mark_startup("first paint")
+        self.device_tracker.start()
+
+        # Event loop responsiveness probe for the diagnostics window
+        self._probe_ui_latency()
+
+    def _mark_startup(self, phase):
+        """Records the time from process start to a startup phase (once per phase)."""
+        if phase in self.startup_timings:
+            return
+        now = time.perf_counter()
+        self.startup_timings[phase] = now - self.started
+        tracer.record(f"startup {phase}", "startup", self.started, now)
+
+    def startup_report(self):
+        """One line describing the startup phases, e.g. for the diagnostics window."""
+        names = {"first paint": "첫 화면", "devices": "기기 목록"}
+        parts = [f"{names.get(phase, phase)} {seconds * 1000:.0f}ms"
+                 for phase, seconds in self.startup_timings.items()]
+        return "시작 시간: " + (", ".join(parts) if parts else "측정 중")
 
     def create_widgets(self):
         # Main container with padding
@@ -74,6 +137,7 @@ class AdbGui:
             (3, "홈 버튼", "primary"),
             (4, "화면 끄기", "primary"),
             (200, "화면 캡쳐", "primary"),
+            (202, "연속 캡쳐", "primary"),
             (201, "파일 복사", "success"),
             (12, "캡쳐 권한 부여", "primary"),
         ]
@@ -95,6 +159,7 @@ class AdbGui:
         app_actions = [
             (11, "앱 설치", "success"),
             (10, "앱 삭제", "success"),
+            (203, "일괄 설치", "success"),
         ]
 
         for i, (action_id, label, style) in enumerate(app_actions):
@@ -116,6 +181,7 @@ class AdbGui:
             (15, "최상위 앱", "info"),
             (5, "로그캣 실행", "info"),
             (55, "로그 저장", "success"),
+            (56, "로그 캡처", "success"),
             (14, "브로드캐스트", "info"),
         ]
 
@@ -139,33 +205,148 @@ class AdbGui:
         ttk.Button(global_frame, text="모든 디바이스 화면 끄기", 
                    command=lambda: self.run_action(9), bootstyle="outline-secondary").pack(side=LEFT, expand=YES, fill=X, padx=5, pady=5)
 
+        ttk.Button(global_frame, text="로그 검색",
+                   command=self.open_log_search_popup, bootstyle="outline-info").pack(side=LEFT, expand=YES, fill=X, padx=5, pady=5)
+        ttk.Button(global_frame, text="진단",
+                   command=self.open_diagnostics_popup, bootstyle="outline-info").pack(side=LEFT, expand=YES, fill=X, padx=5, pady=5)
+        ttk.Button(global_frame, text="모니터링",
+                   command=self.open_telemetry_popup, bootstyle="outline-info").pack(side=LEFT, expand=YES, fill=X, padx=5, pady=5)
+        ttk.Button(global_frame, text="앱 현황",
+                   command=self.open_inventory_popup, bootstyle="outline-info").pack(side=LEFT, expand=YES, fill=X, padx=5, pady=5)
+
+        # Fleet mode: run the selected action on every connected device
+        self.fleet_mode_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(global_frame, text="모든 디바이스에 실행", variable=self.fleet_mode_var,
+                        bootstyle="round-toggle").pack(side=LEFT, padx=5, pady=5)
+
         # Status Bar
         self.status_var = tk.StringVar()
         self.status_var.set("준비 완료")
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, relief="sunken", anchor="w", bootstyle="inverse-secondary", padding=5)
-        status_bar.pack(side=BOTTOM, fill=X)
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=BOTTOM, fill=X)
+        # Running/queued background tasks; click for the task list
+        self.task_status_var = tk.StringVar(value="작업 없음")
+        task_status = ttk.Label(status_frame, textvariable=self.task_status_var, relief="sunken", anchor="e",
+                                bootstyle="inverse-secondary", padding=5, cursor="hand2")
+        task_status.pack(side=RIGHT)
+        task_status.bind("<Button-1>", lambda e: self.open_task_queue_popup())
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, relief="sunken", anchor="w", bootstyle="inverse-secondary", padding=5)
+        status_bar.pack(side=LEFT, fill=X, expand=YES)
+
+    UI_PROBE_INTERVAL = 250
+
+    def _probe_ui_latency(self, scheduled=None):
+        """
+        Measures how late a periodic Tk timer fires. Large delays mean the GUI
+        thread itself was blocked; they show up as 'ui lag' in diagnostics.
+        """
+        now = time.perf_counter()
+        if scheduled is not None:
+            lag = now - scheduled
+            if lag > 0.05:
+                tracer.record("ui lag", "gui", scheduled, now)
+        next_time = time.perf_counter() + self.UI_PROBE_INTERVAL / 1000
+        self.root.after(self.UI_PROBE_INTERVAL, lambda: self._probe_ui_latency(next_time))
+
+    def on_close(self):
+        """
+        Stops background work that owns open files before closing the window.
+        """
+        self.manager.log_captures.stop_all()
+        self.scheduler.shutdown()
+        self.manager.shell_sessions.close()
+        if self.telemetry is not None:
+            self.telemetry.stop()
+            self.telemetry.set_sink(None)
+        self.root.destroy()
 
     def refresh_devices(self):
-        devices = self.manager.get_devices()
+        """
+        Re-reads the device list in the background.
+        """
+        self.status_var.set("디바이스 검색 중...")
+
+        def task():
+            # Picks up edits to the device names file
+            self.manager.device_profiles.reload_names()
+            devices = self.manager.get_devices()
+            self.root.after(0, lambda: self.set_devices(devices, show_help_if_empty=True))
+
+        self.scheduler.submit(task, name="디바이스 검색")
+
+    def set_devices(self, devices, show_help_if_empty=False):
+        """
+        Fills the device combobox, keeping the current selection if it is still attached.
+        """
+        self.current_devices = devices
         if not devices:
             self.device_combo['values'] = ["디바이스 없음"]
             self.device_combo.current(0)
             self.selected_device_id = None
             self.update_button_visibility(False)
-            # Show help if no devices
-            self.root.after(100, self.show_help)
+            self.status_var.set("연결된 디바이스 없음")
+            if show_help_if_empty:
+                # Show help if no devices
+                self.root.after(100, self.show_help)
+            return
+
+        display_values = [desc for _, desc in devices]
+        self.device_combo['values'] = display_values
+        device_ids = [device_id for device_id, _ in devices]
+        if self.selected_device_id in device_ids:
+            self.device_combo.current(device_ids.index(self.selected_device_id))
         else:
-            self.current_devices = devices
-            display_values = [desc for _, desc in devices]
-            self.device_combo['values'] = display_values
-            if display_values:
-                self.device_combo.current(0)
-                self.selected_device_id = devices[0][0]
-                self.update_button_visibility(True)
+            self.device_combo.current(0)
+            self.selected_device_id = device_ids[0]
+        self.update_button_visibility(True)
+        self.status_var.set(f"디바이스 {len(devices)}대 연결됨")
+
+    def on_device_event(self, kind, entry):
+        """
+        Applies a device tracker event to the device list (runs on the Tk thread).
+        """
+        if kind == "synced":
+            self._mark_startup("devices")
+            if not self._devices_synced:
+                self._devices_synced = True
+                if not self.current_devices:
+                    self.set_devices([], show_help_if_empty=True)
+            return
+
+        serial = entry["serial"]
+        devices = [d for d in self.current_devices if d[0] != serial]
+        if kind in ("added", "changed") and entry["state"] == "device":
+            devices.append((serial, self.manager.describe_device(serial)))
+            self.load_device_profile(serial)
+        else:
+            # Shell sessions of an unplugged or offline device are dead; open new ones on reconnect
+            self.manager.shell_sessions.close_device(serial)
+        if devices != self.current_devices:
+            self.set_devices(devices)
+
+        messages = {"added": "디바이스 연결됨", "removed": "디바이스 연결 해제됨", "changed": "디바이스 상태 변경"}
+        self.status_var.set(f"{messages[kind]}: {serial} ({entry['state']})")
+
+    def load_device_profile(self, serial):
+        """
+        Reads a device's properties in the background (once per session) and
+        updates its label in the device list.
+        """
+        def task():
+            self.manager.device_profiles.load(serial)
+            self.root.after(0, lambda: self.update_device_label(serial))
+
+        self.scheduler.submit(task, device=serial, name="기기 정보 읽기")
+
+    def update_device_label(self, serial):
+        devices = [(device_id, self.manager.describe_device(device_id) if device_id == serial else description)
+                   for device_id, description in self.current_devices]
+        if devices != self.current_devices:
+            self.set_devices(devices)
 
     def on_device_select(self, event):
         idx = self.device_combo.current()
-        if hasattr(self, 'current_devices') and idx < len(self.current_devices):
+        if 0 <= idx < len(self.current_devices):
             self.selected_device_id = self.current_devices[idx][0]
             self.update_button_visibility(True)
         else:
@@ -189,7 +370,8 @@ class AdbGui:
                 frame.pack_forget()  # Completely hide frame
 
     def run_action(self, action_id):
-        if action_id not in [8, 9] and not self.selected_device_id:
+        fleet_mode = self.fleet_mode_var.get()
+        if action_id not in [8, 9, 203] and not self.selected_device_id and not (fleet_mode and action_id in self.FLEET_ACTIONS):
             messagebox.showwarning("경고", "디바이스를 먼저 선택해주세요.")
             return
 
@@ -198,6 +380,11 @@ class AdbGui:
             self.open_install_popup()
             return
         
+        # Special handling for Bulk Install (203): every connected device
+        if action_id == 203:
+            self.open_bulk_install_popup()
+            return
+
         # Special handling for Delete App (10)
         if action_id == 10:
             self.open_delete_popup()
@@ -225,15 +412,28 @@ class AdbGui:
                 return
 
             self.status_var.set("로그 저장 중...")
-            
-            def task():
-                try:
-                    result = self.manager.execute_action(action_id, self.selected_device_id, save_path=save_path)
-                    self.root.after(0, lambda: self.handle_result(result))
-                except Exception as e:
-                    self.root.after(0, lambda: self.handle_error(str(e)))
-            
-            threading.Thread(target=task).start()
+            device_id = self.selected_device_id
+            self.scheduler.submit(lambda: self.manager.execute_action(action_id, device_id, save_path=save_path),
+                                  device=device_id, name="로그 저장", on_done=self.handle_result,
+                                  on_error=lambda e: self.handle_error(str(e)))
+            return
+
+        # Special handling for Burst Capture (202): ask frame count and interval
+        if action_id == 202:
+            self.run_burst_capture()
+            return
+
+        # Special handling for Log Capture (56): pick a folder when starting
+        if action_id == 56 and not self.manager.log_captures.is_capturing(self.selected_device_id):
+            from tkinter import filedialog
+
+            save_dir = filedialog.askdirectory(title="로그 캡처 저장 폴더 선택")
+            if not save_dir:
+                return
+
+            result = self.manager.execute_action(action_id, self.selected_device_id,
+                                                 package=self.param_var.get(), save_dir=save_dir)
+            self.handle_result(result)
             return
 
         param = self.param_var.get()
@@ -243,19 +443,161 @@ class AdbGui:
             self.param_entry.focus()
             return
 
+        if fleet_mode and action_id in self.FLEET_ACTIONS:
+            self.run_fleet_action(action_id, package=param)
+            return
+
+        # Queued behind earlier commands for the same device; waits for the command so the order holds.
+        # Send Broadcast (14) still opens its terminal window instead of returning the output.
         self.status_var.set(f"실행 중: 기능 {action_id}...")
-        
-        def task():
-            try:
-                result = self.manager.execute_action(action_id, self.selected_device_id, package=param)
-                
-                # Handle result on main thread
-                self.root.after(0, lambda: self.handle_result(result))
-                
-            except Exception as e:
-                self.root.after(0, lambda: self.handle_error(str(e)))
+        device_id = self.selected_device_id
+        blocking = action_id != 14
+        self.scheduler.submit(lambda: self.manager.execute_action(action_id, device_id, package=param,
+                                                                  blocking=blocking),
+                              device=device_id, name=f"기능 {action_id}", on_done=self.handle_result,
+                              on_error=lambda e: self.handle_error(str(e)))
+
+    def run_burst_capture(self):
+        """
+        Captures a series of screenshots from the selected device (or every
+        device in fleet mode) with per-frame progress in the status bar.
+        """
+        from tkinter import simpledialog
+
+        frames = simpledialog.askinteger("연속 캡쳐", "캡쳐할 장 수:", initialvalue=10,
+                                         minvalue=1, maxvalue=1000, parent=self.root)
+        if not frames:
+            return
+        interval = simpledialog.askfloat("연속 캡쳐", "캡쳐 간격(초):", initialvalue=0.5,
+                                         minvalue=0.0, maxvalue=60.0, parent=self.root)
+        if interval is None:
+            return
+
+        device_ids = None
+        if self.fleet_mode_var.get():
+            device_ids = [dev_id for dev_id, _ in self.current_devices]
+        device_id = self.selected_device_id
+        self.status_var.set("연속 캡쳐 중...")
+
+        def on_progress(done, total):
+            self.root.after(0, lambda: self.status_var.set(f"연속 캡쳐 중... {done}/{total}"))
+
+        self.scheduler.submit(lambda: self.manager.execute_action(202, device_id, frames=frames, interval=interval,
+                                                                  device_ids=device_ids, progress=on_progress),
+                              device=None if device_ids else device_id, name="연속 캡쳐",
+                              on_done=self.handle_result, on_error=lambda e: self.handle_error(str(e)))
+
+    def run_fleet_action(self, action_id, timeout=30.0, **kwargs):
+        """
+        Runs an action on every connected device, each task queued on its
+        device's lane, and shows the per-device results (fan_out format)
+        once every device has a row. Like fan_out, a device that has not
+        finished timeout seconds after its task was queued is reported as
+        timed out (its task is cancelled and a late result ignored); a task
+        cancelled elsewhere is reported as failed.
+        """
+        device_ids = [dev_id for dev_id, _ in self.current_devices]
+        if not device_ids:
+            self.show_fleet_results(action_id, [])
+            return
+        self.status_var.set(f"전체 디바이스 실행 중: 기능 {action_id}...")
+        rows = {}
+        tasks = {}
+
+        def record(dev_id, row):
+            if dev_id in rows:
+                return
+            rows[dev_id] = row
+            if len(rows) == len(device_ids):
+                self.show_fleet_results(action_id, [rows[dev_id] for dev_id in device_ids])
+
+        def elapsed(dev_id):
+            task = tasks[dev_id]
+            return time.monotonic() - (task.started or task.submitted)
+
+        def run(dev_id):
+            started = time.monotonic()
+            result = self.manager.execute_action(action_id, dev_id, blocking=True, **kwargs)
+            return result, time.monotonic() - started
+
+        def watch():
+            # Callbacks of cancelled tasks are skipped, so their rows are made here
+            for dev_id, task in tasks.items():
+                if dev_id in rows:
+                    continue
+                if task.cancelled:
+                    record(dev_id, fan_out_row(dev_id, error="취소됨", latency=elapsed(dev_id)))
+                elif time.monotonic() - task.submitted > timeout:
+                    record(dev_id, fan_out_row(dev_id, error=timeout_error(timeout), latency=elapsed(dev_id)))
+                    self.scheduler.cancel(task)
+            if len(rows) < len(device_ids):
+                self.root.after(200, watch)
+
+        for dev_id in device_ids:
+            tasks[dev_id] = self.scheduler.submit(
+                lambda dev_id=dev_id: run(dev_id), device=dev_id, name=f"기능 {action_id} (전체)",
+                on_done=lambda outcome, dev_id=dev_id: record(dev_id, fan_out_row(dev_id, outcome[0],
+                                                                                   latency=outcome[1])),
+                on_error=lambda e, dev_id=dev_id: record(dev_id, fan_out_row(dev_id, error=str(e),
+                                                                               latency=elapsed(dev_id))))
+        self.root.after(200, watch)
+
+    def show_fleet_results(self, action_id, results):
+        """
+        Shows a table of per-device results (success, latency, output) for a fleet run.
+        """
+        succeeded = sum(1 for r in results if r["ok"])
+        self.status_var.set(f"전체 디바이스 실행 완료: 기능 {action_id} (성공 {succeeded}/{len(results)})")
+        if not results:
+            messagebox.showwarning("경고", "연결된 디바이스가 없습니다.")
+            return
+
+        popup = tk.Toplevel(self.root)
+        popup.title(f"전체 디바이스 실행 결과 - 기능 {action_id}")
+        popup.geometry("700x400")
+
+        title_label = ttk.Label(popup, text=f"성공 {succeeded} / 전체 {len(results)}", font=("Helvetica", 14, "bold"), bootstyle="inverse-info")
+        title_label.pack(pady=10, padx=10)
 
-        threading.Thread(target=task).start()
+        table_frame = ttk.Frame(popup)
+        table_frame.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+        columns = ("device", "status", "latency", "detail")
+        table = ttk.Treeview(table_frame, columns=columns, show="headings", bootstyle="info")
+        for column, heading, width in [("device", "디바이스", 200), ("status", "결과", 60),
+                                       ("latency", "시간(ms)", 80), ("detail", "내용", 320)]:
+            table.heading(column, text=heading)
+            table.column(column, width=width, anchor="w")
+        scrollbar = ttk.Scrollbar(table_frame, command=table.yview, bootstyle="secondary-round")
+        table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        table.pack(side=LEFT, fill=BOTH, expand=YES)
+
+        details = {}
+        for r in results:
+            result = r["result"] or {}
+            if r["error"]:
+                detail = r["error"]
+            elif result.get("type") == "info":
+                detail = self.parse_info(result.get("data"), result.get("title", "정보"))
+            else:
+                detail = result.get("msg", "")
+            row = table.insert("", tk.END, values=(
+                self.manager.describe_device(r["device_id"]),
+                "성공" if r["ok"] else "실패",
+                f"{r['latency'] * 1000:.0f}",
+                detail.replace("\n", " / "),
+            ))
+            details[row] = (r["device_id"], detail)
+
+        def show_detail(event):
+            selection = table.selection()
+            if selection:
+                device_id, detail = details[selection[0]]
+                messagebox.showinfo(device_id, detail or "정보 없음", parent=popup)
+
+        table.bind("<Double-Button-1>", show_detail)
+        ttk.Button(popup, text="닫기", command=popup.destroy, bootstyle="secondary").pack(fill=X, padx=10, pady=10)
 
     def open_install_popup(self):
         """
@@ -338,16 +680,16 @@ class AdbGui:
                 return
                 
             popup.destroy()
+
+            if self.fleet_mode_var.get():
+                self.run_fleet_action(11, package=file_path)
+                return
+
             self.status_var.set(f"설치 중: {file_path}")
-            
-            def task():
-                try:
-                    result = self.manager.execute_action(11, self.selected_device_id, package=file_path)
-                    self.root.after(0, lambda: self.handle_result(result))
-                except Exception as e:
-                    self.root.after(0, lambda: self.handle_error(str(e)))
-                    
-            threading.Thread(target=task).start()
+            device_id = self.selected_device_id
+            self.scheduler.submit(lambda: self.manager.execute_action(11, device_id, package=file_path),
+                                  device=device_id, name=f"설치: {os.path.basename(file_path)}",
+                                  on_done=self.handle_result, on_error=lambda e: self.handle_error(str(e)))
         
         try:
             popup.drop_target_register("DND_Files")
@@ -365,13 +707,134 @@ class AdbGui:
         )
         close_btn.pack(pady=(20, 0))
 
+    # Matrix cell text per BulkInstaller status
+    INSTALL_STATUS_TEXT = {"waiting": "대기", "installing": "설치 중...", "installed": "✅ 설치",
+                           "skipped": "⏭ 최신", "failed": "❌ 실패"}
+
+    def open_bulk_install_popup(self):
+        """
+        Installs a set of APKs on every connected device at once and shows a
+        device x package result matrix that fills in as installs finish.
+        """
+        from tkinter import filedialog
+        from .bulk_install import BulkInstaller
+        apk_paths = filedialog.askopenfilenames(title="설치할 APK 파일 선택 (여러 개 선택 가능)",
+                                                filetypes=[("APK files", "*.apk"), ("All files", "*.*")])
+        if not apk_paths:
+            return
+        device_ids = [dev_id for dev_id, _ in self.current_devices]
+        if not device_ids:
+            messagebox.showwarning("경고", "연결된 디바이스가 없습니다.")
+            return
+
+        popup = tk.Toplevel(self.root)
+        popup.title("APK 일괄 설치")
+        popup.geometry("800x500")
+
+        title_label = ttk.Label(popup, text="APK 분석 중...", font=("Helvetica", 14, "bold"), bootstyle="inverse-info")
+        title_label.pack(pady=10, padx=10)
+        apk_label = ttk.Label(popup, text="", justify="left", bootstyle="secondary")
+        apk_label.pack(fill=X, padx=10)
+
+        table_frame = ttk.Frame(popup)
+        table_frame.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+        control_frame = ttk.Frame(popup)
+        control_frame.pack(fill=X, padx=10, pady=(0, 10))
+        force_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="같은 버전도 다시 설치", variable=force_var,
+                        bootstyle="round-toggle").pack(side=LEFT, padx=5)
+        start_btn = ttk.Button(control_frame, text="설치 시작", bootstyle="success", state=DISABLED)
+        start_btn.pack(side=LEFT, expand=YES, fill=X, padx=5)
+        ttk.Button(control_frame, text="닫기", command=popup.destroy, bootstyle="secondary").pack(side=RIGHT, padx=5)
+
+        cells = {}
+
+        def build_matrix(installer):
+            packages = [group["package"] for group in installer.packages]
+            columns = ["device"] + packages
+            table = ttk.Treeview(table_frame, columns=columns, show="headings", bootstyle="info")
+            table.heading("device", text="디바이스")
+            table.column("device", width=200, anchor="w")
+            for group in installer.packages:
+                table.heading(group["package"], text=f"{group['package'].split('.')[-1]} ({group['version_code']})")
+                table.column(group["package"], width=110, anchor="center")
+            scrollbar = ttk.Scrollbar(table_frame, command=table.yview, bootstyle="secondary-round")
+            table.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side=RIGHT, fill=Y)
+            table.pack(side=LEFT, fill=BOTH, expand=YES)
+
+            rows = {}
+            for device_id in device_ids:
+                rows[device_id] = table.insert("", tk.END, values=[self.manager.describe_device(device_id)]
+                                               + [self.INSTALL_STATUS_TEXT["waiting"]] * len(packages))
+
+            def update_cell(device_id, package, cell):
+                if not table.winfo_exists():
+                    return
+                cells[(device_id, package)] = cell
+                table.set(rows[device_id], package, self.INSTALL_STATUS_TEXT.get(cell["status"], cell["status"]))
+
+            def show_detail(event):
+                selection = table.selection()
+                if not selection:
+                    return
+                device_id = next(dev_id for dev_id, row in rows.items() if row == selection[0])
+                lines = [f"{package}: {cells[(device_id, package)]['detail']}"
+                         for package in packages if (device_id, package) in cells]
+                messagebox.showinfo(device_id, "\n".join(lines) or "아직 결과가 없습니다.", parent=popup)
+
+            table.bind("<Double-Button-1>", show_detail)
+            return update_cell
+
+        def start(installer, update_cell):
+            start_btn.config(state=DISABLED)
+            force = force_var.get()
+            self.status_var.set(f"일괄 설치 중: {len(installer.packages)}개 앱, {len(device_ids)}대")
+
+            def task():
+                try:
+                    matrix, _ = installer.run(
+                        device_ids, force=force,
+                        progress=lambda dev_id, pkg, cell: self.root.after(0, lambda: update_cell(dev_id, pkg, cell)))
+                except Exception as e:
+                    message = str(e)
+                    self.root.after(0, lambda: self.handle_error(message))
+                    return
+                for device_id, row in matrix.items():
+                    for package, cell in row.items():
+                        self.root.after(0, lambda d=device_id, p=package, c=cell: update_cell(d, p, c))
+                counts = BulkInstaller.summarize(matrix)
+                summary = f"설치 {counts['installed']}, 건너뜀 {counts['skipped']}, 실패 {counts['failed']}"
+                self.root.after(0, lambda: self.status_var.set(f"일괄 설치 완료: {summary}"))
+                self.root.after(0, lambda: title_label.winfo_exists() and title_label.config(text=summary))
+
+            self.scheduler.submit(task, name="일괄 설치")
+
+        def load_task():
+            # Hashing and manifest parsing can take a moment for large APKs
+            installer = BulkInstaller(self.manager, apk_paths)
+
+            def show():
+                if not popup.winfo_exists():
+                    return
+                title_label.config(text=f"{len(installer.packages)}개 앱 → {len(device_ids)}대")
+                apk_label.config(text="\n".join(installer.describe() + [f"⚠ {error}" for error in installer.errors]))
+                if installer.packages:
+                    update_cell = build_matrix(installer)
+                    start_btn.config(state=NORMAL, command=lambda: start(installer, update_cell))
+
+            self.root.after(0, show)
+
+        threading.Thread(target=load_task, daemon=True).start()
+
     def open_file_push_popup(self):
         """
         Opens a popup window for File Push with Drag-and-Drop and folder navigation.
         """
         popup = tk.Toplevel(self.root)
         popup.title("파일 복사")
-        popup.geometry("600x700")
+        popup.geometry("600x760")
         
         # Main container
         container = ttk.Frame(popup, padding="20")
@@ -420,7 +883,17 @@ class AdbGui:
         path_label = ttk.Label(path_control_frame, text=self.current_remote_path, font=("Consolas", 10, "bold"))
         path_label.pack(side=LEFT, fill=X, expand=YES)
         
-        def refresh_remote_list(path=None):
+        # Items shown in remote_listbox, row 0 being the parent folder entry
+        remote_items = []
+
+        def format_remote_item(item):
+            import datetime
+            prefix = "📁 " if item['type'] == 'dir' else "📄 "
+            modified = datetime.datetime.fromtimestamp(item['mtime']).strftime("%Y-%m-%d %H:%M") if item.get('mtime') else ""
+            size = "" if item['type'] == 'dir' else format_size(item.get('size', 0))
+            return f"{prefix}{item['name']:<30} {size:>9}  {modified}"
+
+        def refresh_remote_list(path=None, refresh=False):
             if path:
                 self.current_remote_path = path
             
@@ -430,21 +903,29 @@ class AdbGui:
             # Clear list
             remote_listbox.delete(0, tk.END)
             remote_listbox.insert(tk.END, ".. (상위 폴더)")
+            remote_items.clear()
+            requested_path = self.current_remote_path
+            device_id = self.selected_device_id
             
             def load_task():
                 try:
-                    items = self.manager.list_directories(self.selected_device_id, self.current_remote_path)
+                    # Cached listings return immediately; subfolders are listed ahead in the background
+                    items = self.manager.list_directories(device_id, requested_path,
+                                                          refresh=refresh, prefetch=True)
                     
                     def update_ui(items):
+                        if requested_path != self.current_remote_path:
+                            # The user already navigated elsewhere
+                            return
+                        remote_items.extend(items)
                         for item in items:
-                            prefix = "📁 " if item['type'] == 'dir' else "📄 "
-                            remote_listbox.insert(tk.END, f"{prefix}{item['name']}")
+                            remote_listbox.insert(tk.END, format_remote_item(item))
                             
                     popup.after(0, lambda: update_ui(items))
                 except Exception as e:
                     popup.after(0, lambda: messagebox.showerror("에러", f"목록 로딩 실패: {e}"))
             
-            threading.Thread(target=load_task).start()
+            self.scheduler.submit(load_task, device=device_id, name="폴더 목록", owner=popup)
             
         def create_folder():
             from tkinter import simpledialog
@@ -458,6 +939,8 @@ class AdbGui:
                     messagebox.showerror("에러", f"폴더 생성 실패: {e}")
 
         ttk.Button(path_control_frame, text="새 폴더", command=create_folder, bootstyle="outline-success", width=10).pack(side=RIGHT)
+        ttk.Button(path_control_frame, text="새로고침", command=lambda: refresh_remote_list(refresh=True),
+                   bootstyle="outline-secondary", width=8).pack(side=RIGHT, padx=(0, 5))
         
         # Remote directory list
         remote_list_frame = ttk.Frame(target_frame)
@@ -475,9 +958,7 @@ class AdbGui:
             selection = remote_listbox.curselection()
             if not selection: return
             
-            text = remote_listbox.get(selection[0])
-            
-            if text == ".. (상위 폴더)":
+            if selection[0] == 0:
                 # Move up
                 current = self.current_remote_path.rstrip('/')
                 parent = os.path.dirname(current)
@@ -487,9 +968,9 @@ class AdbGui:
                 refresh_remote_list(parent)
                 return
                 
-            if text.startswith("📁 "):
-                folder_name = text[2:].strip() # Remove icon
-                new_path = f"{self.current_remote_path.rstrip('/')}/{folder_name}/"
+            item = remote_items[selection[0] - 1] if selection[0] - 1 < len(remote_items) else None
+            if item and item['type'] == 'dir':
+                new_path = f"{self.current_remote_path.rstrip('/')}/{item['name']}/"
                 refresh_remote_list(new_path)
         
         remote_listbox.bind("<Double-Button-1>", on_remote_dbl_click)
@@ -535,40 +1016,135 @@ class AdbGui:
                 return
             
             total = len(self.selected_files)
-            success_count = 0
-            
+            files = list(self.selected_files)
+            device_id = self.selected_device_id
+            remote_path = self.current_remote_path
+            run_transfer(device_id, lambda progress: self.manager.push_files(
+                device_id, files, remote_path, sessions=get_sessions(),
+                progress=progress), files, lambda success_count: f"{success_count}/{total} 파일 복사 완료")
+
+        def get_sessions():
+            try:
+                return session_var.get()
+            except tk.TclError:
+                return 2
+
+        def run_transfer(device_id, push, files, done_message):
+            """Runs push(progress_callback) on the device's lane behind a progress popup."""
             progress_popup = tk.Toplevel(popup)
             progress_popup.title("전송 중...")
-            progress_popup.geometry("300x150")
+            progress_popup.geometry("360x170")
             
-            p_label = ttk.Label(progress_popup, text="준비 중...", anchor="center")
+            p_label = ttk.Label(progress_popup, text="준비 중...", anchor="center", justify="center")
             p_label.pack(pady=20)
             
-            p_bar = ttk.Progressbar(progress_popup, maximum=total, bootstyle="success-striped")
+            p_bar = ttk.Progressbar(progress_popup, maximum=1, bootstyle="success-striped")
             p_bar.pack(fill=X, padx=20)
             
+            def show_progress(snapshot):
+                # Byte-level progress over all files, plus transfer rate
+                p_bar.config(maximum=max(snapshot["total_bytes"], 1))
+                p_bar['value'] = snapshot["sent_bytes"]
+                current = os.path.basename(snapshot["current"]) if snapshot["current"] else ""
+                p_label.config(text=(
+                    f"복사 중 ({snapshot['files_done']}/{snapshot['files_total']}) "
+                    f"{snapshot['rate'] / (1024 * 1024):.1f} MB/s\n{current}"))
+
             def copy_task():
-                nonlocal success_count
-                for i, text in enumerate(self.selected_files):
-                    f_path = text
-                    
-                    p_label.config(text=f"복사 중 ({i+1}/{total}):\n{os.path.basename(f_path)}")
-                    p_bar['value'] = i
-                    
-                    try:
-                        self.manager.push_file(self.selected_device_id, f_path, self.current_remote_path)
-                        success_count += 1
-                    except Exception as e:
-                        print(f"Failed to copy {f_path}: {e}")
-                
-                p_bar['value'] = total
-                p_label.config(text="완료!")
-                progress_popup.after(1000, progress_popup.destroy)
-                popup.after(1000, lambda: messagebox.showinfo("완료", f"{success_count}/{total} 파일 복사 완료"))
+                try:
+                    results = push(lambda snap: progress_popup.after(0, lambda: show_progress(snap)))
+                except Exception as e:
+                    results = [{"local": f, "ok": False, "error": str(e)} for f in files]
+
+                success_count = sum(1 for r in results if r["ok"])
+                failed = [f"{os.path.basename(r['local'])}: {r['error']}" for r in results if not r["ok"]]
+                message = done_message(success_count)
+                if failed:
+                    shown = failed[:10]
+                    if len(failed) > len(shown):
+                        shown.append(f"... 외 {len(failed) - len(shown)}개")
+                    message += "\n\n실패한 파일:\n" + "\n".join(shown)
+
+                def done():
+                    p_bar['value'] = p_bar['maximum']
+                    p_label.config(text="완료!")
+                    progress_popup.after(1000, progress_popup.destroy)
+                    if failed:
+                        popup.after(1000, lambda: messagebox.showwarning("일부 실패", message, parent=popup))
+                    else:
+                        popup.after(1000, lambda: messagebox.showinfo("완료", message, parent=popup))
+                    # The push invalidated the cached listing of the target folder
+                    refresh_remote_list()
+
+                progress_popup.after(0, done)
                 
-            threading.Thread(target=copy_task).start()
+            self.scheduler.submit(copy_task, device=device_id, name="파일 복사")
+
+        def start_sync():
+            """Mirrors a local folder into the current device folder, pushing only changed files."""
+            from tkinter import filedialog
+            local_dir = filedialog.askdirectory(title="동기화할 폴더 선택", parent=popup)
+            if not local_dir:
+                return
+            remote_dir = f"{self.current_remote_path.rstrip('/')}/{os.path.basename(os.path.normpath(local_dir))}"
+            device_id = self.selected_device_id
+            checksum = checksum_var.get()
+            self.status_var.set("동기화 비교 중...")
 
-        ttk.Button(container, text="복사 시작", command=start_copy, bootstyle="success", width=20).pack(pady=10)
+            def plan_task():
+                try:
+                    plan = self.manager.sync_directory(device_id, local_dir, remote_dir,
+                                                       checksum=checksum, dry_run=True)["plan"]
+                    popup.after(0, lambda: review_plan(plan))
+                except Exception as e:
+                    message = f"동기화 비교 실패: {e}"
+                    popup.after(0, lambda: messagebox.showerror("에러", message))
+
+            def review_plan(plan):
+                self.status_var.set(f"동기화 비교 완료: {plan.summary()}")
+                review = tk.Toplevel(popup)
+                review.title("동기화 미리보기")
+                review.geometry("560x480")
+
+                report = tk.Text(review, wrap=tk.NONE, font=("Consolas", 10))
+                report.insert(tk.END, plan.report())
+                report.config(state=tk.DISABLED)
+                report.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+                def confirm():
+                    review.destroy()
+                    run_transfer(device_id, lambda progress: self.manager.apply_sync_plan(
+                        device_id, plan, sessions=get_sessions(), progress=progress),
+                        [local for local, _ in plan.pairs()],
+                        lambda success_count: f"{success_count}/{len(plan.transfers)} 파일 동기화 완료")
+
+                buttons = ttk.Frame(review)
+                buttons.pack(fill=X, padx=10, pady=(0, 10))
+                if plan.transfers:
+                    ttk.Button(buttons, text=f"동기화 ({len(plan.transfers)}개 전송)", command=confirm,
+                               bootstyle="success").pack(side=LEFT, expand=YES, fill=X, padx=5)
+                ttk.Button(buttons, text="닫기", command=review.destroy,
+                           bootstyle="secondary").pack(side=RIGHT, expand=YES, fill=X, padx=5)
+
+            self.scheduler.submit(plan_task, device=device_id, name="동기화 비교", owner=popup)
+
+        copy_frame = ttk.Frame(container)
+        copy_frame.pack(pady=10)
+
+        # Number of parallel sync sessions used for the transfer
+        session_var = tk.IntVar(value=2)
+        ttk.Label(copy_frame, text="동시 전송:", bootstyle="secondary").pack(side=LEFT, padx=(0, 5))
+        ttk.Spinbox(copy_frame, from_=1, to=8, textvariable=session_var, width=3).pack(side=LEFT, padx=(0, 10))
+        ttk.Button(copy_frame, text="복사 시작", command=start_copy, bootstyle="success", width=20).pack(side=LEFT)
+
+        # Folder sync: only files whose size/mtime (or MD5) differ are pushed
+        sync_frame = ttk.Frame(container)
+        sync_frame.pack(pady=(0, 10))
+        checksum_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(sync_frame, text="MD5 비교", variable=checksum_var,
+                        bootstyle="round-toggle").pack(side=LEFT, padx=(0, 10))
+        ttk.Button(sync_frame, text="폴더 동기화", command=start_sync, bootstyle="outline-success",
+                   width=20).pack(side=LEFT)
         
         # Initial load
         refresh_remote_list()
@@ -641,6 +1217,11 @@ class AdbGui:
         """
         Opens a popup window with a list of installed packages for deletion.
         """
+        from .search_index import PackageSearchIndex
+        from .virtual_list import VirtualList
+
+        # The popup stays on the device selected when it was opened
+        device_id = self.selected_device_id
         popup = tk.Toplevel(self.root)
         popup.title("앱 삭제")
         popup.geometry("500x600")
@@ -659,121 +1240,122 @@ class AdbGui:
         ttk.Label(search_frame, text="검색:", bootstyle="secondary").pack(side=LEFT, padx=(0, 5))
         search_entry.pack(side=LEFT, fill=X, expand=YES)
         
-        # Listbox with scrollbar
-        list_frame = ttk.Frame(popup)
-        list_frame.pack(fill=BOTH, expand=YES, padx=10, pady=10)
-        
-        scrollbar = ttk.Scrollbar(list_frame, bootstyle="secondary-round")
-        scrollbar.pack(side=RIGHT, fill=Y)
-        
-        listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, font=("Consolas", 10))
-        listbox.pack(side=LEFT, fill=BOTH, expand=YES)
-        scrollbar.config(command=listbox.yview)
+        def is_wjthinkbig(pkg):
+            return pkg.startswith("com.wjthinkbig") or pkg.startswith("air.com.wjthinkbig")
+
+        wj_only_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(search_frame, text="웅진 앱만", variable=wj_only_var,
+                        bootstyle="round-toggle").pack(side=RIGHT, padx=(5, 0))
+
+        # Model-backed list: only the visible rows exist as widget items
+        package_list = VirtualList(popup)
+        package_list.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+        index = PackageSearchIndex()
+        wj_ids = set()
+        visible_ids = []
+        refresh_pending = False
+        inventory = {}
         
         # Load packages
         self.status_var.set("패키지 목록 로딩 중...")
-        
-        def update_item_name(pkg, real_name):
-            # Find the item in listbox and update it
-            for i in range(listbox.size()):
-                item_text = listbox.get(i)
-                if f"({pkg})" in item_text:
-                    current_name = item_text.split(" (")[0]
-                    if current_name != real_name:
-                        new_text = f"{real_name} ({pkg})"
-                        listbox.delete(i)
-                        listbox.insert(i, new_text)
-                        # Update map
-                        self.package_map[new_text] = pkg
-                    break
-
-        def fetch_real_names(packages):
-            import concurrent.futures
-            
-            # Filter first to only fetch relevant apps
-            target_packages = [
-                pkg for pkg, _ in packages 
-                if pkg.startswith("com.wjthinkbig") or pkg.startswith("air.com.wjthinkbig")
-            ]
-            
-            def get_label(pkg):
-                real_name = self.manager.get_app_label(self.selected_device_id, pkg)
-                return pkg, real_name
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_pkg = {executor.submit(get_label, pkg): pkg for pkg in target_packages}
-                
-                count = 0
-                total = len(target_packages)
+        def apply_filter(*args, keep_position=False):
+            nonlocal visible_ids
+            visible_ids = index.search(search_var.get(), wj_ids if wj_only_var.get() else None)
+            package_list.set_model(len(visible_ids), lambda row: index.display_text(visible_ids[row]),
+                                   keep_position=keep_position)
+
+        def refresh_labels():
+            nonlocal refresh_pending
+            refresh_pending = False
+            # A new label can change what matches the current search
+            apply_filter(keep_position=True)
+
+        def update_item_name(pkg, real_name):
+            nonlocal refresh_pending
+            if index.set_label(pkg, real_name) and not refresh_pending:
+                # Coalesce label updates into one repaint
+                refresh_pending = True
+                popup.after(50, refresh_labels)
+
+        def fetch_labels(target_packages):
+            count = 0
+            total = len(target_packages)
+
+            def on_label(pkg, real_name):
+                nonlocal count
+                if real_name:
+                    # Update UI
+                    popup.after(0, lambda p=pkg, n=real_name: update_item_name(p, n))
                 
-                for future in concurrent.futures.as_completed(future_to_pkg):
-                    pkg, real_name = future.result()
-                    if real_name:
-                        # Update UI
-                        popup.after(0, lambda p=pkg, n=real_name: update_item_name(p, n))
-                    
-                    count += 1
-                    popup.after(0, lambda c=count, t=total: self.status_var.set(f"이름 로딩 중... ({c}/{t})"))
+                count += 1
+                popup.after(0, lambda c=count, t=total: self.status_var.set(f"이름 로딩 중... ({c}/{t})"))
+
+            # Unchanged packages come from the cache, the rest in a single shell round trip
+            self.manager.get_app_labels_cached(device_id, target_packages, callback=on_label,
+                                               inventory=inventory)
+
+            stats = self.manager.package_cache.stats()
+            popup.after(0, lambda: self.status_var.set(
+                f"총 {len(visible_ids)}개 패키지 (로딩 완료) | 캐시 적중 {stats['hits']} / 미스 {stats['misses']}"))
+
+        def fetch_real_names():
+            # wjthinkbig apps first; the rest only once the filter is turned off
+            fetch_labels([pkg for pkg, details in inventory.items() if is_wjthinkbig(pkg) and details["name"] is None])
+
+        fetched_all = False
 
-            popup.after(0, lambda: self.status_var.set(f"총 {len(target_packages)}개 패키지 (로딩 완료)"))
+        def on_filter_toggle(*args):
+            nonlocal fetched_all
+            apply_filter()
+            if not wj_only_var.get() and not fetched_all and len(index):
+                fetched_all = True
+                others = [pkg for pkg in index.packages if not is_wjthinkbig(pkg) and inventory[pkg]["name"] is None]
+                self.scheduler.submit(lambda: fetch_labels(others), device=device_id,
+                                      name="앱 이름 불러오기", owner=popup)
 
         def populate_list(packages):
-            # Create a mapping of display text to package name
-            self.package_map = {}
-            listbox.delete(0, tk.END)
+            for pkg, app_name in packages:
+                entry_id = index.add(pkg, app_name)
+                if is_wjthinkbig(pkg):
+                    wj_ids.add(entry_id)
+            apply_filter()
             
-            # Filter packages to show only wjthinkbig apps
-            filtered_packages = [
-                (pkg, app_name) for pkg, app_name in packages 
-                if pkg.startswith("com.wjthinkbig") or pkg.startswith("air.com.wjthinkbig")
-            ]
-            
-            for pkg, app_name in filtered_packages:
-                # Format: "AppName (com.example.myapp)"
-                display_text = f"{app_name} ({pkg})"
-                self.package_map[display_text] = pkg
-                listbox.insert(tk.END, display_text)
-            
-            self.status_var.set(f"총 {len(filtered_packages)}개 패키지 (이름 불러오는 중...)")
+            self.status_var.set(f"총 {len(visible_ids)}개 패키지 (이름 불러오는 중...)")
             
             # Search filter
-            def filter_packages(*args):
-                search_text = search_var.get().lower()
-                listbox.delete(0, tk.END)
-                for display_text, pkg in self.package_map.items():
-                    if search_text in display_text.lower():
-                        listbox.insert(tk.END, display_text)
-            
-            search_var.trace('w', filter_packages)
+            search_var.trace('w', apply_filter)
+            wj_only_var.trace('w', on_filter_toggle)
 
         def load_packages():
             try:
-                # 1. Get package list first (fast)
-                packages = self.manager.get_installed_packages(self.selected_device_id)
+                # 1. Every package with its version and paths in one dumpsys pass;
+                # names cached for the same build are already filled in
+                inventory.update(self.manager.get_package_inventory(device_id))
+                # Other packages show their last known name; it is revalidated in the background
+                cached_labels = self.manager.package_cache.peek_labels(device_id)
+                packages = sorted(((pkg, details["name"] or cached_labels.get(pkg) or pkg.split('.')[-1])
+                                   for pkg, details in inventory.items()), key=lambda item: item[1].lower())
                 popup.after(0, lambda: populate_list(packages))
-                
-                # 2. Fetch real app names in background
-                threading.Thread(target=lambda: fetch_real_names(packages), daemon=True).start()
+
+                # 2. Fetch the missing app names in background
+                self.scheduler.submit(fetch_real_names, device=device_id,
+                                      name="앱 이름 불러오기", owner=popup)
                 
             except Exception as e:
                 popup.after(0, lambda: messagebox.showerror("에러", f"패키지 목록 로딩 실패: {e}"))
                 popup.after(0, popup.destroy)
         
         # Delete button
-        def show_app_details():
-            selection = listbox.curselection()
-            if not selection:
-                messagebox.showwarning("경고", "앱을 선택해주세요.")
-                return
-            
-            display_text = listbox.get(selection[0])
-            package = self.package_map.get(display_text, display_text)
+        def show_app_details(row):
+            package = index.packages[visible_ids[row]]
             
             # Open app details popup
-            self.show_app_detail_popup(package, popup)
+            self.show_app_detail_popup(package, popup, device_id)
         
         # Bind double-click to show details
-        listbox.bind("<Double-Button-1>", lambda e: show_app_details())
+        package_list.bind_activate(show_app_details)
         
         btn_frame = ttk.Frame(popup)
         btn_frame.pack(fill=X, padx=10, pady=10)
@@ -781,11 +1363,11 @@ class AdbGui:
         ttk.Button(btn_frame, text="닫기", command=popup.destroy, bootstyle="secondary").pack(expand=YES, fill=X, padx=5)
         
         # Start loading in background
-        threading.Thread(target=load_packages).start()
+        self.scheduler.submit(load_packages, device=device_id, name="패키지 목록", owner=popup)
 
-    def show_app_detail_popup(self, package_name, parent_popup):
+    def show_app_detail_popup(self, package_name, parent_popup, device_id):
         """
-        Shows detailed information about an app with delete option.
+        Shows detailed information about an app on the given device with delete option.
         """
         detail_popup = tk.Toplevel(self.root)
         detail_popup.title("앱 상세 정보")
@@ -807,15 +1389,11 @@ class AdbGui:
         scrollbar.pack(side=RIGHT, fill=Y)
         text_widget.config(yscrollcommand=scrollbar.set)
         
-        # Load app details in background
-        def load_details():
-            try:
-                details = self.manager.get_app_details(self.selected_device_id, package_name)
-                detail_popup.after(0, lambda: display_details(details))
-            except Exception as e:
-                detail_popup.after(0, lambda: messagebox.showerror("에러", f"앱 정보 로딩 실패: {e}"))
-                detail_popup.after(0, detail_popup.destroy)
-        
+        # Load app details in background (cancelled if the popup is closed first)
+        def load_failed(error):
+            messagebox.showerror("에러", f"앱 정보 로딩 실패: {error}")
+            detail_popup.destroy()
+
         def display_details(details):
             title_label.config(text=details.get("name", "알 수 없음"))
             
@@ -845,16 +1423,15 @@ APK 경로: {details.get('apk_path', 'N/A')}
             if messagebox.askyesno("확인", f"다음 앱을 삭제하시겠습니까?\n\n{package_name}"):
                 detail_popup.destroy()
                 parent_popup.destroy()
+
+                if self.fleet_mode_var.get():
+                    self.run_fleet_action(10, package=package_name)
+                    return
+
                 self.status_var.set(f"삭제 중: {package_name}")
-                
-                def task():
-                    try:
-                        result = self.manager.execute_action(10, self.selected_device_id, package=package_name)
-                        self.root.after(0, lambda: self.handle_result(result))
-                    except Exception as e:
-                        self.root.after(0, lambda: self.handle_error(str(e)))
-                
-                threading.Thread(target=task).start()
+                self.scheduler.submit(lambda: self.manager.execute_action(10, device_id, package=package_name),
+                                      device=device_id, name=f"삭제: {package_name}",
+                                      on_done=self.handle_result, on_error=lambda e: self.handle_error(str(e)))
         
         btn_frame = ttk.Frame(detail_popup)
         btn_frame.pack(fill=X, padx=10, pady=10)
@@ -863,7 +1440,609 @@ APK 경로: {details.get('apk_path', 'N/A')}
         ttk.Button(btn_frame, text="닫기", command=detail_popup.destroy, bootstyle="secondary").pack(side=RIGHT, expand=YES, fill=X, padx=5)
         
         # Start loading
-        threading.Thread(target=load_details).start()
+        self.scheduler.submit(lambda: self.manager.get_app_details(device_id, package_name), device=device_id,
+                              name="앱 정보", on_done=display_details, on_error=load_failed, owner=detail_popup)
+
+    def _schedule_task_status(self):
+        # Called from worker threads; several changes in a row repaint once
+        if not self._task_status_pending:
+            self._task_status_pending = True
+            self.root.after(100, self._update_task_status)
+
+    def _update_task_status(self):
+        self._task_status_pending = False
+        tasks = self.scheduler.snapshot()
+        running, queued = len(tasks["running"]), len(tasks["queued"])
+        self.task_status_var.set(f"작업: 실행 {running} · 대기 {queued}" if running or queued else "작업 없음")
+
+    def open_task_queue_popup(self):
+        """
+        Lists the running and queued background tasks; queued (or running)
+        tasks can be cancelled from here.
+        """
+        popup = tk.Toplevel(self.root)
+        popup.title("작업 대기열")
+        popup.geometry("600x350")
+
+        columns = ("state", "name", "device", "seconds")
+        table = ttk.Treeview(popup, columns=columns, show="headings", bootstyle="info")
+        for column, heading, width in [("state", "상태", 60), ("name", "작업", 200),
+                                       ("device", "디바이스", 220), ("seconds", "경과(초)", 70)]:
+            table.heading(column, text=heading)
+            table.column(column, width=width, anchor="e" if column == "seconds" else "w")
+        table.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+        def redraw():
+            tasks = self.scheduler.snapshot()
+            selected = set(table.selection())
+            table.delete(*table.get_children())
+            for state, entries in [("실행", tasks["running"]), ("대기", tasks["queued"])]:
+                for task in entries:
+                    device = self.manager.describe_device(task["device"]) if task["device"] else "-"
+                    iid = str(task["id"])
+                    table.insert("", tk.END, iid=iid, values=(state, task["name"], device, f"{task['seconds']:.1f}"))
+                    if iid in selected:
+                        table.selection_add(iid)
+
+        def refresh():
+            if not popup.winfo_exists():
+                return
+            redraw()
+            popup.after(500, refresh)
+
+        def cancel_selected():
+            for iid in table.selection():
+                task = self.scheduler.find(int(iid))
+                if task is not None:
+                    self.scheduler.cancel(task)
+            redraw()
+
+        def cancel_queued():
+            for entry in self.scheduler.snapshot()["queued"]:
+                task = self.scheduler.find(entry["id"])
+                if task is not None:
+                    self.scheduler.cancel(task)
+            redraw()
+
+        btn_frame = ttk.Frame(popup)
+        btn_frame.pack(fill=X, padx=10, pady=(0, 10))
+        ttk.Button(btn_frame, text="선택 작업 취소", command=cancel_selected, bootstyle="warning").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="대기 작업 모두 취소", command=cancel_queued, bootstyle="danger").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="닫기", command=popup.destroy, bootstyle="secondary").pack(side=RIGHT, padx=5)
+
+        refresh()
+
+    def open_diagnostics_popup(self):
+        """
+        Shows rolling latency statistics per command/action and exports the
+        recorded spans as a Chrome trace (chrome://tracing, Perfetto).
+        """
+        from tkinter import filedialog
+        import datetime
+
+        popup = tk.Toplevel(self.root)
+        popup.title("진단 - 명령 지연 시간")
+        popup.geometry("800x500")
+
+        table_frame = ttk.Frame(popup)
+        table_frame.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+        columns = ("name", "count", "errors", "p50", "p95", "p99", "max")
+        table = ttk.Treeview(table_frame, columns=columns, show="headings", bootstyle="info")
+        for column, heading, width in [("name", "항목", 260), ("count", "횟수", 60), ("errors", "실패", 50),
+                                       ("p50", "p50(ms)", 80), ("p95", "p95(ms)", 80),
+                                       ("p99", "p99(ms)", 80), ("max", "최대(ms)", 80)]:
+            table.heading(column, text=heading)
+            table.column(column, width=width, anchor="w" if column == "name" else "e")
+        scrollbar = ttk.Scrollbar(table_frame, command=table.yview, bootstyle="secondary-round")
+        table.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        table.pack(side=LEFT, fill=BOTH, expand=YES)
+
+        summary_var = tk.StringVar()
+        ttk.Label(popup, textvariable=summary_var, bootstyle="secondary").pack(fill=X, padx=10)
+
+        def redraw():
+            rows = tracer.summary()
+            table.delete(*table.get_children())
+            for row in rows:
+                table.insert("", tk.END, values=(
+                    row["name"], row["count"], row["errors"], f"{row['p50_ms']:.1f}",
+                    f"{row['p95_ms']:.1f}", f"{row['p99_ms']:.1f}", f"{row['max_ms']:.1f}"))
+            sessions = self.manager.shell_sessions.report()
+            summary_var.set(f"기록된 구간 {len(tracer.events)}개 (최근 {tracer.window}개 기준 통계)"
+                            f" / {self.startup_report()}"
+                            f" / 셸 세션: 재사용 {sessions['reused']}회, 새로 연결 {sessions['opened']}회,"
+                            f" 재시작 {sessions['restarted']}회, 실패 {sessions['failed']}회"
+                            f" / 중복 요청 합침 {self.manager.single_flight.stats()['total']['shared']}회")
+
+        def refresh():
+            if not popup.winfo_exists():
+                return
+            redraw()
+            popup.after(1000, refresh)
+
+        def export_trace():
+            default_name = f"adb_tool_trace_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            path = filedialog.asksaveasfilename(parent=popup, defaultextension=".json", initialfile=default_name,
+                                                filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")],
+                                                title="트레이스 저장 위치 선택")
+            if not path:
+                return
+            try:
+                count = tracer.export_chrome_trace(path)
+            except OSError as e:
+                messagebox.showerror("에러", f"트레이스 저장 실패: {e}", parent=popup)
+                return
+            self.status_var.set(f"트레이스 저장 완료: {path} ({count}개 구간)")
+
+        def clear():
+            tracer.clear()
+            redraw()
+
+        btn_frame = ttk.Frame(popup)
+        btn_frame.pack(fill=X, padx=10, pady=10)
+        ttk.Button(btn_frame, text="트레이스 내보내기", command=export_trace, bootstyle="primary").pack(side=LEFT, expand=YES, fill=X, padx=5)
+        ttk.Button(btn_frame, text="초기화", command=clear, bootstyle="warning").pack(side=LEFT, expand=YES, fill=X, padx=5)
+        ttk.Button(btn_frame, text="닫기", command=popup.destroy, bootstyle="secondary").pack(side=LEFT, expand=YES, fill=X, padx=5)
+
+        refresh()
+
+    def open_log_search_popup(self):
+        """
+        Opens a search window over saved/captured logcat files using their sidecar indexes.
+        """
+        from tkinter import filedialog
+        from . import log_index
+
+        popup = tk.Toplevel(self.root)
+        popup.title("로그 검색")
+        popup.geometry("800x600")
+
+        # Folder selection
+        folder_frame = ttk.Frame(popup, padding="10")
+        folder_frame.pack(fill=X)
+
+        folder_var = tk.StringVar(value=os.getcwd())
+        ttk.Label(folder_frame, text="폴더:", bootstyle="secondary").pack(side=LEFT, padx=(0, 5))
+        ttk.Entry(folder_frame, textvariable=folder_var, bootstyle="secondary").pack(side=LEFT, fill=X, expand=YES)
+
+        device_var = tk.StringVar(value="전체")
+        device_combo = ttk.Combobox(folder_frame, textvariable=device_var, state="readonly", width=18, bootstyle="secondary")
+
+        def refresh_devices():
+            files = log_index.find_log_files(folder_var.get())
+            serials = sorted({log_index.device_from_path(f) for f in files} - {None})
+            device_combo['values'] = ["전체"] + serials
+            status_label.config(text=f"로그 파일 {len(files)}개")
+
+        def browse_folder():
+            folder = filedialog.askdirectory(title="로그 폴더 선택", parent=popup)
+            if folder:
+                folder_var.set(folder)
+                refresh_devices()
+
+        ttk.Button(folder_frame, text="찾아보기", command=browse_folder, bootstyle="outline-secondary").pack(side=LEFT, padx=5)
+        device_combo.pack(side=LEFT)
+
+        # Query fields
+        query_frame = ttk.Frame(popup, padding=(10, 0))
+        query_frame.pack(fill=X)
+
+        tag_var = tk.StringVar()
+        start_var = tk.StringVar()
+        end_var = tk.StringVar()
+        priority_var = tk.StringVar(value="V")
+        for label, var, width in [("태그:", tag_var, 16), ("시작 (HH:MM):", start_var, 12), ("종료 (HH:MM):", end_var, 12)]:
+            ttk.Label(query_frame, text=label, bootstyle="secondary").pack(side=LEFT, padx=(0, 5))
+            ttk.Entry(query_frame, textvariable=var, width=width, bootstyle="secondary").pack(side=LEFT, padx=(0, 10))
+        ttk.Label(query_frame, text="레벨:", bootstyle="secondary").pack(side=LEFT, padx=(0, 5))
+        ttk.Combobox(query_frame, textvariable=priority_var, values=list(log_index.PRIORITIES), width=3,
+                     state="readonly", bootstyle="secondary").pack(side=LEFT)
+
+        # Results
+        result_frame = ttk.Frame(popup, padding="10")
+        result_frame.pack(fill=BOTH, expand=YES)
+        result_text = tk.Text(result_frame, wrap=tk.NONE, font=("Consolas", 9))
+        result_scrollbar = ttk.Scrollbar(result_frame, command=result_text.yview, bootstyle="secondary-round")
+        result_text.config(yscrollcommand=result_scrollbar.set)
+        result_scrollbar.pack(side=RIGHT, fill=Y)
+        result_text.pack(side=LEFT, fill=BOTH, expand=YES)
+
+        status_label = ttk.Label(popup, text="", bootstyle="secondary", padding=(10, 0))
+        status_label.pack(fill=X)
+
+        def search():
+            device = device_var.get()
+            filters = {
+                "device": None if device in ("", "전체") else device,
+                "tag": tag_var.get().strip() or None,
+                "start": start_var.get().strip() or None,
+                "end": end_var.get().strip() or None,
+                "min_priority": priority_var.get() if priority_var.get() != "V" else None,
+            }
+            files = log_index.find_log_files(folder_var.get())
+            status_label.config(text=f"검색 중... (파일 {len(files)}개, 처음엔 인덱스를 생성합니다)")
+
+            def task():
+                import time
+                started = time.perf_counter()
+                try:
+                    lines, stats = log_index.search_logs(files, limit=5000, **filters)
+                except ValueError as e:
+                    message = str(e)
+                    popup.after(0, lambda: messagebox.showerror("에러", message, parent=popup))
+                    return
+                elapsed = time.perf_counter() - started
+
+                def show():
+                    result_text.delete("1.0", tk.END)
+                    result_text.insert(tk.END, "\n".join(line for _, line in lines))
+                    status_label.config(text=(
+                        f"{len(lines)}줄 | 파일 {stats['files']}개 | 블록 {stats['blocks_read']}/{stats['blocks_total']} 읽음 | "
+                        f"{elapsed * 1000:.0f}ms"))
+
+                popup.after(0, show)
+
+            threading.Thread(target=task, daemon=True).start()
+
+        ttk.Button(query_frame, text="검색", command=search, bootstyle="info").pack(side=RIGHT)
+        refresh_devices()
+
+    def open_telemetry_popup(self):
+        """
+        Live battery/temperature/memory/CPU charts of every connected device.
+        Sampling keeps running when the window is closed; it can be recorded
+        to a CSV or SQLite file for soak tests.
+        """
+        import math
+        from tkinter import filedialog
+        from .charts import PALETTE, TimeSeriesChart
+        from .telemetry import FIELDS, TelemetrySampler, open_sink
+
+        if self.telemetry is None:
+            self.telemetry = TelemetrySampler(
+                self.manager, device_ids=lambda: [device_id for device_id, _ in self.current_devices])
+        sampler = self.telemetry
+
+        popup = tk.Toplevel(self.root)
+        popup.title("모니터링 - 배터리 / 온도 / 메모리 / CPU")
+        popup.geometry("760x860")
+
+        # Controls
+        control_frame = ttk.Frame(popup, padding="10")
+        control_frame.pack(fill=X)
+
+        ttk.Label(control_frame, text="주기(초):", bootstyle="secondary").pack(side=LEFT, padx=(0, 5))
+        interval_var = tk.StringVar(value=f"{sampler.interval:g}")
+        interval_combo = ttk.Combobox(control_frame, textvariable=interval_var, values=["1", "2", "5", "10", "30", "60"],
+                                      width=5, state="readonly", bootstyle="secondary")
+        interval_combo.pack(side=LEFT, padx=(0, 10))
+        interval_combo.bind("<<ComboboxSelected>>", lambda e: setattr(sampler, "interval", float(interval_var.get())))
+
+        def toggle_sampling():
+            if sampler.running:
+                sampler.stop()
+            else:
+                sampler.interval = float(interval_var.get())
+                sampler.start()
+            update_controls()
+
+        def toggle_recording():
+            if sampler.sink is not None:
+                sampler.set_sink(None)
+                record_var.set("")
+            else:
+                path = filedialog.asksaveasfilename(
+                    parent=popup, title="기록 파일 선택", defaultextension=".csv",
+                    filetypes=[("CSV", "*.csv"), ("SQLite", "*.db"), ("All files", "*.*")])
+                if not path:
+                    return
+                try:
+                    sampler.set_sink(open_sink(path))
+                except Exception as e:
+                    messagebox.showerror("에러", f"기록 파일을 열 수 없습니다: {e}", parent=popup)
+                    return
+                record_var.set(f"기록 중: {path}")
+            update_controls()
+
+        run_btn = ttk.Button(control_frame, command=toggle_sampling, width=10)
+        run_btn.pack(side=LEFT, padx=5)
+        record_btn = ttk.Button(control_frame, command=toggle_recording, width=10)
+        record_btn.pack(side=LEFT, padx=5)
+        record_var = tk.StringVar(value="기록 중" if sampler.sink else "")
+        ttk.Label(popup, textvariable=record_var, bootstyle="secondary", padding=(10, 0)).pack(fill=X)
+
+        def update_controls():
+            run_btn.config(text="중지" if sampler.running else "시작",
+                           bootstyle="warning" if sampler.running else "success")
+            record_btn.config(text="기록 중지" if sampler.sink else "파일로 기록",
+                              bootstyle="outline-warning" if sampler.sink else "outline-primary")
+
+        # Charts, one per metric
+        chart_specs = {
+            "battery_level": ("배터리 (%)", "%", (0, 100)),
+            "battery_temp": ("배터리 온도 (°C)", "°", None),
+            "mem_used": ("메모리 사용 (%)", "%", (0, 100)),
+            "cpu": ("CPU 사용 (%)", "%", (0, 100)),
+        }
+        charts = {}
+        for field in FIELDS:
+            title, unit, y_range = chart_specs[field]
+            charts[field] = TimeSeriesChart(popup, title, unit=unit, y_range=y_range, window=600)
+            charts[field].pack(fill=X, padx=10, pady=4)
+
+        # Latest values per device; the row color matches the chart lines
+        columns = ("device",) + FIELDS
+        table = ttk.Treeview(popup, columns=columns, show="headings", height=6, bootstyle="info")
+        for column, heading, width in [("device", "디바이스", 280), ("battery_level", "배터리", 90),
+                                       ("battery_temp", "온도", 90), ("mem_used", "메모리", 90), ("cpu", "CPU", 90)]:
+            table.heading(column, text=heading)
+            table.column(column, width=width, anchor="w" if column == "device" else "e")
+        table.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+
+        colors = {}
+        last_tick = [-1]
+
+        def format_value(value, unit):
+            return "-" if math.isnan(value) else f"{value:.1f}{unit}"
+
+        def redraw():
+            serials = sorted(sampler.buffers)
+            for serial in serials:
+                if serial not in colors:
+                    colors[serial] = PALETTE[len(colors) % len(PALETTE)]
+                    table.tag_configure(serial, foreground=colors[serial])
+            for field, chart in charts.items():
+                chart.set_series(sampler.snapshot(field), colors)
+            table.delete(*table.get_children())
+            for serial in serials:
+                latest = sampler.buffers[serial].latest() or {}
+                table.insert("", tk.END, tags=(serial,), values=[self.manager.describe_device(serial)] + [
+                    format_value(latest.get(field, float("nan")), chart_specs[field][1]) for field in FIELDS])
+
+        def refresh():
+            if not popup.winfo_exists():
+                return
+            if sampler.ticks != last_tick[0]:
+                last_tick[0] = sampler.ticks
+                redraw()
+            update_controls()
+            popup.after(500, refresh)
+
+        if not sampler.running:
+            sampler.start()
+        refresh()
+
+    INVENTORY_STATE_MARKS = {"changed": "≠ ", "extra": "+ ", "unknown": "? "}
+
+    def open_inventory_popup(self):
+        """
+        Package x device matrix of every connected device. Each collection is
+        stored as a snapshot; the matrix can be compared against a reference
+        device or an older snapshot and exported to CSV.
+        """
+        import datetime
+        from tkinter import filedialog
+        from . import fleet_inventory
+        from .fleet_inventory import MISSING, SAME, SnapshotStore
+
+        store = SnapshotStore()
+        state = {"snapshot": None, "compare": {}, "snapshots": []}
+
+        popup = tk.Toplevel(self.root)
+        popup.title("앱 현황 - 패키지 × 디바이스")
+        popup.geometry("1000x600")
+
+        control_frame = ttk.Frame(popup, padding="10")
+        control_frame.pack(fill=X)
+        collect_btn = ttk.Button(control_frame, text="지금 수집", bootstyle="success")
+        collect_btn.pack(side=LEFT, padx=(0, 10))
+        ttk.Label(control_frame, text="스냅샷:", bootstyle="secondary").pack(side=LEFT)
+        snapshot_var = tk.StringVar()
+        snapshot_combo = ttk.Combobox(control_frame, textvariable=snapshot_var, width=28, state="readonly",
+                                      bootstyle="secondary")
+        snapshot_combo.pack(side=LEFT, padx=5)
+        ttk.Label(control_frame, text="비교:", bootstyle="secondary").pack(side=LEFT, padx=(10, 0))
+        compare_var = tk.StringVar(value="비교 안 함")
+        compare_combo = ttk.Combobox(control_frame, textvariable=compare_var, width=36, state="readonly",
+                                     bootstyle="secondary")
+        compare_combo.pack(side=LEFT, padx=5)
+        ttk.Button(control_frame, text="CSV 내보내기", bootstyle="outline-primary",
+                   command=lambda: export()).pack(side=RIGHT)
+
+        filter_frame = ttk.Frame(popup, padding=(10, 0))
+        filter_frame.pack(fill=X)
+        ttk.Label(filter_frame, text="패키지 필터:", bootstyle="secondary").pack(side=LEFT)
+        filter_var = tk.StringVar()
+        ttk.Entry(filter_frame, textvariable=filter_var, width=30).pack(side=LEFT, padx=5)
+        diff_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_frame, text="차이 있는 패키지만", variable=diff_only_var,
+                        bootstyle="round-toggle", command=lambda: render()).pack(side=LEFT, padx=10)
+        filter_var.trace_add("write", lambda *args: render())
+
+        table_frame = ttk.Frame(popup)
+        table_frame.pack(fill=BOTH, expand=YES, padx=10, pady=10)
+        table_holder = [None]
+        info_var = tk.StringVar(value="저장된 스냅샷을 불러오는 중...")
+        ttk.Label(popup, textvariable=info_var, bootstyle="secondary", padding=(10, 0, 10, 10)).pack(fill=X)
+
+        def snapshot_title(entry):
+            created = datetime.datetime.fromtimestamp(entry["created"]).strftime("%Y-%m-%d %H:%M:%S")
+            return f"#{entry['id']} {created} ({entry['devices']}대)"
+
+        def visible_packages():
+            snapshot = state["snapshot"]
+            packages = fleet_inventory.packages_of(snapshot, filter_var.get().strip())
+            if diff_only_var.get() and state["compare"]:
+                differing = fleet_inventory.differing_packages(state["compare"])
+                packages = [package for package in packages if package in differing]
+            return packages
+
+        def cell_text(serial, package):
+            version = state["snapshot"]["devices"].get(serial, {}).get(package)
+            cell_state = state["compare"].get((serial, package), SAME)
+            if cell_state == MISSING:
+                return "✗ 없음"
+            text = fleet_inventory.format_version(version) or "-"
+            return self.INVENTORY_STATE_MARKS.get(cell_state, "") + text
+
+        def render():
+            snapshot = state["snapshot"]
+            if snapshot is None or not popup.winfo_exists():
+                return
+            if table_holder[0] is not None:
+                table_holder[0].master.destroy()
+            serials = sorted(snapshot["devices"])
+            frame = ttk.Frame(table_frame)
+            frame.pack(fill=BOTH, expand=YES)
+            table = ttk.Treeview(frame, columns=["package"] + serials, show="headings", bootstyle="info")
+            table.heading("package", text="패키지")
+            table.column("package", width=260, anchor="w", stretch=False)
+            for serial in serials:
+                table.heading(serial, text=snapshot["labels"].get(serial, serial))
+                table.column(serial, width=170, anchor="center", stretch=False)
+            table.tag_configure("diff", foreground="#ff8800")
+            y_scroll = ttk.Scrollbar(frame, command=table.yview, bootstyle="secondary-round")
+            x_scroll = ttk.Scrollbar(frame, orient=HORIZONTAL, command=table.xview, bootstyle="secondary-round")
+            table.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+            x_scroll.pack(side=BOTTOM, fill=X)
+            y_scroll.pack(side=RIGHT, fill=Y)
+            table.pack(side=LEFT, fill=BOTH, expand=YES)
+            table_holder[0] = table
+
+            packages = visible_packages()
+            for package in packages:
+                differs = any(state["compare"].get((serial, package), SAME) != SAME for serial in serials)
+                table.insert("", tk.END, tags=("diff",) if differs else (),
+                             values=[package] + [cell_text(serial, package) for serial in serials])
+            errors = "".join(f"\n⚠ {serial}: {error}" for serial, error in snapshot["errors"].items())
+            info_var.set(f"패키지 {len(packages)}개 / 디바이스 {len(serials)}대"
+                         f"  (≠ 다른 버전, ✗ 없음, + 추가됨, ? 비교 대상 없음){errors}")
+
+        def update_compare_choices():
+            snapshot = state["snapshot"]
+            choices = ["비교 안 함"]
+            choices += [f"기기: {snapshot['labels'].get(serial, serial)}" for serial in sorted(snapshot["devices"])]
+            choices += [f"스냅샷: {snapshot_title(entry)}" for entry in state["snapshots"]
+                        if entry["id"] != snapshot.get("id")]
+            compare_combo.config(values=choices)
+            if compare_var.get() not in choices:
+                compare_var.set("비교 안 함")
+
+        def apply_compare(event=None):
+            snapshot = state["snapshot"]
+            choice = compare_var.get()
+            if choice.startswith("기기: "):
+                state["compare"] = fleet_inventory.diff_against_device(snapshot, choice.split()[1])
+                render()
+            elif choice.startswith("스냅샷: "):
+                snapshot_id = int(choice.split()[1].lstrip("#"))
+
+                def task():
+                    old = store.load(snapshot_id)
+
+                    def show():
+                        if old is not None and state["snapshot"] is snapshot:
+                            state["compare"] = fleet_inventory.diff_snapshots(old, snapshot)
+                            render()
+
+                    self.root.after(0, show)
+
+                threading.Thread(target=task, daemon=True).start()
+            else:
+                state["compare"] = {}
+                render()
+
+        def show_snapshot(snapshot):
+            if not popup.winfo_exists():
+                return
+            state["snapshot"] = snapshot
+            state["compare"] = {}
+            update_compare_choices()
+            apply_compare()
+
+        def load_snapshot_list(select_id=None):
+            def task():
+                snapshots = store.list()
+                snapshot = store.load(select_id or snapshots[0]["id"]) if snapshots else None
+
+                def show():
+                    if not popup.winfo_exists():
+                        return
+                    state["snapshots"] = snapshots
+                    snapshot_combo.config(values=[snapshot_title(entry) for entry in snapshots])
+                    if snapshot is None:
+                        info_var.set("저장된 스냅샷이 없습니다. '지금 수집'을 눌러 주세요.")
+                        return
+                    snapshot_var.set(next(snapshot_title(entry) for entry in snapshots
+                                          if entry["id"] == snapshot["id"]))
+                    show_snapshot(snapshot)
+
+                self.root.after(0, show)
+
+            threading.Thread(target=task, daemon=True).start()
+
+        def select_snapshot(event=None):
+            snapshot_id = int(snapshot_var.get().split()[0].lstrip("#"))
+
+            def task():
+                snapshot = store.load(snapshot_id)
+                if snapshot is not None:
+                    self.root.after(0, lambda: show_snapshot(snapshot))
+
+            threading.Thread(target=task, daemon=True).start()
+
+        def collect_now():
+            device_ids = [dev_id for dev_id, _ in self.current_devices]
+            if not device_ids:
+                messagebox.showwarning("경고", "연결된 디바이스가 없습니다.", parent=popup)
+                return
+            collect_btn.config(state=DISABLED)
+            info_var.set(f"{len(device_ids)}대에서 패키지 목록을 수집하는 중...")
+            self.status_var.set("앱 현황 수집 중...")
+
+            def task():
+                try:
+                    snapshot = fleet_inventory.collect(self.manager, device_ids)
+                    snapshot_id = store.save(snapshot)
+                except Exception as e:
+                    message = str(e)
+                    self.root.after(0, lambda: self.handle_error(message))
+                    self.root.after(0, lambda: collect_btn.winfo_exists() and collect_btn.config(state=NORMAL))
+                    return
+
+                def done():
+                    self.status_var.set(f"앱 현황 수집 완료: {len(snapshot['devices'])}대")
+                    if collect_btn.winfo_exists():
+                        collect_btn.config(state=NORMAL)
+                        load_snapshot_list(snapshot_id)
+
+                self.root.after(0, done)
+
+            self.scheduler.submit(task, name="앱 현황 수집", owner=popup)
+
+        def export():
+            snapshot = state["snapshot"]
+            if snapshot is None:
+                return
+            path = filedialog.asksaveasfilename(
+                parent=popup, title="CSV로 내보내기", defaultextension=".csv",
+                initialfile=f"app_inventory_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                filetypes=[("CSV", "*.csv"), ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                fleet_inventory.export_csv(path, snapshot, packages=visible_packages(), states=state["compare"])
+            except OSError as e:
+                messagebox.showerror("에러", f"파일을 저장할 수 없습니다: {e}", parent=popup)
+                return
+            self.status_var.set(f"앱 현황 저장됨: {path}")
+
+        collect_btn.config(command=collect_now)
+        snapshot_combo.bind("<<ComboboxSelected>>", select_snapshot)
+        compare_combo.bind("<<ComboboxSelected>>", apply_compare)
+        load_snapshot_list()
 
     def show_help(self):
         """
@@ -0,0 +1,316 @@
+import glob
+import json
+import mmap
+import os
+import re
+import zlib
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+PRIORITIES = "VDIWEFS"
+
+# 'logcat -v threadtime': "MM-DD HH:MM:SS.mmm  PID  TID P TAG     : message"
+THREADTIME_RE = re.compile(
+    rb"^(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)\.(\d{3})\s+(\d+)\s+(\d+) ([VDIWEFS]) (.*?)\s*: ")
+DEVICE_FROM_NAME_RE = re.compile(r"^logcat_(.+?)_\d{8}_\d{6}")
+TIME_QUERY_RE = re.compile(r"^(?:(\d\d)-(\d\d) )?(\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,3}))?)?$")
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def time_key(month, day, hour, minute, second, millis):
+    """Encodes a logcat timestamp (no year) as a sortable integer."""
+    return (month * 32 + day) * DAY_MS + ((hour * 60 + minute) * 60 + second) * 1000 + millis
+
+
+def parse_time_query(text, end=False):
+    """
+    Parses 'HH:MM[:SS[.mmm]]' or 'MM-DD HH:MM[:SS[.mmm]]'.
+    Returns (day_key or None, millis_of_day). With end=True a missing seconds
+    part covers the whole minute.
+    """
+    match = TIME_QUERY_RE.match(text.strip())
+    if not match:
+        raise ValueError(f"Invalid time: {text!r} (expected HH:MM[:SS] or MM-DD HH:MM[:SS])")
+    month, day, hour, minute, second, millis = match.groups()
+    if second is None:
+        second_value, millis_value = (59, 999) if end else (0, 0)
+    else:
+        second_value = int(second)
+        millis_value = int(millis.ljust(3, "0")) if millis else (999 if end else 0)
+    millis_of_day = ((int(hour) * 60 + int(minute)) * 60 + second_value) * 1000 + millis_value
+    day_key = int(month) * 32 + int(day) if month else None
+    return day_key, millis_of_day
+
+
+def parse_line(line):
+    """Returns (key, pid, tid, priority, tag) for a threadtime line, or None."""
+    match = THREADTIME_RE.match(line)
+    if not match:
+        return None
+    month, day, hour, minute, second, millis, pid, tid, priority, tag = match.groups()
+    key = time_key(int(month), int(day), int(hour), int(minute), int(second), int(millis))
+    return key, int(pid), int(tid), priority.decode(), tag.decode("utf-8", errors="replace")
+
+
+def device_from_path(path):
+    """Extracts the device serial from 'logcat_<serial>_<YYYYmmdd>_<HHMMSS>...' file names."""
+    match = DEVICE_FROM_NAME_RE.match(os.path.basename(path))
+    return match.group(1) if match else None
+
+
+class LogIndex:
+    """
+    Sidecar index for a logcat text file (plain or gzip-compressed segment).
+
+    The file is split into blocks of roughly block_size bytes ending on line
+    boundaries; for every block the index keeps the byte range, min/max
+    timestamp, a priority bitmask and the sets of tags and pids seen. The
+    index is stored zlib-compressed next to the log as '<file>.idx' and is
+    rebuilt automatically when the log's size or mtime changes. Queries only
+    read the blocks that can contain matching lines: plain files through a
+    memory map, .gz segments by seeking the decompressed stream, which skips
+    the blocks without parsing them.
+    """
+
+    def __init__(self, log_path, block_size=64 * 1024):
+        self.log_path = log_path
+        self.index_path = log_path + INDEX_SUFFIX
+        self.block_size = block_size
+        self.tags = []
+        self.blocks = []
+        self.device = device_from_path(log_path)
+        self.compressed = log_path.endswith(".gz")
+
+    @classmethod
+    def open(cls, log_path, block_size=64 * 1024):
+        """Loads the sidecar index, building it first if it is missing or stale."""
+        index = cls(log_path, block_size)
+        if not index.load():
+            index.build()
+            index.save()
+        return index
+
+    def _source_signature(self):
+        st = os.stat(self.log_path)
+        return [st.st_size, int(st.st_mtime)]
+
+    def load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                data = json.loads(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("source") != self._source_signature():
+            return False
+        self.tags = data["tags"]
+        self.blocks = data["blocks"]
+        self.device = data.get("device") or self.device
+        return True
+
+    def save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "source": self._source_signature(),
+            "device": self.device,
+            "tags": self.tags,
+            "blocks": self.blocks,
+        }
+        try:
+            with open(self.index_path, "wb") as f:
+                f.write(zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8")))
+        except OSError:
+            # Read-only location: keep using the in-memory index
+            pass
+
+    def _iter_lines(self):
+        """Yields (line, end_offset) for every line, offsets in uncompressed bytes."""
+        if self.compressed:
+            import gzip
+            position = 0
+            with gzip.open(self.log_path, "rb") as f:
+                for line in f:
+                    position += len(line)
+                    yield line.rstrip(b"\r\n"), position
+            return
+
+        size = os.path.getsize(self.log_path)
+        if size == 0:
+            return
+        with open(self.log_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+            while position < size:
+                line_end = data.find(b"\n", position)
+                if line_end < 0:
+                    line_end = size
+                yield data[position:line_end].rstrip(b"\r"), min(line_end + 1, size)
+                position = line_end + 1
+
+    def _read_blocks(self, blocks):
+        """Yields the raw bytes of the given blocks (sorted by offset)."""
+        if self.compressed:
+            import gzip
+            with gzip.open(self.log_path, "rb") as f:
+                for block in blocks:
+                    f.seek(block[0])
+                    yield f.read(block[1] - block[0])
+            return
+
+        with open(self.log_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for block in blocks:
+                yield data[block[0]:block[1]]
+
+    def build(self):
+        """Scans the log once and builds the block index."""
+        self.tags = []
+        self.blocks = []
+        tag_ids = {}
+        block_start = 0
+        block = None
+        position = 0
+
+        def flush():
+            if block is not None:
+                self.blocks.append([block_start, position, block[0], block[1], block[2],
+                                    sorted(block[3]), sorted(block[4])])
+
+        for line, position in self._iter_lines():
+            parsed = parse_line(line)
+            if parsed is not None:
+                key, pid, _, priority, tag = parsed
+                if block is None:
+                    block = [key, key, 0, set(), set()]
+                block[0] = min(block[0], key)
+                block[1] = max(block[1], key)
+                block[2] |= 1 << PRIORITIES.index(priority)
+                if tag not in tag_ids:
+                    tag_ids[tag] = len(self.tags)
+                    self.tags.append(tag)
+                block[3].add(tag_ids[tag])
+                block[4].add(pid)
+            if position - block_start >= self.block_size:
+                flush()
+                block_start = position
+                block = None
+        flush()
+
+    def _block_matches(self, block, tag_id, pid, priority_mask, start, end):
+        _, _, min_key, max_key, prio_mask, tag_ids, pids = block
+        if tag_id is not None and tag_id not in tag_ids:
+            return False
+        if pid is not None and pid not in pids:
+            return False
+        if priority_mask and not prio_mask & priority_mask:
+            return False
+        if start is None and end is None:
+            return True
+        if min_key // DAY_MS != max_key // DAY_MS:
+            # Block crosses midnight; let the per-line check decide
+            return True
+        day = min_key // DAY_MS
+        block_range = (min_key % DAY_MS, max_key % DAY_MS)
+        for bound, is_end in ((start, False), (end, True)):
+            if bound is None:
+                continue
+            bound_day, bound_ms = bound
+            if bound_day is not None and bound_day != day:
+                if (bound_day > day) != is_end:
+                    return False
+                continue
+            if not is_end and block_range[1] < bound_ms:
+                return False
+            if is_end and block_range[0] > bound_ms:
+                return False
+        return True
+
+    @staticmethod
+    def _line_in_range(key, start, end):
+        day, ms = key // DAY_MS, key % DAY_MS
+        if start is not None:
+            bound_day, bound_ms = start
+            if (day, ms) < ((bound_day if bound_day is not None else day), bound_ms):
+                return False
+        if end is not None:
+            bound_day, bound_ms = end
+            if (day, ms) > ((bound_day if bound_day is not None else day), bound_ms):
+                return False
+        return True
+
+    def query(self, tag=None, start=None, end=None, pid=None, min_priority=None, limit=None, stats=None):
+        """
+        Yields matching log lines (str). start/end are 'HH:MM[:SS]' or
+        'MM-DD HH:MM[:SS]' strings; without a date they apply to every day.
+        If a dict is passed as stats it receives blocks_total/blocks_read.
+        """
+        start = parse_time_query(start) if start else None
+        end = parse_time_query(end, end=True) if end else None
+        tag_id = None
+        if tag is not None:
+            if tag not in self.tags:
+                return
+            tag_id = self.tags.index(tag)
+        priority_mask = 0
+        if min_priority:
+            first = PRIORITIES.index(min_priority.upper())
+            priority_mask = sum(1 << i for i in range(first, len(PRIORITIES)))
+
+        candidates = [b for b in self.blocks if self._block_matches(b, tag_id, pid, priority_mask, start, end)]
+        if stats is not None:
+            stats["blocks_total"] = len(self.blocks)
+            stats["blocks_read"] = len(candidates)
+        if not candidates:
+            return
+
+        count = 0
+        for chunk in self._read_blocks(candidates):
+            for line in chunk.splitlines():
+                parsed = parse_line(line)
+                if parsed is None:
+                    continue
+                key, line_pid, _, priority, line_tag = parsed
+                if tag is not None and line_tag != tag:
+                    continue
+                if pid is not None and line_pid != pid:
+                    continue
+                if priority_mask and not priority_mask & (1 << PRIORITIES.index(priority)):
+                    continue
+                if not self._line_in_range(key, start, end):
+                    continue
+                yield line.decode("utf-8", errors="replace")
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+
+
+def find_log_files(directory):
+    """Returns the logcat files in a directory (saved with action 55 or captured)."""
+    paths = []
+    for pattern in ("*.txt", "*.log", "*.log.gz"):
+        paths.extend(glob.glob(os.path.join(directory, pattern)))
+    return sorted(paths)
+
+
+def search_logs(paths, device=None, limit=1000, **filters):
+    """
+    Queries several log files through their indexes.
+    Files whose name identifies another device are skipped when device is given.
+    Returns (lines, stats) where lines is a list of (path, line) tuples.
+    """
+    results = []
+    stats = {"files": 0, "blocks_total": 0, "blocks_read": 0}
+    for path in paths:
+        if device is not None and device_from_path(path) not in (None, device):
+            continue
+        index = LogIndex.open(path)
+        if device is not None and index.device not in (None, device):
+            continue
+        file_stats = {}
+        remaining = None if limit is None else limit - len(results)
+        for line in index.query(limit=remaining, stats=file_stats, **filters):
+            results.append((path, line))
+        stats["files"] += 1
+        stats["blocks_total"] += file_stats.get("blocks_total", len(index.blocks))
+        stats["blocks_read"] += file_stats.get("blocks_read", 0)
+        if limit is not None and len(results) >= limit:
+            break
+    return results, stats
@@ -0,0 +1,326 @@
+import datetime
+import os
+import struct
+import subprocess
+import threading
+import time
+from .adb_client import AdbError, AdbConnectionError
+
+# Index = priority value from the binary log entry
+PRIORITY_LETTERS = "??VDIWEFS"
+
+# len, hdr_size, pid, tid, sec, nsec
+ENTRY_HEADER = struct.Struct("<HHiIII")
+# Header size of v1 entries, which carry padding instead of hdr_size
+ENTRY_HEADER_V1_SIZE = 20
+
+
+def parse_entries(buffer):
+    """
+    Parses complete binary logger entries ('logcat -B' output) from buffer.
+    Returns (entries, remaining) where remaining holds an incomplete trailing
+    entry and each entry is a tuple (sec, nsec, pid, tid, priority, tag, message).
+    """
+    entries = []
+    offset = 0
+    size = len(buffer)
+    while size - offset >= ENTRY_HEADER.size:
+        payload_len, header_size, pid, tid, sec, nsec = ENTRY_HEADER.unpack_from(buffer, offset)
+        if header_size == 0:
+            header_size = ENTRY_HEADER_V1_SIZE
+        end = offset + header_size + payload_len
+        if end > size:
+            break
+        payload = buffer[offset + header_size:end]
+        offset = end
+        if not payload:
+            continue
+        priority = payload[0]
+        tag_end = payload.find(b"\0", 1)
+        if tag_end < 0:
+            tag_end = len(payload)
+        tag = payload[1:tag_end].decode("utf-8", errors="replace")
+        message = payload[tag_end + 1:].rstrip(b"\0").decode("utf-8", errors="replace")
+        entries.append((sec, nsec, pid, tid, priority, tag, message))
+    return entries, buffer[offset:]
+
+
+def priority_letter(priority):
+    return PRIORITY_LETTERS[priority] if 0 <= priority < len(PRIORITY_LETTERS) else "?"
+
+
+def format_entry(entry):
+    """Formats an entry like 'logcat -v threadtime' (one line per message line)."""
+    sec, nsec, pid, tid, priority, tag, message = entry
+    stamp = datetime.datetime.fromtimestamp(sec).strftime("%m-%d %H:%M:%S")
+    prefix = f"{stamp}.{nsec // 1000000:03d} {pid:5d} {tid:5d} {priority_letter(priority)} {tag}: "
+    return "".join(f"{prefix}{line}\n" for line in (message.splitlines() or [""]))
+
+
+class SegmentWriter:
+    """
+    Writes text to compressed segment files, rotating by size and age and
+    deleting the oldest segments beyond max_segments.
+    """
+
+    EXTENSIONS = {"gzip": ".log.gz", "zstd": ".log.zst", "none": ".log"}
+
+    def __init__(self, directory, prefix, max_bytes=64 * 1024 * 1024, max_seconds=3600,
+                 max_segments=200, compression="gzip"):
+        if compression not in self.EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.max_segments = max_segments
+        self.compression = compression
+        self.segments = []
+        self.bytes_written = 0
+        self._file = None
+        self._raw = None
+        self._segment_bytes = 0
+        self._opened_at = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_segment(self):
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.directory, f"{self.prefix}_{timestamp}{self.EXTENSIONS[self.compression]}")
+        counter = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory,
+                                f"{self.prefix}_{timestamp}_{counter}{self.EXTENSIONS[self.compression]}")
+            counter += 1
+
+        if self.compression == "gzip":
+            import gzip
+            self._file = gzip.open(path, "wb", compresslevel=6)
+        elif self.compression == "zstd":
+            # Optional dependency, only needed when zstd output is requested
+            import zstandard
+            self._raw = open(path, "wb")
+            self._file = zstandard.ZstdCompressor(level=3).stream_writer(self._raw)
+        else:
+            self._file = open(path, "wb")
+
+        self.segments.append(path)
+        self._segment_bytes = 0
+        self._opened_at = time.monotonic()
+        self._prune()
+
+    def _prune(self):
+        while len(self.segments) > self.max_segments:
+            oldest = self.segments.pop(0)
+            try:
+                os.remove(oldest)
+            except OSError:
+                pass
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+    def write(self, text):
+        if self._file is not None and (self._segment_bytes >= self.max_bytes
+                                       or time.monotonic() - self._opened_at >= self.max_seconds):
+            self._close_segment()
+        if self._file is None:
+            self._open_segment()
+        data = text.encode("utf-8")
+        self._file.write(data)
+        self._segment_bytes += len(data)
+        self.bytes_written += len(data)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        self._close_segment()
+
+
+class LogcatCapture:
+    """
+    Long-running logcat capture for one device.
+
+    Streams binary logcat ('logcat -B') in a background thread, applies
+    tag/priority/package filters in-process and writes threadtime-formatted
+    text to rotated, compressed segments. Only the current read chunk is kept
+    in memory. When the device disconnects the capture reconnects and resumes
+    after the last entry it read.
+    """
+
+    RECONNECT_DELAY = 3.0
+    PID_REFRESH_INTERVAL = 5.0
+
+    def __init__(self, manager, device_id, directory, tags=None, min_priority="V", package=None,
+                 max_segment_bytes=64 * 1024 * 1024, max_segment_seconds=3600, max_segments=200,
+                 compression="gzip", include_backlog=False):
+        self.manager = manager
+        self.device_id = device_id
+        self.tags = set(tags) if tags else None
+        self.min_priority = PRIORITY_LETTERS.index(min_priority.upper())
+        self.package = package or None
+        self.include_backlog = include_backlog
+        self.writer = SegmentWriter(directory, f"logcat_{device_id}", max_segment_bytes,
+                                    max_segment_seconds, max_segments, compression)
+        self.entries_read = 0
+        self.entries_written = 0
+        self.reconnects = 0
+        self.last_error = None
+        self._last_time = None
+        self._pids = set()
+        self._pids_checked = 0.0
+        self._stop = threading.Event()
+        self._proc = None
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"Logcat-{self.device_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self):
+        return {
+            "device_id": self.device_id,
+            "running": self.is_running(),
+            "entries_read": self.entries_read,
+            "entries_written": self.entries_written,
+            "bytes_written": self.writer.bytes_written,
+            "segments": list(self.writer.segments),
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+        }
+
+    def _logcat_command(self):
+        if self._last_time is not None:
+            sec, nsec = self._last_time
+            # Resume right after the last entry read (logcat takes 'sssss.mmm')
+            resume_ms = sec * 1000 + nsec // 1000000 + 1
+            return f"logcat -B -T {resume_ms // 1000}.{resume_ms % 1000:03d}"
+        return "logcat -B" if self.include_backlog else "logcat -B -T 1"
+
+    def _stream(self):
+        """Yields raw 'logcat -B' chunks over the server socket or an adb client process."""
+        command = self._logcat_command()
+        client = self.manager.client
+        if client.is_available():
+            try:
+                yield from client.exec_stream(self.device_id, command, stop_event=self._stop)
+            except AdbConnectionError:
+                # The capture loop reconnects (through the adb client if needed)
+                client.mark_unavailable()
+            return
+        adb = self.manager.adb_path.strip('"')
+        self._proc = subprocess.Popen([adb, "-s", self.device_id, "exec-out", command],
+                                      stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            while not self._stop.is_set():
+                chunk = self._proc.stdout.read1(65536)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            if self._proc.poll() is None:
+                self._proc.kill()
+            self._proc.stdout.close()
+            self._proc.wait()
+            self._proc = None
+
+    def _refresh_pids(self):
+        now = time.monotonic()
+        if now - self._pids_checked < self.PID_REFRESH_INTERVAL:
+            return
+        self._pids_checked = now
+        output = self.manager._run_shell(self.device_id, f"pidof {self.package}")
+        self._pids = {int(pid) for pid in output.split() if pid.isdigit()}
+
+    def _accept(self, entry):
+        _, _, pid, _, priority, tag, _ = entry
+        if priority < self.min_priority:
+            return False
+        if self.tags is not None and tag not in self.tags:
+            return False
+        if self.package is not None and pid not in self._pids:
+            return False
+        return True
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                pending = b""
+                try:
+                    for chunk in self._stream():
+                        if self.package is not None:
+                            self._refresh_pids()
+                        entries, pending = parse_entries(pending + chunk)
+                        self.entries_read += len(entries)
+                        lines = [format_entry(entry) for entry in entries if self._accept(entry)]
+                        if entries:
+                            self._last_time = entries[-1][:2]
+                        if lines:
+                            self.writer.write("".join(lines))
+                            self.entries_written += len(lines)
+                    self.writer.flush()
+                except (AdbError, OSError) as e:
+                    self.last_error = str(e)
+                if self._stop.wait(self.RECONNECT_DELAY):
+                    break
+                self.reconnects += 1
+        finally:
+            self.writer.close()
+
+
+class LogcatCaptureManager:
+    """Keeps track of the running logcat captures, one per device."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._captures = {}
+        self._lock = threading.Lock()
+
+    def start(self, device_id, directory, **options):
+        """Starts capturing a device (see LogcatCapture for options)."""
+        with self._lock:
+            capture = self._captures.get(device_id)
+            if capture is not None and capture.is_running():
+                return capture
+            capture = LogcatCapture(self.manager, device_id, directory, **options)
+            self._captures[device_id] = capture
+        capture.start()
+        return capture
+
+    def stop(self, device_id):
+        with self._lock:
+            capture = self._captures.pop(device_id, None)
+        if capture is not None:
+            capture.stop()
+        return capture
+
+    def stop_all(self):
+        with self._lock:
+            captures, self._captures = list(self._captures.values()), {}
+        for capture in captures:
+            capture.stop()
+
+    def is_capturing(self, device_id):
+        capture = self._captures.get(device_id)
+        return capture is not None and capture.is_running()
+
+    def stats(self):
+        return [capture.stats() for capture in list(self._captures.values())]
@@ -1,5 +1,6 @@
-import tkinter as tk
-from tkinterdnd2 import TkinterDnD
+import time
+STARTED = time.perf_counter()
+
 import sys
 import os
 
@@ -13,9 +14,25 @@ else:
 
 sys.path.insert(0, application_path)
 
-from adb_tool.gui import AdbGui
+from adb_tool.cli import COMMANDS as CLI_COMMANDS
+
+def main(argv=None):
+    # Burst screenshots encode PNGs in worker processes (needed for frozen builds)
+    if getattr(sys, 'frozen', False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and (argv[0] in CLI_COMMANDS or argv[0] in ("-h", "--help")):
+        # Headless mode: Tk and the GUI modules are never imported
+        from adb_tool.cli import main as cli_main
+        return cli_main(argv)
+    run_gui()
+
+def run_gui():
+    from tkinterdnd2 import TkinterDnD
+    from adb_tool.gui import AdbGui
 
-def main():
     # Fix for PyInstaller: Set TKDND_LIBRARY environment variable and auto_path
     if getattr(sys, 'frozen', False):
         # In PyInstaller bundle
@@ -43,8 +60,8 @@ def main():
     
     # Set icon if available, or just title
     # root.iconbitmap('icon.ico') 
-    app = AdbGui(root)
+    app = AdbGui(root, started=STARTED)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from .utils import get_data_dir
+
+
+class PackageCache:
+    """
+    Persistent cache of package metadata (labels and app details).
+
+    Entries are keyed by device serial + package and stamped with the
+    package's versionCode/lastUpdateTime, so an entry only counts as a hit
+    while the installed package is unchanged. The least recently used rows
+    are evicted once the cache grows past max_entries.
+    """
+
+    def __init__(self, path=None, max_entries=20000):
+        self.path = path or os.path.join(get_data_dir(), "package_cache.db")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+        except sqlite3.Error:
+            # Profile directory not writable: keep the cache for this session only
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS packages ("
+            " serial TEXT NOT NULL,"
+            " package TEXT NOT NULL,"
+            " stamp TEXT NOT NULL,"
+            " label TEXT,"
+            " details TEXT,"
+            " last_access REAL NOT NULL,"
+            " PRIMARY KEY (serial, package))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS packages_last_access ON packages (last_access)")
+        self._db.commit()
+
+    def lookup(self, serial, package, stamp):
+        """
+        Returns {'label': ..., 'details': ...} if the package is cached with the
+        given stamp, otherwise None. Updates the hit/miss counters.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT label, details FROM packages WHERE serial = ? AND package = ? AND stamp = ?",
+                (serial, package, stamp),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute(
+                "UPDATE packages SET last_access = ? WHERE serial = ? AND package = ?",
+                (time.time(), serial, package),
+            )
+            self._db.commit()
+        return {"label": row[0], "details": json.loads(row[1]) if row[1] else None}
+
+    def peek_labels(self, serial):
+        """
+        Returns every cached label for a device without validating stamps.
+        Used to show names immediately while the real lookup is running.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT package, label FROM packages WHERE serial = ? AND label IS NOT NULL",
+                (serial,),
+            ).fetchall()
+        return dict(rows)
+
+    def lookup_labels(self, serial, stamps, count=True):
+        """
+        Returns {package: label} for the packages of {package: stamp} cached
+        with the same stamp, in one query; a None label is a hit too (the
+        package has no label). Counts hits/misses unless count is False and
+        marks the hits as used in a single transaction.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT package, stamp, label FROM packages WHERE serial = ?",
+                (serial,),
+            ).fetchall()
+            labels = {package: label for package, stamp, label in rows if stamps.get(package) == stamp}
+            if count:
+                self.hits += len(labels)
+                self.misses += len(stamps) - len(labels)
+            if labels:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE packages SET last_access = ? WHERE serial = ? AND package = ?",
+                    [(now, serial, package) for package in labels],
+                )
+                self._db.commit()
+        return labels
+
+    def store(self, serial, package, stamp, label=None, details=None):
+        """
+        Stores label and/or details for a package. Values already cached for the
+        same stamp are kept when the new call does not provide them.
+        """
+        self.store_many(serial, [(package, stamp, label, details)])
+
+    def store_many(self, serial, entries):
+        """Stores a list of (package, stamp, label, details) tuples in one transaction."""
+        now = time.time()
+        with self._lock:
+            for package, stamp, label, details in entries:
+                row = self._db.execute(
+                    "SELECT label, details FROM packages WHERE serial = ? AND package = ? AND stamp = ?",
+                    (serial, package, stamp),
+                ).fetchone()
+                details_json = json.dumps(details) if details is not None else None
+                if row is not None:
+                    label = label if label is not None else row[0]
+                    details_json = details_json if details_json is not None else row[1]
+                self._db.execute(
+                    "INSERT OR REPLACE INTO packages (serial, package, stamp, label, details, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (serial, package, stamp, label, details_json, now),
+                )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        count = self._db.execute("SELECT COUNT(*) FROM packages").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM packages WHERE rowid IN"
+                " (SELECT rowid FROM packages ORDER BY last_access LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self):
+        """Returns a dict with hit/miss counters for this session."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM packages")
+            self._db.commit()
+            self.hits = 0
+            self.misses = 0
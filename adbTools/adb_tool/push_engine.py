@@ -0,0 +1,246 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from .adb_client import AdbError, AdbConnectionError
+
+# What 'adb push' prints when a file fails ('adb: error: failed to copy ...',
+# 'error: device not found' from older clients). Matched per line: the output
+# also echoes the file paths, which may contain 'error' themselves.
+PUSH_FAILURE = re.compile(r"^(?:adb: )?(?:error:|failed to copy)", re.MULTILINE)
+
+
+class PushProgress:
+    """
+    Byte and file counters shared by all push sessions of one transfer.
+    callback(snapshot) is called at most every `interval` seconds and once
+    more when the transfer finishes.
+    """
+
+    def __init__(self, files_total, bytes_total, callback=None, interval=0.1):
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.callback = callback
+        self.interval = interval
+        self.sent_bytes = 0
+        self.files_done = 0
+        self.files_failed = 0
+        self.current = None
+        self.started = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def add_bytes(self, count, current=None):
+        with self._lock:
+            self.sent_bytes += count
+            if current:
+                self.current = current
+        self._report()
+
+    def file_done(self, ok):
+        with self._lock:
+            self.files_done += 1
+            if not ok:
+                self.files_failed += 1
+        self._report()
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = max(time.monotonic() - self.started, 1e-6)
+            return {
+                "sent_bytes": self.sent_bytes,
+                "total_bytes": self.bytes_total,
+                "files_done": self.files_done,
+                "files_failed": self.files_failed,
+                "files_total": self.files_total,
+                "rate": self.sent_bytes / elapsed,
+                "current": self.current,
+            }
+
+    def _report(self, force=False):
+        if not self.callback:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        self.callback(self.snapshot())
+
+    def finish(self):
+        self._report(force=True)
+
+
+class PushEngine:
+    """
+    Pushes many files to one device over the adb sync protocol.
+
+    Each session keeps one sync: connection open and streams files
+    back-to-back (SEND/DATA/DONE), reading the per-file OKAY/FAIL replies as
+    they arrive instead of waiting after every file. Several sessions pull
+    from a shared queue to use more of the USB bandwidth with small files.
+    Files left unacknowledged by a broken session are retried once; without
+    a reachable adb server the engine falls back to one 'adb push' per file.
+    """
+
+    def __init__(self, manager, device_id, sessions=2, progress=None, max_attempts=2):
+        self.manager = manager
+        self.device_id = device_id
+        self.sessions = max(1, sessions)
+        self.progress_callback = progress
+        self.max_attempts = max_attempts
+        self._queue = deque()
+        self._results = {}
+        self._lock = threading.Lock()
+        self._fallback = False
+
+    def push(self, local_paths, remote_dir):
+        """
+        Pushes local files into remote_dir and returns a list of
+        {'local', 'remote', 'ok', 'error'} dicts in input order.
+        """
+        remote_dir = remote_dir.rstrip('/') + '/'
+        return self.push_pairs([(local_path, remote_dir + os.path.basename(local_path))
+                                for local_path in local_paths])
+
+    def push_pairs(self, pairs):
+        """
+        Pushes each local file to its own remote file path (the device creates
+        missing parent directories) and returns the same result dicts as push().
+        """
+        local_paths = [local_path for local_path, _ in pairs]
+        jobs = []
+        for local_path, remote_path in pairs:
+            job = {"local": local_path, "remote": remote_path, "size": 0, "sent": 0, "attempts": 0}
+            try:
+                job["size"] = os.path.getsize(local_path)
+            except OSError as e:
+                self._results[local_path] = self._result(job, False, str(e))
+                continue
+            jobs.append(job)
+
+        self.progress = PushProgress(len(local_paths), sum(job["size"] for job in jobs), self.progress_callback)
+        for _ in self._results:
+            self.progress.file_done(False)
+        self._queue.extend(jobs)
+
+        if self.manager.client.is_available():
+            workers = [threading.Thread(target=self._session_worker, daemon=True)
+                       for _ in range(min(self.sessions, len(jobs)))]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        # Anything left over (no server, or the server went away) goes through the adb client
+        self._push_with_adb_client()
+
+        self.progress.finish()
+        return [self._results[local_path] for local_path in local_paths]
+
+    @staticmethod
+    def _result(job, ok, error=None):
+        return {"local": job["local"], "remote": job["remote"], "ok": ok, "error": error}
+
+    def _next_job(self):
+        with self._lock:
+            if self._fallback or not self._queue:
+                return None
+            return self._queue.popleft()
+
+    def _finish(self, job, ok, error=None):
+        with self._lock:
+            self._results[job["local"]] = self._result(job, ok, error)
+        self.progress.file_done(ok)
+
+    def _requeue(self, jobs, error, count_attempt=True):
+        """
+        Puts unacknowledged jobs back on the queue, or fails them after
+        max_attempts. count_attempt=False when the session ended because of
+        another file's FAIL: these jobs did nothing wrong and are not charged.
+        """
+        for job in jobs:
+            self.progress.add_bytes(-job["sent"])
+            job["sent"] = 0
+            if count_attempt:
+                job["attempts"] += 1
+            if job["attempts"] >= self.max_attempts:
+                self._finish(job, False, error)
+            else:
+                with self._lock:
+                    self._queue.append(job)
+
+    def _session_worker(self):
+        client = self.manager.client
+        while True:
+            with self._lock:
+                if self._fallback or not self._queue:
+                    return
+            inflight = deque()
+            taken = []
+            try:
+                with client.sync(self.device_id) as conn:
+                    self._run_session(conn, inflight, taken)
+            except AdbConnectionError as e:
+                client.mark_unavailable()
+                self._requeue(list(inflight), str(e))
+                with self._lock:
+                    self._fallback = True
+                return
+            except OSError as e:
+                # The connection broke: any unacknowledged file may be the cause
+                self._requeue(list(inflight), str(e))
+            except AdbError as e:
+                # A FAIL reply ends the sync session on the device side; _read_ack
+                # already failed the file it was for
+                self._requeue(list(inflight), str(e), count_attempt=False)
+                if not taken:
+                    # The session could not even be opened (device gone/offline)
+                    self._fail_remaining(str(e))
+                    return
+
+    def _fail_remaining(self, error):
+        with self._lock:
+            jobs, self._queue = list(self._queue), deque()
+        for job in jobs:
+            self._finish(job, False, error)
+
+    def _run_session(self, conn, inflight, taken):
+        while True:
+            job = self._next_job()
+            if job is None:
+                break
+            taken.append(job)
+            inflight.append(job)
+
+            def on_chunk(count, job=job):
+                job["sent"] += count
+                self.progress.add_bytes(count, job["local"])
+
+            conn.send_file(job["local"], job["remote"], on_chunk=on_chunk)
+            while inflight and conn.reply_pending():
+                self._read_ack(conn, inflight)
+        while inflight:
+            self._read_ack(conn, inflight)
+
+    def _read_ack(self, conn, inflight):
+        try:
+            conn.read_status()
+        except AdbConnectionError:
+            raise
+        except AdbError as e:
+            self._finish(inflight.popleft(), False, str(e))
+            raise
+        self._finish(inflight.popleft(), True)
+
+    def _push_with_adb_client(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    return
+                job = self._queue.popleft()
+            self.progress.add_bytes(0, job["local"])
+            output = self.manager.push_file(self.device_id, job["local"], job["remote"])
+            # push_file returns "" when adb exits with an error
+            ok = bool(output) and not PUSH_FAILURE.search(output)
+            self.progress.add_bytes(job["size"])
+            self._finish(job, ok, None if ok else output)
@@ -0,0 +1,150 @@
+import concurrent.futures
+import datetime
+import os
+import struct
+import threading
+import time
+import zlib
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PixelFormat values written by 'screencap' (raw mode)
+PIXEL_FORMAT_RGBA_8888 = 1
+PIXEL_FORMAT_RGBX_8888 = 2
+PIXEL_FORMAT_RGB_888 = 3
+
+
+def capture_png(manager, device_id):
+    """
+    Captures the screen as PNG bytes straight from 'screencap -p' over exec:,
+    without writing a temporary file on the device.
+    """
+    data = manager._exec_out(device_id, "screencap -p")
+    if not data.startswith(PNG_SIGNATURE):
+        raise RuntimeError(f"화면 캡쳐 실패: {device_id}")
+    return data
+
+
+def capture_raw(manager, device_id):
+    """Captures the raw framebuffer ('screencap' without -p). Returns (width, height, format, pixels)."""
+    return parse_raw_frame(manager._exec_out(device_id, "screencap"))
+
+
+def parse_raw_frame(data):
+    """
+    Parses raw screencap output: width, height, format (and a colour space
+    word on newer Android versions) followed by the pixel data.
+    """
+    if len(data) < 12:
+        raise ValueError("Raw frame too short")
+    width, height, pixel_format = struct.unpack_from("<III", data, 0)
+    bytes_per_pixel = 3 if pixel_format == PIXEL_FORMAT_RGB_888 else 4
+    pixel_bytes = width * height * bytes_per_pixel
+    for header_size in (16, 12):
+        if len(data) - header_size == pixel_bytes:
+            return width, height, pixel_format, data[header_size:]
+    raise ValueError(f"Unexpected raw frame size {len(data)} for {width}x{height} format {pixel_format}")
+
+
+def _png_chunk(chunk_type, body):
+    return (struct.pack(">I", len(body)) + chunk_type + body
+            + struct.pack(">I", zlib.crc32(chunk_type + body) & 0xffffffff))
+
+
+def encode_png(width, height, pixel_format, pixels, level=6):
+    """Encodes a raw frame as PNG bytes (RGBA for RGBA_8888, RGB otherwise)."""
+    if pixel_format == PIXEL_FORMAT_RGBA_8888:
+        color_type, channels = 6, 4
+    elif pixel_format == PIXEL_FORMAT_RGBX_8888:
+        # Drop the padding byte so X=0 does not turn into a transparent image
+        pixels = bytearray(pixels)
+        del pixels[3::4]
+        color_type, channels = 2, 3
+    elif pixel_format == PIXEL_FORMAT_RGB_888:
+        color_type, channels = 2, 3
+    else:
+        raise ValueError(f"Unsupported pixel format: {pixel_format}")
+
+    stride = width * channels
+    view = memoryview(pixels)
+    raw = b"".join(b"\x00" + view[row * stride:(row + 1) * stride] for row in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (PNG_SIGNATURE + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(raw, level)) + _png_chunk(b"IEND", b""))
+
+
+def encode_frame_to_file(path, width, height, pixel_format, pixels):
+    """Process pool entry point: encodes one raw frame and writes it to path."""
+    with open(path, "wb") as f:
+        f.write(encode_png(width, height, pixel_format, pixels))
+    return path
+
+
+def capture_burst(manager, device_ids, frames, interval, output_dir, workers=None, progress=None):
+    """
+    Captures `frames` raw frames per device at a target `interval` (seconds)
+    and encodes them to PNG in a process pool, so the capture rate is bound by
+    the device and USB link rather than by PNG compression.
+    Devices are captured concurrently; at most twice as many frames as there
+    are workers wait for encoding (a raw frame is several MB), so capturing
+    pauses while the encoders catch up. progress(captured, total) is called
+    after every captured frame.
+    Returns {device_id: {'files': [...], 'errors': [...]}}.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    total = frames * len(device_ids)
+    captured = 0
+    lock = threading.Lock()
+    results = {device_id: {"files": [], "errors": []} for device_id in device_ids}
+
+    # Spawned (not forked) workers, so they do not inherit open adb sockets
+    import multiprocessing
+    context = multiprocessing.get_context("spawn")
+    workers = workers or os.cpu_count() or 1
+    encode_slots = threading.Semaphore(workers * 2)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = []
+
+        def capture_device(device_id):
+            nonlocal captured
+            next_shot = time.monotonic()
+            for frame in range(frames):
+                delay = next_shot - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_shot += interval
+                stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+                path = os.path.join(output_dir, f"burst_{device_id}_{frame:04d}_{stamp}.png")
+                try:
+                    width, height, pixel_format, pixels = capture_raw(manager, device_id)
+                    encode_slots.acquire()
+                    try:
+                        future = pool.submit(encode_frame_to_file, path, width, height, pixel_format, pixels)
+                    except BaseException:
+                        encode_slots.release()
+                        raise
+                    future.add_done_callback(lambda _: encode_slots.release())
+                    with lock:
+                        pending.append((device_id, future))
+                except (ValueError, OSError, concurrent.futures.BrokenExecutor) as e:
+                    results[device_id]["errors"].append(f"frame {frame}: {e}")
+                with lock:
+                    captured += 1
+                    done = captured
+                if progress:
+                    progress(done, total)
+
+        threads = [threading.Thread(target=capture_device, args=(device_id,), daemon=True)
+                   for device_id in device_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for device_id, future in pending:
+            try:
+                results[device_id]["files"].append(future.result())
+            except Exception as e:
+                results[device_id]["errors"].append(str(e))
+
+    return results
@@ -0,0 +1,103 @@
+from collections import defaultdict
+
+NGRAM_SIZE = 3
+
+
+def _ngrams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class PackageSearchIndex:
+    """
+    Substring search over package names and labels.
+
+    Every entry's display text ('Label (package)') is lowercased and split
+    into 1-, 2- and 3-grams; a query is answered by intersecting the posting
+    sets of its n-grams and confirming the candidates with a plain substring
+    check, so typing does not rescan every package. Labels can be updated in
+    place as they are resolved, which re-indexes only that entry.
+    """
+
+    def __init__(self, packages=()):
+        self.packages = []
+        self.labels = []
+        self._texts = []
+        self._ids = {}
+        self._postings = defaultdict(set)
+        for package, label in packages:
+            self.add(package, label)
+
+    def __len__(self):
+        return len(self.packages)
+
+    def add(self, package, label):
+        entry_id = self._ids.get(package)
+        if entry_id is not None:
+            self.set_label(package, label)
+            return entry_id
+        entry_id = len(self.packages)
+        self._ids[package] = entry_id
+        self.packages.append(package)
+        self.labels.append(label)
+        self._texts.append("")
+        self._index(entry_id)
+        return entry_id
+
+    def display_text(self, entry_id):
+        return f"{self.labels[entry_id]} ({self.packages[entry_id]})"
+
+    def set_label(self, package, label):
+        """Updates the label of a package. Returns False if nothing changed."""
+        entry_id = self._ids.get(package)
+        if entry_id is None or self.labels[entry_id] == label:
+            return False
+        self._unindex(entry_id)
+        self.labels[entry_id] = label
+        self._index(entry_id)
+        return True
+
+    def _grams(self, text):
+        grams = set()
+        for size in range(1, NGRAM_SIZE + 1):
+            grams |= _ngrams(text, size)
+        return grams
+
+    def _index(self, entry_id):
+        text = self.display_text(entry_id).lower()
+        self._texts[entry_id] = text
+        for gram in self._grams(text):
+            self._postings[gram].add(entry_id)
+
+    def _unindex(self, entry_id):
+        for gram in self._grams(self._texts[entry_id]):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(entry_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def search(self, query, entry_ids=None):
+        """
+        Returns the ids of entries whose display text contains query
+        (case-insensitive), in insertion order. entry_ids (a set) optionally
+        limits the search to a subset.
+        """
+        query = query.lower()
+        if not query:
+            return list(range(len(self.packages))) if entry_ids is None else sorted(entry_ids)
+
+        size = min(len(query), NGRAM_SIZE)
+        candidates = None
+        # Rarest n-grams first so the intersection shrinks quickly
+        for gram in sorted(_ngrams(query, size), key=lambda g: len(self._postings.get(g, ()))):
+            postings = self._postings.get(gram)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                return []
+        if entry_ids is not None:
+            candidates &= entry_ids
+        if len(query) > NGRAM_SIZE:
+            candidates = {entry_id for entry_id in candidates if query in self._texts[entry_id]}
+        return sorted(candidates)
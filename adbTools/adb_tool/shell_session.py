@@ -0,0 +1,218 @@
+import itertools
+import os
+import select
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from .adb_client import AdbError, AdbConnectionError
+
+
+class ShellSession:
+    """
+    One long-lived 'sh' on a device, opened through exec: (plain pipes, no
+    pty) and fed commands on its stdin.
+
+    Every command is passed single-quoted to a child sh with stdin from
+    /dev/null, so it can neither change the session's working directory or
+    variables nor swallow the commands that follow, and a stray quote in it
+    is a syntax error of the child instead of breaking the frame. It is
+    followed by a printf of a unique sentinel and the exit code:
+
+        sh -c '<command>' 2>&1 </dev/null
+        printf '\\n%s %d\\n' <sentinel> $?
+
+    The reader splits the output into lines until the sentinel line. The
+    newline printed before the sentinel makes it start a line of its own; the
+    empty line it leaves after output that ended with a newline is dropped.
+    """
+
+    def __init__(self, sock, serial):
+        self.sock = sock
+        self.serial = serial
+        self.alive = True
+        self.exit_code = None
+        self.commands = 0
+        self.written = 0  # bytes of the current command sent so far
+        self.last_used = time.monotonic()
+        self._pending = b""
+        self._prefix = f"__ADBTOOL_END_{os.getpid()}_{id(self):x}_"
+        self._counter = itertools.count()
+
+    def lines(self, command):
+        """
+        Runs a command and yields its output (stdout and stderr) line by line.
+        exit_code is set once the last line has been read. Raises
+        AdbConnectionError if the session dies; stopping early closes it.
+        If written is still 0 afterwards the command never reached the device.
+        """
+        sentinel = f"{self._prefix}{next(self._counter)}"
+        marker = sentinel.encode() + b" "
+        self.exit_code = None
+        self.commands += 1
+        self.written = 0
+        quoted = "'" + command.replace("'", "'\\''") + "'"
+        frame = memoryview(f"sh -c {quoted} 2>&1 </dev/null\nprintf '\\n%s %d\\n' {sentinel} $?\n".encode("utf-8"))
+        try:
+            while self.written < len(frame):
+                self.written += self.sock.send(frame[self.written:])
+            held = None  # the last line is only known to be output once the next one arrives
+            while True:
+                newline = self._pending.find(b"\n")
+                if newline < 0:
+                    chunk = self.sock.recv(65536)
+                    if not chunk:
+                        raise AdbConnectionError(f"Shell session on {self.serial} closed")
+                    self._pending += chunk
+                    continue
+                line, self._pending = self._pending[:newline], self._pending[newline + 1:]
+                if line.startswith(marker):
+                    code = line[len(marker):].strip()
+                    self.exit_code = int(code) if code.lstrip(b"-").isdigit() else None
+                    if held:
+                        yield held.decode("utf-8", errors="replace")
+                    break
+                if held is not None:
+                    yield held.decode("utf-8", errors="replace")
+                held = line
+            self.last_used = time.monotonic()
+        except (OSError, AdbError, GeneratorExit):
+            # A half-read command leaves its output in the stream: the session cannot be reused
+            self.close()
+            raise
+
+    def run(self, command):
+        """Runs a command and returns (output, exit_code); output is stripped like AdbClient.shell."""
+        output = "\n".join(self.lines(command))
+        return output.strip(), self.exit_code
+
+    def is_alive(self):
+        """False once the device side has closed the session (e.g. after a disconnect)."""
+        if not self.alive:
+            return False
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            # An idle session has nothing to read unless the other end closed it
+            closed = bool(readable) and self.sock.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            closed = True
+        if closed:
+            self.close()
+        return self.alive
+
+    def close(self):
+        self.alive = False
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ShellSessionPool:
+    """
+    Keeps up to max_sessions ShellSessions per device open between calls,
+    so a shell command costs a round trip instead of starting a new shell
+    on the device (tens of ms on the low-end pads).
+
+    A command takes an idle session or opens a new one; when all sessions of
+    the device are busy (e.g. a long dumpsys) or the device cannot run
+    exec: sessions (tried again after retry_interval), session() yields
+    None and the caller uses a one-shot shell instead. Dead sessions are
+    dropped and replaced on the next call, sessions idle for longer than
+    idle_timeout are closed.
+
+    Sessions are opened through manager.client; their sockets are not
+    counted by its connection pool since they stay open for the life of the
+    session.
+    """
+
+    def __init__(self, manager, max_sessions=2, idle_timeout=300.0, retry_interval=60.0):
+        self.manager = manager
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.retry_interval = retry_interval
+        self.stats = {"opened": 0, "reused": 0, "restarted": 0, "busy": 0, "failed": 0}
+        self._idle = {}        # serial -> [ShellSession]
+        self._busy = {}        # serial -> number of sessions in use
+        self._unsupported = {}  # serial -> when opening a session failed
+        self._lock = threading.Lock()
+
+    def _take(self, serial):
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if now - self._unsupported.get(serial, -self.retry_interval) < self.retry_interval:
+                    return None, False
+                idle = self._idle.get(serial)
+                session = idle.pop() if idle else None
+                if session is None:
+                    if self._busy.get(serial, 0) >= self.max_sessions:
+                        self.stats["busy"] += 1
+                        return None, False
+                    self._busy[serial] = self._busy.get(serial, 0) + 1
+                    return None, True
+                self._busy[serial] = self._busy.get(serial, 0) + 1
+            if now - session.last_used < self.idle_timeout and session.is_alive():
+                self.stats["reused"] += 1
+                return session, False
+            # Died or expired while idle: the command has not been sent, open a new one
+            session.close()
+            self.stats["restarted"] += 1
+            self._release(serial, None)
+
+    def _release(self, serial, session):
+        with self._lock:
+            self._busy[serial] = max(0, self._busy.get(serial, 0) - 1)
+            if session is not None and session.alive:
+                self._idle.setdefault(serial, []).append(session)
+
+    def _open(self, serial):
+        try:
+            sock = self.manager.client.open_service(serial, "exec:sh")
+        except AdbConnectionError:
+            raise
+        except AdbError:
+            # exec: is missing on old Android versions (or the device is offline)
+            with self._lock:
+                self._unsupported[serial] = time.monotonic()
+            return None
+        self.stats["opened"] += 1
+        return ShellSession(sock, serial)
+
+    @contextmanager
+    def session(self, serial):
+        """Yields a ShellSession for the device, or None to use a one-shot shell instead."""
+        session, open_new = self._take(serial)
+        if open_new:
+            try:
+                session = self._open(serial)
+            except Exception:
+                self._release(serial, None)
+                raise
+        try:
+            yield session
+        finally:
+            if session is not None or open_new:
+                self._release(serial, session)
+
+    def close_device(self, serial):
+        """Closes the idle sessions of a device (e.g. when it is disconnected)."""
+        with self._lock:
+            sessions = self._idle.pop(serial, [])
+            self._unsupported.pop(serial, None)
+        for session in sessions:
+            session.close()
+
+    def close(self):
+        with self._lock:
+            sessions = [session for idle in self._idle.values() for session in idle]
+            self._idle.clear()
+        for session in sessions:
+            session.close()
+
+    def report(self):
+        """Counters and open sessions per device, for the diagnostics window."""
+        with self._lock:
+            devices = {serial: {"idle": len(self._idle.get(serial, [])), "busy": busy}
+                       for serial, busy in self._busy.items()}
+        return dict(self.stats, devices=devices)
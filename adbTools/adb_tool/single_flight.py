@@ -0,0 +1,63 @@
+import threading
+import time
+from concurrent.futures import Future
+from .tracing import tracer
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls that overlap in time: while a call for a key
+    is running, further calls with the same key wait for it and get its
+    result (or exception) instead of running again. Only for read-only
+    queries; the result object is shared, so callers must not modify it.
+
+    Counters are kept per name (the kind of query, e.g. 'pm list packages'):
+    calls made, calls that ran and calls served by another call's result.
+    Shared calls are also traced as 'shared <name>' spans.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = {}  # (name, key) -> Future
+        self._stats = {}    # name -> {'calls', 'executed', 'shared'}
+
+    def do(self, name, key, func, *args, **kwargs):
+        """Runs func(*args, **kwargs) unless a call with the same name and key is running."""
+        flight_key = (name, key)
+        with self._lock:
+            counters = self._stats.setdefault(name, {"calls": 0, "executed": 0, "shared": 0})
+            counters["calls"] += 1
+            future = self._running.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._running[flight_key] = Future()
+                counters["executed"] += 1
+            else:
+                counters["shared"] += 1
+
+        if not leader:
+            started = time.perf_counter()
+            try:
+                return future.result()
+            finally:
+                tracer.record(f"shared {name}", "coalesced", started, time.perf_counter(), {"key": str(key)})
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._running[flight_key]
+
+    def stats(self):
+        """{name: {'calls', 'executed', 'shared'}} plus the overall total under 'total'."""
+        with self._lock:
+            stats = {name: dict(counters) for name, counters in self._stats.items()}
+        stats["total"] = {field: sum(counters[field] for counters in stats.values())
+                          for field in ("calls", "executed", "shared")}
+        return stats
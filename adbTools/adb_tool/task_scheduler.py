@@ -0,0 +1,190 @@
+import itertools
+import threading
+import time
+import traceback
+from collections import deque
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Task:
+    """One unit of background work; see TaskScheduler.submit."""
+
+    def __init__(self, task_id, func, device, name, on_done, on_error):
+        self.id = task_id
+        self.func = func
+        self.device = device
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.state = QUEUED
+        self.submitted = time.monotonic()
+        self.started = None
+        # Set by cancel(); long tasks may poll it to stop early
+        self.cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def describe(self):
+        now = time.monotonic()
+        return {"id": self.id, "name": self.name, "device": self.device, "state": self.state,
+                "seconds": now - (self.started or self.submitted)}
+
+
+class TaskScheduler:
+    """
+    Bounded worker pool for the GUI's background work.
+
+    Tasks for the same device run one at a time, in the order they were
+    submitted, so commands sent to a device never interleave; tasks for
+    different devices (and tasks without a device) run in parallel on at
+    most max_workers daemon threads, started on demand (a worker stuck in
+    a blocking adb read does not keep the process alive).
+
+    on_done(result) / on_error(exception) are handed to dispatch, e.g.
+    lambda fn: root.after(0, fn) to run them on the Tk thread. A cancelled
+    task is dropped if it is still queued; a running one is left to finish
+    (it can poll task.cancelled) and its callbacks are skipped. Passing
+    owner= ties a task to a widget: it is cancelled when the widget is
+    destroyed. on_change() is called whenever the queue changes.
+    """
+
+    def __init__(self, max_workers=8, dispatch=None, on_change=None):
+        self.max_workers = max_workers
+        self.dispatch = dispatch or (lambda fn: fn())
+        self.on_change = on_change
+        self._queue = deque()
+        self._running = []
+        self._busy_devices = set()
+        self._threads = []
+        self._idle = 0
+        self._stopped = False
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+
+    def submit(self, func, device=None, name="", on_done=None, on_error=None, owner=None):
+        """Queues func() and returns its Task."""
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("scheduler is shut down")
+            task = Task(next(self._ids), func, device, name, on_done, on_error)
+            self._queue.append(task)
+            # Idle workers may not have woken up for earlier submits yet
+            if len(self._queue) > self._idle and len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, name=f"Task-{len(self._threads) + 1}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        if owner is not None:
+            owner.bind("<Destroy>", lambda e: self.cancel(task) if e.widget is owner else None, add="+")
+        self._changed()
+        return task
+
+    def cancel(self, task):
+        """Cancels a queued or running task; returns False if it had already finished."""
+        with self._cond:
+            if task.state == QUEUED:
+                self._queue.remove(task)
+                task.state = CANCELLED
+            elif task.state != RUNNING:
+                return False
+            task.cancel_event.set()
+        self._changed()
+        return True
+
+    def cancel_all(self):
+        with self._cond:
+            tasks = list(self._queue) + list(self._running)
+        for task in tasks:
+            self.cancel(task)
+
+    def shutdown(self):
+        """Cancels every task and lets the workers exit once their current task returns."""
+        self.cancel_all()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def find(self, task_id):
+        """The running or queued task with this id, or None."""
+        with self._cond:
+            for task in itertools.chain(self._running, self._queue):
+                if task.id == task_id:
+                    return task
+        return None
+
+    def snapshot(self):
+        """Running and queued tasks as dicts (id, name, device, state, seconds), oldest first."""
+        with self._cond:
+            return {"running": [task.describe() for task in self._running],
+                    "queued": [task.describe() for task in self._queue]}
+
+    def _changed(self):
+        if self.on_change:
+            try:
+                self.on_change()
+            except RuntimeError:
+                pass  # Tk already destroyed
+
+    def _next_task(self):
+        # First queued task whose device is not busy; called with the lock held
+        for index, task in enumerate(self._queue):
+            if task.device is None or task.device not in self._busy_devices:
+                del self._queue[index]
+                return task
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    if self._stopped:
+                        return
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                    task = self._next_task()
+                task.state = RUNNING
+                task.started = time.monotonic()
+                self._running.append(task)
+                if task.device is not None:
+                    self._busy_devices.add(task.device)
+            self._changed()
+
+            result = error = None
+            try:
+                result = task.func()
+            except Exception as e:
+                error = e
+
+            with self._cond:
+                self._running.remove(task)
+                self._busy_devices.discard(task.device)
+                task.state = CANCELLED if task.cancelled else FAILED if error is not None else DONE
+                # The device's next task may run now
+                self._cond.notify_all()
+            self._changed()
+            self._deliver(task, result, error)
+
+    def _deliver(self, task, result, error):
+        if task.cancelled:
+            return
+        if error is not None and not task.on_error:
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return
+        if error is not None:
+            callback = lambda: task.on_error(error)
+        else:
+            callback = (lambda: task.on_done(result)) if task.on_done else None
+        if callback:
+            try:
+                self.dispatch(callback)
+            except RuntimeError:
+                pass  # Tk already destroyed
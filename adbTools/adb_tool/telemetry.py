@@ -0,0 +1,245 @@
+import math
+import os
+import threading
+import time
+from array import array
+
+# Metrics kept per device, in column order
+FIELDS = ("battery_level", "battery_temp", "mem_used", "cpu")
+
+# One shell command per device per tick; sections are split on the marker line
+SECTION_MARKER = "@@"
+PROBE_COMMAND = (f"dumpsys battery; echo {SECTION_MARKER}; cat /proc/meminfo; "
+                 f"echo {SECTION_MARKER}; head -n 1 /proc/stat")
+
+
+def parse_probe(output, previous_cpu=None):
+    """
+    Parses the output of PROBE_COMMAND. Returns (metrics, cpu_counters):
+    metrics maps FIELDS to floats (NaN when missing): battery level in %,
+    battery temperature in °C, used memory in % and CPU load in % since
+    previous_cpu, the (busy, total) counters of the last sample.
+    """
+    sections = output.split(SECTION_MARKER)
+    sections += [""] * (3 - len(sections))
+    metrics = dict.fromkeys(FIELDS, math.nan)
+
+    for line in sections[0].splitlines():
+        key, _, value = line.strip().partition(": ")
+        if key == "level" and value.isdigit():
+            metrics["battery_level"] = float(value)
+        elif key == "temperature" and value.lstrip("-").isdigit():
+            metrics["battery_temp"] = int(value) / 10.0  # tenths of a degree
+
+    memory = {}
+    for line in sections[1].splitlines():
+        key, _, value = line.partition(":")
+        fields = value.split()
+        if fields and fields[0].isdigit():
+            memory[key.strip()] = int(fields[0])
+    if memory.get("MemTotal") and "MemAvailable" in memory:
+        metrics["mem_used"] = 100.0 * (1 - memory["MemAvailable"] / memory["MemTotal"])
+
+    cpu = None
+    fields = sections[2].split()
+    if len(fields) >= 5 and fields[0] == "cpu":
+        counters = [int(value) for value in fields[1:] if value.isdigit()]
+        idle = counters[3] + (counters[4] if len(counters) > 4 else 0)  # idle + iowait
+        total = sum(counters)
+        cpu = (total - idle, total)
+        if previous_cpu and total > previous_cpu[1]:
+            metrics["cpu"] = 100.0 * (cpu[0] - previous_cpu[0]) / (total - previous_cpu[1])
+    return metrics, cpu
+
+
+class RingBuffer:
+    """
+    Fixed-capacity time series stored column-wise in array('d') buffers.
+    Appending past the capacity overwrites the oldest row; missing values
+    are NaN.
+    """
+
+    def __init__(self, fields=FIELDS, capacity=720):
+        self.fields = fields
+        self.capacity = capacity
+        self.times = array("d", [0.0]) * capacity
+        self.columns = {field: array("d", [math.nan]) * capacity for field in fields}
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, values):
+        if self.count < self.capacity:
+            index = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            index = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.times[index] = timestamp
+        for field in self.fields:
+            self.columns[field][index] = values.get(field, math.nan)
+
+    def _ordered(self, data):
+        if self.count < self.capacity:
+            return data[self.start:self.start + self.count]
+        return data[self.start:] + data[:self.start]
+
+    def series(self, field):
+        """(times, values) arrays of one field, oldest first."""
+        return self._ordered(self.times), self._ordered(self.columns[field])
+
+    def latest(self):
+        if not self.count:
+            return None
+        index = (self.start + self.count - 1) % self.capacity
+        return {field: self.columns[field][index] for field in self.fields}
+
+
+class CsvSink:
+    """Appends samples to a CSV file (header written for a new file)."""
+
+    def __init__(self, path):
+        import csv
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if new_file:
+            self._writer.writerow(("time", "serial") + FIELDS)
+
+    def write(self, rows):
+        for timestamp, serial, values in rows:
+            self._writer.writerow([f"{timestamp:.3f}", serial] +
+                                  ["" if math.isnan(values[field]) else f"{values[field]:.2f}" for field in FIELDS])
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class SqliteSink:
+    """Stores samples in a SQLite table 'samples' (time, serial, metrics...)."""
+
+    def __init__(self, path):
+        import sqlite3
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        columns = ", ".join(f"{field} REAL" for field in FIELDS)
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS samples (time REAL NOT NULL, serial TEXT NOT NULL, {columns})")
+        self._db.execute("CREATE INDEX IF NOT EXISTS samples_serial_time ON samples (serial, time)")
+        self._db.commit()
+
+    def write(self, rows):
+        placeholders = ", ".join("?" * (len(FIELDS) + 2))
+        self._db.executemany(
+            f"INSERT INTO samples VALUES ({placeholders})",
+            [(timestamp, serial, *(None if math.isnan(values[field]) else values[field] for field in FIELDS))
+             for timestamp, serial, values in rows])
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def open_sink(path):
+    """CSV or SQLite sink, chosen by the file extension (.csv, otherwise SQLite)."""
+    if path.lower().endswith(".csv"):
+        return CsvSink(path)
+    return SqliteSink(path)
+
+
+class TelemetrySampler:
+    """
+    Polls battery, temperature, memory and CPU of many devices on a fixed
+    schedule.
+
+    Every tick runs PROBE_COMMAND once per device, concurrently through
+    AdbManager.fan_out, appends the parsed values to that device's
+    RingBuffer and hands the rows to an optional sink (CsvSink/SqliteSink).
+    device_ids() is called every tick so devices can come and go.
+    on_tick(timestamp, rows) is called from the sampler thread.
+    """
+
+    def __init__(self, manager, device_ids=None, interval=5.0, capacity=720, sink=None, on_tick=None):
+        self.manager = manager
+        self.device_ids = device_ids or (lambda: [dev_id for dev_id, _ in manager.get_devices()])
+        self.interval = interval
+        self.capacity = capacity
+        self.sink = sink
+        self.on_tick = on_tick
+        self.buffers = {}
+        self.ticks = 0
+        self._cpu = {}
+        self._lock = threading.Lock()
+        self._sink_lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._stop is not None and not self._stop.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        # Each run has its own stop event, so a restart never revives a stopping thread
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="Telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops sampling after the current tick. The sink stays open (see set_sink)."""
+        if self._stop is not None:
+            self._stop.set()
+
+    def set_sink(self, sink):
+        """Replaces the sink (None to stop recording), closing the previous one."""
+        with self._sink_lock:
+            old, self.sink = self.sink, sink
+            if old:
+                old.close()
+
+    def snapshot(self, field):
+        """{serial: (times, values)} for one field, copied under the lock for drawing."""
+        with self._lock:
+            return {serial: buffer.series(field) for serial, buffer in self.buffers.items()}
+
+    def sample_device(self, device_id):
+        metrics, cpu = parse_probe(self.manager._run_shell(device_id, PROBE_COMMAND), self._cpu.get(device_id))
+        if cpu:
+            self._cpu[device_id] = cpu
+        return metrics
+
+    def tick(self):
+        """Samples every device once and returns the (timestamp, serial, metrics) rows."""
+        timestamp = time.time()
+        results = self.manager.fan_out(self.sample_device, self.device_ids(), max_workers=32,
+                                       timeout=self.interval)
+        rows = [(timestamp, r["device_id"], r["result"]) for r in results if r["ok"]]
+        with self._lock:
+            for _, serial, metrics in rows:
+                buffer = self.buffers.get(serial)
+                if buffer is None:
+                    buffer = self.buffers[serial] = RingBuffer(FIELDS, self.capacity)
+                buffer.append(timestamp, metrics)
+            self.ticks += 1
+        with self._sink_lock:
+            if self.sink and rows:
+                try:
+                    self.sink.write(rows)
+                except Exception:
+                    pass  # A full disk or locked database must not stop the monitoring
+        if self.on_tick:
+            self.on_tick(timestamp, rows)
+        return rows
+
+    def _run(self, stop):
+        next_tick = time.monotonic()
+        while not stop.is_set():
+            self.tick()
+            next_tick += self.interval
+            # Skip missed ticks instead of bursting after a slow round
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now
+            stop.wait(next_tick - now)
@@ -0,0 +1,196 @@
+import json
+import os
+import shlex
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class RollingHistogram:
+    """
+    Latency distribution over the last `window` samples (milliseconds).
+    Lifetime count/total are kept separately from the rolling window.
+    """
+
+    # Upper bounds of the display buckets in ms; the last bucket is open ended
+    BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.errors = 0
+
+    def add(self, ms, error=False):
+        self.samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+        if error:
+            self.errors += 1
+
+    def percentile(self, fraction, ordered=None):
+        ordered = ordered if ordered is not None else sorted(self.samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def buckets(self):
+        """Returns [(upper_bound_ms or None, count)] for the rolling window."""
+        counts = [0] * (len(self.BUCKETS) + 1)
+        for ms in self.samples:
+            index = 0
+            while index < len(self.BUCKETS) and ms > self.BUCKETS[index]:
+                index += 1
+            counts[index] += 1
+        return list(zip(self.BUCKETS + [None], counts))
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50, ordered),
+            "p95_ms": self.percentile(0.95, ordered),
+            "p99_ms": self.percentile(0.99, ordered),
+            "max_ms": ordered[-1] if ordered else 0.0,
+        }
+
+
+class Tracer:
+    """
+    Records timing spans for adb commands, terminals and GUI actions.
+
+    Completed spans go into a bounded event buffer (exportable as a Chrome
+    trace, viewable in chrome://tracing or Perfetto) and into a rolling
+    histogram per span name. Spans nest naturally per thread, e.g. an
+    'action 13' span contains the 'shell dumpsys' span it issued.
+    """
+
+    def __init__(self, max_events=20000, window=1000):
+        self.enabled = True
+        self.window = window
+        self.events = deque(maxlen=max_events)
+        self.histograms = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name, category="adb", **args):
+        """
+        Times the enclosed block. Yields the args dict so the caller can add
+        results (exit_code, bytes, ...). A span that raises is recorded with
+        an 'error' arg. Setting args['error'] also marks it as failed.
+        """
+        if not self.enabled:
+            yield args
+            return
+        started = time.perf_counter()
+        try:
+            yield args
+        except GeneratorExit:
+            # A streaming consumer stopped early; not an error
+            raise
+        except BaseException as e:
+            args["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.record(name, category, started, time.perf_counter(), args)
+
+    def record(self, name, category, started, finished, args=None):
+        """Adds a completed span (perf_counter timestamps)."""
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (started - self._origin) * 1e6,
+            "dur": (finished - started) * 1e6,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+            "thread": thread.name,
+            "args": dict(args or {}),
+        }
+        with self._lock:
+            self.events.append(event)
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.window)
+            histogram.add((finished - started) * 1000, error="error" in event["args"])
+
+    def summary(self):
+        """Returns per span name statistics, slowest p95 first."""
+        with self._lock:
+            rows = [dict(name=name, **histogram.summary()) for name, histogram in self.histograms.items()]
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.histograms.clear()
+
+    def export_chrome_trace(self, path):
+        """
+        Writes the recorded spans in Chrome trace event format (JSON object
+        form), with the histogram summary under 'otherData'.
+        """
+        with self._lock:
+            events = list(self.events)
+        threads = {}
+        trace_events = []
+        for event in events:
+            threads[(event["pid"], event["tid"])] = event["thread"]
+            trace_events.append({key: value for key, value in event.items() if key != "thread"})
+        for (pid, tid), thread_name in threads.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                                 "args": {"name": thread_name}})
+        data = {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {"summary": self.summary()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        return len(events)
+
+
+# Process-wide tracer used by utils, AdbManager and the GUI
+tracer = Tracer()
+
+
+def command_name(prefix, command):
+    """Span name for a device command: prefix plus the program, e.g. 'shell dumpsys'."""
+    words = command.split(None, 1)
+    return f"{prefix} {words[0]}" if words else prefix
+
+
+def _split(args):
+    if isinstance(args, str):
+        try:
+            return [arg.strip('"') for arg in shlex.split(args, posix=False)]
+        except ValueError:
+            return args.split()
+    return list(args)
+
+
+def process_name(args):
+    """Span name for a spawned command: program plus subcommand, e.g. 'adb push'."""
+    args = _split(args)
+    if not args:
+        return "process"
+    program = os.path.splitext(os.path.basename(args[0]))[0]
+    rest = args[1:]
+    while rest and rest[0].startswith("-"):
+        # Skip options, including the value of '-s SERIAL'
+        rest = rest[2:] if rest[0] == "-s" else rest[1:]
+    return f"{program} {rest[0]}" if rest else program
+
+
+def device_from_args(args):
+    """Returns the serial passed with '-s' in an adb argument list, if any."""
+    args = _split(args)
+    for index, arg in enumerate(args[:-1]):
+        if arg == "-s":
+            return args[index + 1]
+    return None
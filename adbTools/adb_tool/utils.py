@@ -1,15 +1,31 @@
-import platform
 import subprocess
 import os
 import shlex
+from .tracing import tracer, device_from_args, process_name
 
 def get_platform():
+    import platform
     return platform.system()
 
+def get_data_dir():
+    """
+    Returns the per-user directory used for caches and settings, creating it if needed.
+    """
+    path = os.path.join(os.path.expanduser("~"), ".adb_tool")
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        pass
+    return path
+
 def open_terminal(command, title="Terminal"):
     """
     Opens a new terminal window and executes the given command.
     """
+    with tracer.span("open_terminal", "terminal", command=command, title=title, device=device_from_args(command)):
+        _open_terminal(command, title)
+
+def _open_terminal(command, title):
     system = get_platform()
     
     if system == "Windows":
@@ -42,8 +58,60 @@ def run_command_get_output(command):
     """
     Runs a command and returns its output as a string.
     """
-    try:
-        result = subprocess.check_output(command, shell=True, stderr=subprocess.STDOUT)
-        return result.decode('utf-8', errors='replace').strip()
-    except subprocess.CalledProcessError as e:
-        return ""
+    with tracer.span(process_name(command), "process", command=command, device=device_from_args(command)) as span:
+        try:
+            result = subprocess.check_output(command, shell=True, stderr=subprocess.STDOUT)
+            span.update(exit_code=0, bytes=len(result))
+            return result.decode('utf-8', errors='replace').strip()
+        except subprocess.CalledProcessError as e:
+            span.update(exit_code=e.returncode, bytes=len(e.output or b""), error=f"exit {e.returncode}")
+            return ""
+
+def run_args_get_output(args):
+    """
+    Runs a command given as an argument list (no shell) and returns its output as a string.
+    """
+    with tracer.span(process_name(args), "process", command=subprocess.list2cmdline(args),
+                     device=device_from_args(args)) as span:
+        try:
+            result = subprocess.check_output(args, stderr=subprocess.STDOUT)
+            span.update(exit_code=0, bytes=len(result))
+            return result.decode('utf-8', errors='replace').strip()
+        except subprocess.CalledProcessError as e:
+            span.update(exit_code=e.returncode, bytes=len(e.output or b""), error=f"exit {e.returncode}")
+            return ""
+        except OSError as e:
+            span["error"] = str(e)
+            return ""
+
+def stream_args_output(args):
+    """
+    Runs a command given as an argument list and yields its output line by line.
+    The process is killed if the consumer stops reading early.
+    """
+    with tracer.span(process_name(args), "process", command=subprocess.list2cmdline(args),
+                     device=device_from_args(args), stream=True) as span:
+        try:
+            proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except OSError as e:
+            span["error"] = str(e)
+            return
+        received = 0
+        try:
+            for line in proc.stdout:
+                received += len(line)
+                yield line.decode('utf-8', errors='replace').rstrip('\r\n')
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            span.update(exit_code=proc.wait(), bytes=received)
+
+def format_size(size):
+    """
+    Formats a byte count for display, e.g. 1536 -> '1.5 KB'.
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
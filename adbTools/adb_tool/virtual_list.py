@@ -0,0 +1,135 @@
+import tkinter as tk
+import tkinter.font as tkfont
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+
+class VirtualList(ttk.Frame):
+    """
+    List widget backed by a model instead of widget rows.
+
+    Only the rows that fit in the window are inserted into the inner
+    Listbox; scrolling and selection are tracked as model indexes, so
+    changing the model (filtering, label updates) costs one repaint of the
+    visible rows no matter how many items there are.
+    The model is given with set_model(count, get_text).
+    """
+
+    def __init__(self, master, font=("Consolas", 10), **kwargs):
+        super().__init__(master, **kwargs)
+        self._count = 0
+        self._get_text = lambda index: ""
+        self._top = 0
+        self._rows = 1
+        self._selected = None
+        self._on_activate = None
+
+        self.scrollbar = ttk.Scrollbar(self, command=self.yview, bootstyle="secondary-round")
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.listbox = tk.Listbox(self, font=font, activestyle="none", exportselection=False)
+        self.listbox.pack(side=LEFT, fill=BOTH, expand=YES)
+        self._line_height = tkfont.Font(font=font).metrics("linespace") + 1
+
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<Double-Button-1>", self._on_double_click)
+        self.listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda e: self._scroll_units(-3))
+        self.listbox.bind("<Button-5>", lambda e: self._scroll_units(3))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self._move_selection(-self._rows))
+        self.listbox.bind("<Next>", lambda e: self._move_selection(self._rows))
+        self.listbox.bind("<Return>", self._on_double_click)
+
+    def set_model(self, count, get_text, keep_position=False):
+        """Replaces the model; get_text(index) returns the text of row index."""
+        self._count = count
+        self._get_text = get_text
+        if not keep_position:
+            self._top = 0
+            self._selected = None
+        self._clamp()
+        self.refresh()
+
+    def bind_activate(self, callback):
+        """callback(index) runs on double-click or Enter on a row."""
+        self._on_activate = callback
+
+    def selection(self):
+        """Returns the selected model index or None."""
+        return self._selected
+
+    def refresh(self):
+        """Repaints the visible rows from the model."""
+        end = min(self._top + self._rows, self._count)
+        self.listbox.delete(0, tk.END)
+        for index in range(self._top, end):
+            self.listbox.insert(tk.END, self._get_text(index))
+        if self._selected is not None and self._top <= self._selected < end:
+            self.listbox.selection_set(self._selected - self._top)
+        if self._count:
+            self.scrollbar.set(self._top / self._count, end / self._count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * self._count)
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self._rows if args[2] == "pages" else 1)
+            self._top += step
+        self._clamp()
+        self.refresh()
+
+    def see(self, index):
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + self._rows:
+            self._top = index - self._rows + 1
+        self._clamp()
+
+    def _clamp(self):
+        self._top = max(0, min(self._top, self._count - self._rows))
+        if self._selected is not None and self._selected >= self._count:
+            self._selected = None
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self._line_height)
+        if rows != self._rows:
+            self._rows = rows
+            self._clamp()
+            self.refresh()
+
+    def _on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self._selected = self._top + selection[0]
+
+    def _on_double_click(self, event):
+        self._on_select(event)
+        if self._selected is not None and self._on_activate:
+            self._on_activate(self._selected)
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self._scroll_units(-delta * 3)
+
+    def _scroll_units(self, units):
+        self._top += units
+        self._clamp()
+        self.refresh()
+        return "break"
+
+    def _move_selection(self, step):
+        if not self._count:
+            return "break"
+        current = self._top if self._selected is None else self._selected
+        self._selected = max(0, min(self._count - 1, current + step))
+        self.see(self._selected)
+        self.refresh()
+        return "break"
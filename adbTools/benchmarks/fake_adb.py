@@ -0,0 +1,361 @@
+"""
+Simulated device farm for the benchmarks.
+
+FakeDeviceFarm generates the output of the shell commands AdbManager uses
+(package lists, dumpsys/pm dump, batched label scripts, directory listings)
+for any number of fake devices, with a configurable per-command latency.
+It is served two ways:
+
+- FakeAdbServer speaks the adb smart-socket protocol (host:devices,
+  host:transport + shell:/exec:, sync: SEND/LIST) on a local port, like the real
+  adb server. 'exec:sh' runs commands framed like ShellSession sends them.
+  Requests are logged and pushed files kept, for the tests in tests/.
+- Running this file as a script behaves like the adb client executable
+  ('adb devices', 'adb -s SERIAL shell CMD', 'adb -s SERIAL push A B',
+  'adb -s SERIAL ls DIR'),
+  reading the farm settings from the FAKE_ADB_CONFIG environment variable.
+  write_adb_wrapper() creates an 'adb' launcher for it.
+"""
+import json
+import os
+import random
+import re
+import shlex
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+CONFIG_ENV = "FAKE_ADB_CONFIG"
+# The script AdbManager.get_app_labels runs for a batch of packages
+LABEL_LOOP_RE = re.compile(r'for p in ([^;]*); do echo "([^"$]*)\$p"; '
+                           r'pm dump \$p \| grep -m 1 applicationLabel=; done; echo "([^"]*)"$')
+
+
+class FakeDeviceFarm:
+    """
+    Output generator for a set of fake devices.
+    latency_ms (+ random jitter_ms) is slept before every command, the sizes
+    control how much output each command produces. A command in an open
+    shell session skips starting a shell and only sleeps session_latency_ms.
+    """
+
+    def __init__(self, devices=1, latency_ms=5.0, jitter_ms=1.0, packages=300, dump_kb=16,
+                 dir_entries=200, seed=0, session_latency_ms=0.5):
+        self.config = {
+            "devices": devices, "latency_ms": latency_ms, "jitter_ms": jitter_ms,
+            "packages": packages, "dump_kb": dump_kb, "dir_entries": dir_entries, "seed": seed,
+            "session_latency_ms": session_latency_ms,
+        }
+        self.serials = [f"FAKE{i:04d}" for i in range(devices)]
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.dump_kb = dump_kb
+        self.dir_entries = dir_entries
+        self.session_latency_ms = session_latency_ms
+        # (serial, remote path) -> (data, mode, mtime) of files received over sync SEND
+        self.pushed = {}
+        rng = random.Random(seed)
+        vendors = ["com.wjthinkbig", "com.android", "com.google.android", "com.samsung.android"]
+        self.packages = [f"{rng.choice(vendors)}.app{i:05d}" for i in range(packages)]
+        self._random = random.Random(seed + 1)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
+
+    def delay(self):
+        jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        time.sleep((self.latency_ms + jitter) / 1000.0)
+
+    def devices_text(self):
+        return "".join(f"{serial}\tdevice\n" for serial in self.serials)
+
+    def _package_block(self, package):
+        return (f"  Package [{package}] (1a2b3c):\n"
+                f"    userId=10{len(package):03d}\n"
+                f"    pkg=Package{{1a2b3c {package}}}\n"
+                f"    codePath=/data/app/{package}-1\n"
+                f"    dataDir=/data/user/0/{package}\n"
+                f"    versionCode={1000 + len(package)} minSdk=24 targetSdk=33\n"
+                f"    versionName=1.0.{len(package)}\n"
+                f"    pkgFlags=[ HAS_CODE ALLOW_CLEAR_USER_DATA ]\n"
+                f"    firstInstallTime=2024-01-01 00:00:00\n"
+                f"    lastUpdateTime=2024-01-01 00:00:00\n"
+                f"    User 0: ceDataInode=4242 installed=true hidden=false stopped=false enabled=0\n")
+
+    def _app_dump(self, package):
+        """'pm dump <package>' output, padded to dump_kb."""
+        lines = [
+            f"Packages:\n  Package [{package}] (1a2b3c):",
+            f"    codePath=/data/app/{package}-1",
+            f"    dataDir=/data/user/0/{package}",
+            f"    versionCode={1000 + len(package)} minSdk=24 targetSdk=33",
+            "    versionName=1.0.0",
+            "    applicationLabel=Fake App",
+            "    firstInstallTime=2024-01-01 00:00:00",
+            "    lastUpdateTime=2024-01-01 00:00:00",
+        ]
+        text = "\n".join(lines) + "\n"
+        padding = max(0, self.dump_kb * 1024 - len(text))
+        filler = "    Permission [android.permission.INTERNET] granted=true\n"
+        return text + filler * (padding // len(filler))
+
+    def exit_code(self, command):
+        """Exit code of a shell command: N for 'exit N', otherwise 0."""
+        words = command.split()
+        return int(words[1]) if len(words) == 2 and words[0] == "exit" and words[1].isdigit() else 0
+
+    def shell(self, serial, command):
+        """Returns the output of a shell command as bytes ('' for unknown commands)."""
+        command = command.strip()
+        if command.startswith("pm list packages"):
+            return "".join(f"package:{p}\n" for p in self.packages).encode()
+        if command.startswith("dumpsys package "):
+            target = command.split()[2]
+            packages = self.packages if target == "packages" else [target]
+            return ("Packages:\n" + "".join(self._package_block(p) for p in packages)).encode()
+        loop = LABEL_LOOP_RE.match(command)
+        if loop:
+            # get_app_labels' batched script: a marker line and the grepped label per package
+            packages, marker, end_marker = loop.groups()
+            output = ""
+            for package in packages.split():
+                labels = [line for line in self._app_dump(package).splitlines() if "applicationLabel=" in line]
+                output += "".join(f"{line}\n" for line in [marker + package] + labels[:1])
+            return (output + end_marker + "\n").encode()
+        if command.startswith("pm dump "):
+            return self._app_dump(command.split()[2]).encode()
+        if command.startswith("dumpsys battery"):
+            # Telemetry probe: battery, then /proc/meminfo and /proc/stat sections
+            tick = int(time.time())
+            sections = [f"Current Battery Service state:\n  level: {100 - tick % 100}\n  temperature: {300 + tick % 50}\n",
+                        "MemTotal:        2912345 kB\nMemAvailable:    1456172 kB\n",
+                        f"cpu  {tick * 3} 0 {tick} {tick * 6} {tick // 10} 0 0 0 0 0\n"]
+            return "@@\n".join(sections[:command.count("echo") + 1]).encode()
+        if command == "getprop":
+            props = {"ro.product.model": "SM-T583", "ro.product.manufacturer": "samsung",
+                     "ro.build.version.release": "8.1.0", "ro.build.version.sdk": "27",
+                     "ro.build.display.id": "M1AJQ.T583XXU5CSJ1", "ro.serialno": serial}
+            # A real dump has several hundred properties
+            props.update({f"persist.fake.prop{i:03d}": str(i) for i in range(400)})
+            return "".join(f"[{key}]: [{value}]\n" for key, value in props.items()).encode()
+        if command.startswith("ls "):
+            entries = [name + "/" if mode & 0o40000 else name for name, mode, _, _ in self.list_dir(serial, "")]
+            return ("\n".join(entries) + "\n").encode()
+        return b""
+
+    def list_dir(self, serial, path):
+        """Directory entries as (name, mode, size, mtime) tuples, like a sync LIST reply."""
+        entries = []
+        for i in range(self.dir_entries):
+            if i % 4 == 0:
+                entries.append((f"dir{i:04d}", 0o40771, 4096, 1704067200))
+            else:
+                entries.append((f"file{i:04d}.dat", 0o100660, 1024 * i, 1704067200 + i))
+        return entries
+
+
+class FakeAdbServer:
+    """Minimal adb server on 127.0.0.1 serving a FakeDeviceFarm."""
+
+    # sync SEND to these paths is refused like on a read-only partition
+    READ_ONLY_PREFIXES = ("/system/",)
+
+    def __init__(self, farm, port=0):
+        self.farm = farm
+        self.requests = []  # every smart-socket request received, in order
+        self._sock = socket.socket()
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", port))
+        self._sock.listen(256)
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._sock.close()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def _recv_exact(conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise EOFError
+            data += chunk
+        return data
+
+    def _request(self, conn):
+        request = self._recv_exact(conn, int(self._recv_exact(conn, 4), 16)).decode()
+        self.requests.append(request)
+        return request
+
+    @staticmethod
+    def _fail(conn, message):
+        payload = message.encode()
+        conn.sendall(b"FAIL" + b"%04x" % len(payload) + payload)
+
+    def _handle(self, conn):
+        try:
+            request = self._request(conn)
+            if request == "host:version":
+                conn.sendall(b"OKAY00040029")
+            elif request == "host:devices":
+                payload = self.farm.devices_text().encode()
+                conn.sendall(b"OKAY" + b"%04x" % len(payload) + payload)
+            elif request.startswith("host:transport:"):
+                serial = request.split(":", 2)[2]
+                if serial not in self.farm.serials:
+                    self._fail(conn, f"device '{serial}' not found")
+                    return
+                conn.sendall(b"OKAY")
+                service = self._request(conn)
+                conn.sendall(b"OKAY")
+                if service == "exec:sh":
+                    self.farm.delay()
+                    self._shell_session(conn, serial)
+                elif service.startswith(("shell:", "exec:")):
+                    self.farm.delay()
+                    conn.sendall(self.farm.shell(serial, service.split(":", 1)[1]))
+                elif service == "sync:":
+                    self._sync(conn, serial)
+            else:
+                self._fail(conn, f"unknown request {request}")
+        except (EOFError, OSError, ValueError):
+            pass
+        finally:
+            conn.close()
+
+    def _shell_session(self, conn, serial):
+        """
+        Serves commands framed as "sh -c '<command>' 2>&1 </dev/null" (the
+        quoted command may span lines), then "printf '\\n%s %d\\n' SENTINEL $?",
+        until the client disconnects.
+        """
+        pending = b""
+        command = None
+        output = b""
+        code = 0
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                return
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                line = line.decode()
+                if command is None and line.startswith("sh -c "):
+                    command = []
+                if command is not None:
+                    command.append(line)
+                    if line.endswith(" 2>&1 </dev/null"):
+                        try:
+                            args = shlex.split("\n".join(command))
+                        except ValueError:
+                            continue  # the closing quote is on a later line
+                        time.sleep(self.farm.session_latency_ms / 1000.0)
+                        output = self.farm.shell(serial, args[2])
+                        code = self.farm.exit_code(args[2])
+                        command = None
+                elif line.startswith("printf "):
+                    conn.sendall(output + f"\n{line.split()[-2]} {code}\n".encode())
+                elif line == "exit":
+                    return
+
+    def _sync(self, conn, serial):
+        while True:
+            command, length = struct.unpack("<4sI", self._recv_exact(conn, 8))
+            if command == b"QUIT":
+                return
+            if command == b"LIST":
+                path = self._recv_exact(conn, length).decode()
+                self.farm.delay()
+                reply = b""
+                for name, mode, size, mtime in [(".", 0o40771, 4096, 0)] + self.farm.list_dir(serial, path):
+                    encoded = name.encode()
+                    reply += struct.pack("<4sIIII", b"DENT", mode, size, mtime, len(encoded)) + encoded
+                conn.sendall(reply + struct.pack("<4sIIII", b"DONE", 0, 0, 0, 0))
+                continue
+            if command != b"SEND":
+                return
+            path, mode = self._recv_exact(conn, length).decode().rsplit(",", 1)
+            chunks = []
+            while True:
+                chunk_id, size = struct.unpack("<4sI", self._recv_exact(conn, 8))
+                if chunk_id == b"DONE":
+                    break
+                chunks.append(self._recv_exact(conn, size))
+            self.farm.delay()
+            if path.startswith(self.READ_ONLY_PREFIXES):
+                message = b"couldn't create file: Read-only file system"
+                conn.sendall(struct.pack("<4sI", b"FAIL", len(message)) + message)
+                return  # adbd ends the sync session after a FAIL
+            self.farm.pushed[(serial, path)] = (b"".join(chunks), int(mode), size)
+            conn.sendall(struct.pack("<4sI", b"OKAY", 0))
+
+
+def write_adb_wrapper(farm, directory=None):
+    """
+    Writes an 'adb' launcher that runs this module as the fake adb client for
+    the given farm. Returns its path.
+    """
+    directory = directory or tempfile.mkdtemp(prefix="fake_adb_")
+    script = os.path.abspath(__file__)
+    config = json.dumps(farm.config).replace('"', '\\"')
+    if os.name == "nt":
+        path = os.path.join(directory, "adb.bat")
+        with open(path, "w") as f:
+            f.write(f'@set "{CONFIG_ENV}={json.dumps(farm.config)}"\n@"{sys.executable}" "{script}" %*\n')
+    else:
+        path = os.path.join(directory, "adb")
+        with open(path, "w") as f:
+            f.write(f'#!/bin/sh\n{CONFIG_ENV}="{config}" exec "{sys.executable}" "{script}" "$@"\n')
+        os.chmod(path, 0o755)
+    return path
+
+
+def main(argv):
+    farm = FakeDeviceFarm.from_config(json.loads(os.environ.get(CONFIG_ENV, "{}")))
+    serial = farm.serials[0] if farm.serials else None
+    if len(argv) >= 2 and argv[0] == "-s":
+        serial, argv = argv[1], argv[2:]
+    if not argv:
+        return 1
+    command = argv[0]
+    if command == "devices":
+        sys.stdout.write("List of devices attached\n" + farm.devices_text() + "\n")
+        return 0
+    if command in ("start-server", "kill-server"):
+        return 0
+    if serial not in farm.serials:
+        sys.stderr.write(f"adb: device '{serial}' not found\n")
+        return 1
+    farm.delay()
+    if command in ("shell", "exec-out"):
+        sys.stdout.flush()
+        sys.stdout.buffer.write(farm.shell(serial, " ".join(argv[1:])))
+        return 0
+    if command == "push" and len(argv) >= 3:
+        size = os.path.getsize(argv[1])
+        sys.stdout.write(f"{argv[1]}: 1 file pushed, 0 skipped. ({size} bytes in 0.001s)\n")
+        return 0
+    if command == "ls" and len(argv) >= 2:
+        for name, mode, size, mtime in farm.list_dir(serial, argv[1]):
+            sys.stdout.write(f"{mode:08x} {size:08x} {mtime:08x} {name}\n")
+        return 0
+    sys.stderr.write(f"adb: unknown command {command}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
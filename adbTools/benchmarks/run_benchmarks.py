@@ -0,0 +1,253 @@
+"""
+Benchmarks for the AdbManager hot paths against a simulated device farm.
+
+Runs offline: every device is served by benchmarks/fake_adb.py, either over
+the adb server socket protocol (--transport socket, the normal path) or by
+a fake adb executable (--transport cli, the fallback path). For each device
+count and method it reports p50/p95/p99 latency of sequential calls and the
+throughput of concurrent calls spread across the devices.
+
+    python benchmarks/run_benchmarks.py --devices 1,10,100
+    python benchmarks/run_benchmarks.py --save-baseline      # record
+    python benchmarks/run_benchmarks.py                      # compare
+
+When a baseline file exists the run exits with status 1 if any method's p50
+latency grew or its throughput dropped by more than --tolerance, and with
+status 2 if the baseline was recorded with different farm settings.
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from adb_tool.adb_client import AdbClient
+from adb_tool.adb_manager import AdbManager
+from adb_tool.package_cache import PackageCache
+from fake_adb import FakeDeviceFarm, FakeAdbServer, write_adb_wrapper
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class BenchContext:
+    """Per-run state the benchmark cases draw their arguments from."""
+
+    def __init__(self, farm, work_dir, push_kb):
+        self.farm = farm
+        self._packages = itertools.cycle(farm.packages or ["com.example.app"])
+        self.push_path = os.path.join(work_dir, "payload.bin")
+        with open(self.push_path, "wb") as f:
+            f.write(os.urandom(push_kb * 1024))
+
+    def next_package(self):
+        return next(self._packages)
+
+    def next_packages(self, count):
+        return [next(self._packages) for _ in range(count)]
+
+
+# name -> function(manager, device_id, context)
+CASES = {
+    "get_devices": lambda m, dev, ctx: m.get_devices(),
+    "get_installed_packages": lambda m, dev, ctx: m.get_installed_packages(dev),
+    "get_app_details": lambda m, dev, ctx: m.get_app_details(dev, ctx.next_package()),
+    "get_app_labels": lambda m, dev, ctx: m.get_app_labels(dev, ctx.next_packages(20)),
+    "execute_action": lambda m, dev, ctx: m.execute_action(6, dev, blocking=True),
+    "list_directories": lambda m, dev, ctx: m.list_directories(dev, "/sdcard/", refresh=True),
+    "list_directories_cached": lambda m, dev, ctx: m.list_directories(dev, "/sdcard/"),
+    "push_file": lambda m, dev, ctx: m.push_file(dev, ctx.push_path, "/sdcard/Download/"),
+}
+
+
+@contextlib.contextmanager
+def isolated_home(work_dir):
+    """Points the home directory, and so get_data_dir(), at work_dir while the block runs."""
+    saved = {name: os.environ.get(name) for name in ("HOME", "USERPROFILE")}
+    os.environ.update(HOME=work_dir, USERPROFILE=work_dir)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def make_manager(farm, transport, work_dir):
+    """An AdbManager on the fake farm; call it inside isolated_home(work_dir)."""
+    manager = AdbManager()
+    manager.adb_path = write_adb_wrapper(farm, work_dir)
+    manager.package_cache = PackageCache(path=":memory:")
+    server = None
+    if transport == "socket":
+        server = FakeAdbServer(farm)
+        manager.client = AdbClient(port=server.port)
+    else:
+        # Port 1 is never an adb server: every call takes the adb client path
+        manager.client = AdbClient(port=1, timeout=0.2)
+        manager.client.mark_unavailable()
+        manager.client.retry_interval = 1e9
+    return manager, server
+
+
+def run_case(manager, func, devices, context, iterations, concurrency, warmup, duration):
+    device_cycle = itertools.cycle(devices)
+    for _ in range(warmup):
+        func(manager, next(device_cycle), context)
+
+    latencies = []
+    for _ in range(iterations):
+        device_id = next(device_cycle)
+        started = time.perf_counter()
+        func(manager, device_id, context)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    # Throughput: concurrent workers spread over the devices for a fixed time
+    deadline = time.perf_counter() + duration
+    calls = [0] * concurrency
+
+    def worker(slot):
+        offset = slot
+        while time.perf_counter() < deadline:
+            func(manager, devices[offset % len(devices)], context)
+            calls[slot] += 1
+            offset += concurrency
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "throughput": sum(calls) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Returns a list of regression messages (results vs baseline)."""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if current["p50_ms"] > base["p50_ms"] * (1 + tolerance) and \
+                current["p50_ms"] - base["p50_ms"] > min_delta_ms:
+            regressions.append(f"{key}: p50 {base['p50_ms']:.2f} -> {current['p50_ms']:.2f} ms")
+        if current["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {base['throughput']:.1f} -> {current['throughput']:.1f} ops/s")
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark AdbManager against a simulated device farm.")
+    parser.add_argument("--devices", default="1,10,100", help="comma separated device counts (default 1,10,100)")
+    parser.add_argument("--methods", default=",".join(CASES), help="comma separated methods to run")
+    parser.add_argument("--transport", choices=["socket", "cli"], default="socket")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds of the concurrent throughput run")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated per-command device latency")
+    parser.add_argument("--jitter-ms", type=float, default=1.0)
+    parser.add_argument("--packages", type=int, default=300, help="installed packages per device")
+    parser.add_argument("--dump-kb", type=int, default=16, help="size of 'pm dump' output")
+    parser.add_argument("--dir-entries", type=int, default=200, help="entries per directory listing")
+    parser.add_argument("--push-kb", type=int, default=256, help="size of the pushed file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="ignore p50 increases smaller than this (timer noise)")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    methods = [m.strip() for m in args.methods.split(",") if m.strip()]
+    unknown = [m for m in methods if m not in CASES]
+    if unknown:
+        print(f"Unknown methods: {', '.join(unknown)} (available: {', '.join(CASES)})")
+        return 2
+
+    # Results are only comparable with a baseline recorded on the same simulated farm
+    settings = {name: getattr(args, name) for name in
+                ("latency_ms", "jitter_ms", "packages", "dump_kb", "dir_entries", "push_kb", "concurrency")}
+    results = {}
+    print(f"{'method':<24}{'devices':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}")
+    for device_count in [int(n) for n in args.devices.split(",")]:
+        farm = FakeDeviceFarm(devices=device_count, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              packages=args.packages, dump_kb=args.dump_kb, dir_entries=args.dir_entries)
+        # The manager's caches and settings must not touch the real ~/.adb_tool
+        with tempfile.TemporaryDirectory(prefix="adb_bench_") as work_dir, isolated_home(work_dir):
+            manager, server = make_manager(farm, args.transport, work_dir)
+            context = BenchContext(farm, work_dir, args.push_kb)
+            try:
+                for method in methods:
+                    stats = run_case(manager, CASES[method], farm.serials, context, args.iterations,
+                                     args.concurrency, args.warmup, args.duration)
+                    key = f"{args.transport}/{method}@{device_count}"
+                    results[key] = stats
+                    print(f"{method:<24}{device_count:>8}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+                          f"{stats['p99_ms']:>10.2f}{stats['throughput']:>10.1f}")
+            finally:
+                manager.client.close()
+                if server is not None:
+                    server.close()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        if baseline is None or baseline.get("settings") != settings:
+            baseline = {"settings": settings, "results": {}}
+        baseline["results"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("No baseline found (run with --save-baseline to record one).")
+        return 0
+    if baseline.get("settings") != settings:
+        print(f"Baseline was recorded with different settings: {baseline.get('settings')}")
+        return 2
+    regressions = compare(results, baseline["results"], args.tolerance, args.min_delta_ms)
+    if regressions:
+        print("\nRegressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Loopback tests for AdbClient's smart-socket protocol, against the fake adb
+server from benchmarks/fake_adb.py (and a raw socket for exact bytes).
+
+    python -m unittest discover tests
+"""
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "benchmarks"))
+
+from adb_tool.adb_client import AdbClient, AdbError, AdbConnectionError
+from fake_adb import FakeDeviceFarm, FakeAdbServer
+
+
+class RawServer:
+    """Accepts one connection, records what the client sends and answers with a fixed reply."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.received = b""
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(1)
+        self.port = self._sock.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        conn, _ = self._sock.accept()
+        with conn:
+            # A request is 4 hex digits of length plus the payload
+            header = conn.recv(4)
+            self.received = header + conn.recv(int(header, 16))
+            conn.sendall(self.reply)
+
+    def close(self):
+        self._thread.join(5)
+        self._sock.close()
+
+
+class FramingTest(unittest.TestCase):
+    def request(self, reply, request="host:version"):
+        server = RawServer(reply)
+        self.addCleanup(server.close)
+        client = AdbClient(port=server.port, max_connections=1)
+        self.addCleanup(client.close)
+        client.pool.spare_connections = 0
+        return server, client.host_query(request)
+
+    def test_request_is_sent_with_hex_length_prefix(self):
+        server, _ = self.request(b"OKAY0000")
+        self.assertEqual(server.received, b"000chost:version")
+
+    def test_okay_reply_payload_is_length_prefixed(self):
+        _, reply = self.request(b"OKAY00040029trailing")
+        self.assertEqual(reply, "0029")
+
+    def test_fail_raises_with_server_message(self):
+        with self.assertRaises(AdbError) as caught:
+            self.request(b"FAIL000edevice offlinetrailing")
+        self.assertEqual(str(caught.exception), "device offline")
+
+    def test_unexpected_status_raises(self):
+        with self.assertRaises(AdbError):
+            self.request(b"WHAT")
+
+    def test_unreachable_server_is_not_available(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        self.assertFalse(AdbClient(port=port).is_available())
+
+
+class FakeServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.farm = FakeDeviceFarm(devices=2, latency_ms=0, jitter_ms=0, packages=5, dir_entries=4)
+        self.server = FakeAdbServer(self.farm)
+        self.addCleanup(self.server.close)
+        self.client = AdbClient(port=self.server.port)
+        self.addCleanup(self.client.close)
+        self.serial = self.farm.serials[0]
+
+
+class HostServicesTest(FakeServerTestCase):
+    def test_devices(self):
+        self.assertTrue(self.client.is_available())
+        self.assertEqual(self.client.devices(), [("FAKE0000", "device"), ("FAKE0001", "device")])
+
+
+class ConnectionPoolTest(FakeServerTestCase):
+    def wait_for_refill(self):
+        pool = self.client.pool
+        deadline = time.monotonic() + 5
+        while pool._refilling and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(pool._refilling)
+
+    def test_concurrent_requests_do_not_overfill_the_spares(self):
+        threads = [threading.Thread(target=self.client.devices) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.wait_for_refill()
+        self.assertEqual(len(self.client.pool._spare), self.client.pool.spare_connections)
+
+    def test_no_refill_once_the_server_is_gone(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        self.client.pool.port = sock.getsockname()[1]
+        sock.close()
+        with self.assertRaises(AdbConnectionError):
+            self.client.devices()
+        self.assertFalse(self.client.pool._refilling)
+        self.assertEqual(self.client.pool._spare, [])
+
+
+class TransportTest(FakeServerTestCase):
+    def test_shell_switches_transport_before_the_service(self):
+        output = self.client.shell(self.serial, "pm list packages")
+        self.assertEqual(output.splitlines(), [f"package:{pkg}" for pkg in self.farm.packages])
+        self.assertEqual(self.server.requests[-2:], [f"host:transport:{self.serial}", "shell:pm list packages"])
+
+    def test_unknown_device_fails_at_transport(self):
+        with self.assertRaises(AdbError) as caught:
+            self.client.shell("MISSING", "echo")
+        self.assertIn("not found", str(caught.exception))
+        self.assertNotIn("shell:echo", self.server.requests)
+
+    def test_shell_stream_yields_lines(self):
+        lines = list(self.client.shell_stream(self.serial, "pm list packages"))
+        self.assertEqual(lines, [f"package:{pkg}" for pkg in self.farm.packages])
+
+
+class SyncTest(FakeServerTestCase):
+    def make_file(self, data):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(path, 0o640)
+        os.utime(path, (1700000000, 1700000000))
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_send_streams_data_mode_and_mtime(self):
+        data = os.urandom(3 * 64 * 1024 + 17)  # several DATA chunks
+        path = self.make_file(data)
+        with self.client.sync(self.serial) as sync:
+            sync.send_file(path, "/sdcard/a.bin")
+            sync.read_status()
+        self.assertEqual(self.farm.pushed[(self.serial, "/sdcard/a.bin")], (data, 0o100640, 1700000000))
+
+    def test_pipelined_sends_are_answered_in_order(self):
+        first, second = self.make_file(b"one"), self.make_file(b"two")
+        with self.client.sync(self.serial) as sync:
+            sync.send_file(first, "/sdcard/1")
+            sync.send_file(second, "/sdcard/2")
+            sync.read_status()
+            sync.read_status()
+        self.assertEqual(self.farm.pushed[(self.serial, "/sdcard/1")][0], b"one")
+        self.assertEqual(self.farm.pushed[(self.serial, "/sdcard/2")][0], b"two")
+
+    def test_refused_send_raises_and_a_new_session_works(self):
+        path = self.make_file(b"x")
+        with self.client.sync(self.serial) as sync:
+            sync.send_file(path, "/system/x")
+            with self.assertRaises(AdbError) as caught:
+                sync.read_status()
+            self.assertIn("Read-only", str(caught.exception))
+        # The device ends a sync session after a FAIL
+        with self.client.sync(self.serial) as sync:
+            sync.send_file(path, "/sdcard/x")
+            sync.read_status()
+        self.assertNotIn((self.serial, "/system/x"), self.farm.pushed)
+        self.assertIn((self.serial, "/sdcard/x"), self.farm.pushed)
+
+    def test_list_dir_skips_dot_entries(self):
+        with self.client.sync(self.serial) as sync:
+            entries = sync.list_dir("/sdcard/")
+        self.assertEqual(entries, self.farm.list_dir(self.serial, "/sdcard/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
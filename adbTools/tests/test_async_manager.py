@@ -0,0 +1,159 @@
+"""
+Loopback tests for AsyncAdbManager and TkAsyncBridge against the fake adb
+server from benchmarks/fake_adb.py.
+"""
+import asyncio
+import concurrent.futures
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "benchmarks"))
+
+from adb_tool.adb_client import AdbClient
+from adb_tool.adb_manager import AdbManager
+from adb_tool.async_manager import AsyncAdbManager, TkAsyncBridge
+from fake_adb import FakeDeviceFarm, FakeAdbServer
+
+
+class AsyncManagerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # AdbManager keeps its caches under ~/.adb_tool
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir)
+        patcher = mock.patch.dict(os.environ, {"HOME": self.work_dir, "USERPROFILE": self.work_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.farm = FakeDeviceFarm(devices=3, latency_ms=0, jitter_ms=0, packages=5, dir_entries=8)
+        self.server = FakeAdbServer(self.farm)
+        self.addCleanup(self.server.close)
+        manager = AdbManager()
+        manager.client = AdbClient(port=self.server.port)
+        self.addCleanup(manager.client.close)
+        self.manager = AsyncAdbManager(manager)
+        self.serial = self.farm.serials[0]
+
+    async def test_device_states(self):
+        states = await self.manager.list_device_states()
+        self.assertEqual(states, [(serial, "device") for serial in self.farm.serials])
+
+    async def test_run_shell(self):
+        output = await self.manager.run_shell(self.serial, "pm list packages")
+        self.assertEqual(output.splitlines(), [f"package:{pkg}" for pkg in self.farm.packages])
+
+    async def test_stream_shell_yields_lines(self):
+        lines = [line async for line in self.manager.stream_shell(self.serial, "pm list packages")]
+        self.assertEqual(lines, [f"package:{pkg}" for pkg in self.farm.packages])
+
+    async def test_get_app_labels_cached_serves_the_second_call_from_the_cache(self):
+        packages = self.farm.packages[:3]
+        labels = await self.manager.get_app_labels_cached(self.serial, packages)
+        self.assertEqual(labels, dict.fromkeys(packages, "Fake App"))
+        dumps = len(self.server.requests)
+        self.assertEqual(await self.manager.get_app_labels_cached(self.serial, packages), labels)
+        # Only the stamps are read again
+        self.assertEqual(len(self.server.requests) - dumps, 2)
+        self.assertEqual(self.manager.manager.package_cache.stats()["hits"], 3)
+
+    async def test_list_directories_fills_the_shared_cache(self):
+        items = await self.manager.list_directories(self.serial, "/sdcard")
+        self.assertEqual(items, self.manager.manager.parse_sync_entries(self.farm.list_dir(self.serial, "/sdcard/")))
+        self.assertEqual(self.manager.manager.directory_cache.get(self.serial, "/sdcard"), items)
+
+    async def test_push_file_into_a_directory(self):
+        path = os.path.join(self.work_dir, "notice.txt")
+        with open(path, "wb") as f:
+            f.write(b"hello")
+        output = await self.manager.push_file(self.serial, path, "/sdcard/Download/")
+        self.assertIn("1 file pushed", output)
+        self.assertEqual(self.farm.pushed[(self.serial, "/sdcard/Download/notice.txt")][0], b"hello")
+
+    async def test_run_on_devices_uses_every_device(self):
+        results = await self.manager.run_on_devices(6, self.farm.serials)
+        self.assertEqual([r["device_id"] for r in results], self.farm.serials)
+        self.assertTrue(all(r["ok"] for r in results))
+        self.assertIn("level:", results[0]["result"]["data"])
+
+    async def test_fan_out_reports_errors_and_timeouts(self):
+        async def probe(dev_id):
+            if dev_id == self.farm.serials[1]:
+                raise RuntimeError("boom")
+            if dev_id == self.farm.serials[2]:
+                await asyncio.sleep(5)
+            return {"ok": True}
+
+        results = await self.manager.fan_out(probe, self.farm.serials, timeout=0.2)
+        self.assertEqual([r["ok"] for r in results], [True, False, False])
+        self.assertEqual(results[1]["error"], "boom")
+        self.assertIn("시간 초과", results[2]["error"])
+
+
+class FakeRoot:
+    """Stands in for the Tk root: after() callbacks are queued and run by the test."""
+
+    def __init__(self):
+        self.calls = []
+        self.called = threading.Event()
+
+    def after(self, ms, callback):
+        self.calls.append(callback)
+        self.called.set()
+
+
+class TkAsyncBridgeTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.bridge = TkAsyncBridge(self.root)
+        self.addCleanup(self.bridge.stop)
+
+    def run_callbacks(self):
+        self.assertTrue(self.root.called.wait(5))
+        for callback in self.root.calls:
+            callback()
+
+    def test_result_is_delivered_through_after(self):
+        async def answer():
+            return 42
+
+        results = []
+        self.bridge.submit(answer(), on_done=results.append).result(5)
+        self.run_callbacks()
+        self.assertEqual(results, [42])
+        self.assertEqual(self.bridge.pending(), 0)
+
+    def test_exception_goes_to_on_error(self):
+        async def fail():
+            raise ValueError("bad")
+
+        errors = []
+        future = self.bridge.submit(fail(), on_done=self.fail, on_error=errors.append)
+        with self.assertRaises(ValueError):
+            future.result(5)
+        self.run_callbacks()
+        self.assertEqual([str(e) for e in errors], ["bad"])
+
+    def test_cancelled_coroutine_delivers_nothing(self):
+        started = threading.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        future = self.bridge.submit(hang(), on_done=self.fail, on_error=self.fail)
+        self.assertTrue(started.wait(5))
+        self.bridge.cancel_all()
+        with self.assertRaises(concurrent.futures.CancelledError):
+            future.result(5)
+        # Let the loop finish cancelling the task before it is stopped
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), self.bridge.loop).result(5)
+        self.assertEqual(self.root.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
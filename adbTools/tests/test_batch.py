@@ -0,0 +1,62 @@
+"""
+Loopback tests for BatchRunner against the fake adb server from
+benchmarks/fake_adb.py.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "benchmarks"))
+
+from adb_tool.adb_client import AdbClient
+from adb_tool.adb_manager import AdbManager
+from adb_tool.batch import BatchRunner, parse_script
+from fake_adb import FakeDeviceFarm, FakeAdbServer
+
+
+class BatchShellTest(unittest.TestCase):
+    def setUp(self):
+        # AdbManager keeps its caches under ~/.adb_tool
+        home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, home)
+        patcher = mock.patch.dict(os.environ, {"HOME": home, "USERPROFILE": home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.farm = FakeDeviceFarm(devices=1, latency_ms=0, jitter_ms=0, packages=3)
+        self.server = FakeAdbServer(self.farm)
+        self.addCleanup(self.server.close)
+        self.manager = AdbManager()
+        self.manager.client = AdbClient(port=self.server.port)
+        self.addCleanup(self.manager.shell_sessions.close)
+        self.addCleanup(self.manager.client.close)
+        self.serial = self.farm.serials[0]
+
+    def run_script(self, text, keep_going=False):
+        runner = BatchRunner(self.manager, parse_script(text), keep_going=keep_going)
+        return runner.run_device(self.serial)["steps"]
+
+    def test_shell_step_reports_output_and_exit_code(self):
+        steps = self.run_script("shell pm list packages")
+        self.assertTrue(steps[0]["ok"])
+        self.assertEqual(steps[0]["output"]["exit_code"], 0)
+        self.assertEqual(steps[0]["output"]["output"].splitlines(),
+                         [f"package:{pkg}" for pkg in self.farm.packages])
+
+    def test_failing_shell_step_stops_the_device(self):
+        steps = self.run_script("shell exit 3\nshell pm list packages")
+        self.assertEqual(len(steps), 1)
+        self.assertFalse(steps[0]["ok"])
+        self.assertEqual(steps[0]["output"]["exit_code"], 3)
+
+    def test_keep_going_runs_the_steps_after_a_failure(self):
+        steps = self.run_script("shell exit 1\nshell pm list packages", keep_going=True)
+        self.assertEqual([step["ok"] for step in steps], [False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for PackageCache label lookups, for LabelCollector, which decides
+which fetched labels may be cached, and for AdbManager's batched label
+script against the fake adb server from benchmarks/fake_adb.py.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "benchmarks"))
+
+from adb_tool.adb_client import AdbClient
+from adb_tool.adb_manager import AdbManager, LabelCollector
+from adb_tool.package_cache import PackageCache
+from fake_adb import FakeDeviceFarm, FakeAdbServer
+
+
+class LookupLabelsTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = PackageCache(path=":memory:")
+        self.cache.store_many("S1", [("com.a", "1|t", "A", None), ("com.none", "1|t", None, None)])
+
+    def test_package_without_label_is_a_hit(self):
+        labels = self.cache.lookup_labels("S1", {"com.a": "1|t", "com.none": "1|t", "com.new": "1|t"})
+        self.assertEqual(labels, {"com.a": "A", "com.none": None})
+        self.assertEqual(self.cache.stats(), {"hits": 2, "misses": 1})
+
+    def test_changed_stamp_is_a_miss(self):
+        self.assertEqual(self.cache.lookup_labels("S1", {"com.none": "2|t"}), {})
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 1})
+
+    def test_uncounted_lookup_leaves_the_counters(self):
+        self.assertEqual(self.cache.lookup_labels("S1", {"com.a": "1|t"}, count=False), {"com.a": "A"})
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 0})
+
+
+class LabelCollectorTest(unittest.TestCase):
+    def setUp(self):
+        # The collector only uses the manager's batching and script helpers
+        self.manager = types.SimpleNamespace(PACKAGE_MARKER=AdbManager.PACKAGE_MARKER,
+                                             _batch_packages=lambda packages: [packages],
+                                             _label_script=lambda batch: "")
+        self.reported = []
+        self.collector = LabelCollector(self.manager, ["com.a", "com.b", "com.c"],
+                                        lambda pkg, label: self.reported.append((pkg, label)))
+
+    def block(self, package, *lines):
+        return [AdbManager.PACKAGE_MARKER + package, *lines]
+
+    def test_complete_output_answers_every_package(self):
+        lines = (self.block("com.a", "  applicationLabel=App A") + self.block("com.b") +
+                 self.block("com.c", "  applicationLabel=App C") + self.block("-"))
+        self.collector.read(["com.a", "com.b", "com.c"], lines)
+        self.assertEqual(self.collector.labels, {"com.a": "App A", "com.b": None, "com.c": "App C"})
+        self.assertEqual(self.collector.answered, {"com.a", "com.b", "com.c"})
+        self.assertEqual(self.reported, [("com.a", "App A"), ("com.b", None), ("com.c", "App C")])
+
+    def test_cut_off_output_only_answers_closed_blocks(self):
+        def lines():
+            yield from self.block("com.a") + self.block("com.b")
+            raise OSError("connection reset")
+
+        self.collector.read(["com.a", "com.b", "com.c"], lines())
+        self.assertEqual(self.collector.answered, {"com.a"})
+        # Every package is still reported once
+        self.assertEqual(sorted(pkg for pkg, _ in self.reported), ["com.a", "com.b", "com.c"])
+
+
+class BatchedLabelsTest(unittest.TestCase):
+    def setUp(self):
+        # AdbManager keeps its caches under ~/.adb_tool
+        home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, home)
+        patcher = mock.patch.dict(os.environ, {"HOME": home, "USERPROFILE": home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.farm = FakeDeviceFarm(devices=1, latency_ms=0, jitter_ms=0, packages=12)
+        self.server = FakeAdbServer(self.farm)
+        self.addCleanup(self.server.close)
+        self.manager = AdbManager()
+        self.manager.client = AdbClient(port=self.server.port)
+        self.addCleanup(self.manager.shell_sessions.close)
+        self.addCleanup(self.manager.client.close)
+        self.serial = self.farm.serials[0]
+
+    def test_labels_of_several_batches(self):
+        self.manager.MAX_SCRIPT_LENGTH = 100  # a few packages per script
+        reported = []
+        labels = self.manager.get_app_labels(self.serial, self.farm.packages,
+                                             callback=lambda pkg, label: reported.append(pkg))
+        self.assertEqual(labels, dict.fromkeys(self.farm.packages, "Fake App"))
+        self.assertEqual(sorted(reported), sorted(self.farm.packages))
+
+    def test_cached_labels_are_not_fetched_again(self):
+        self.manager.get_app_labels_cached(self.serial, self.farm.packages)
+        with mock.patch.object(self.manager, "_collect_labels") as collect:
+            labels = self.manager.get_app_labels_cached(self.serial, self.farm.packages)
+        collect.assert_not_called()
+        self.assertEqual(labels, dict.fromkeys(self.farm.packages, "Fake App"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Loopback tests for PushEngine against the fake adb server from
+benchmarks/fake_adb.py.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "benchmarks"))
+
+from adb_tool.adb_client import AdbClient
+from adb_tool.push_engine import PushEngine
+from fake_adb import FakeDeviceFarm, FakeAdbServer
+
+
+class PushEngineTest(unittest.TestCase):
+    def setUp(self):
+        # The reply latency keeps several files in flight on one session
+        self.farm = FakeDeviceFarm(devices=1, latency_ms=5, jitter_ms=0)
+        self.server = FakeAdbServer(self.farm)
+        self.addCleanup(self.server.close)
+        client = AdbClient(port=self.server.port)
+        self.addCleanup(client.close)
+        # PushEngine only needs the client; push_file is the adb client fallback
+        self.manager = types.SimpleNamespace(client=client, push_file=self.fail_fallback)
+        self.serial = self.farm.serials[0]
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir)
+
+    def fail_fallback(self, *args):
+        self.fail("fell back to the adb client")
+
+    def make_file(self, name, data):
+        path = os.path.join(self.work_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_pushes_every_file(self):
+        paths = [self.make_file(f"f{i}", b"x" * i) for i in range(5)]
+        results = PushEngine(self.manager, self.serial, sessions=2).push(paths, "/sdcard/in")
+        self.assertTrue(all(r["ok"] for r in results))
+        self.assertEqual(self.farm.pushed[(self.serial, "/sdcard/in/f3")][0], b"xxx")
+
+    def test_refused_files_do_not_fail_the_files_behind_them(self):
+        a, b, c = (self.make_file(name, name.encode()) for name in "abc")
+        results = PushEngine(self.manager, self.serial, sessions=1).push_pairs(
+            [(a, "/system/a"), (b, "/system/b"), (c, "/sdcard/c")])
+        self.assertEqual([r["ok"] for r in results], [False, False, True])
+        self.assertIn("Read-only", results[0]["error"])
+        self.assertIn("Read-only", results[1]["error"])
+        self.assertIsNone(results[2]["error"])
+        self.assertEqual(self.farm.pushed[(self.serial, "/sdcard/c")][0], b"c")
+
+
+if __name__ == "__main__":
+    unittest.main()